@@ -0,0 +1,27 @@
+"""Indexes for free-room search
+
+Revision ID: 3f9c2d1a7b40
+Revises: 72a137a8382c
+Create Date: 2026-10-18 10:12:04.118532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2d1a7b40'
+down_revision: Union[str, None] = '72a137a8382c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_schedule_assignments_classroom_slot', 'schedule_assignments', ['classroom_id', 'time_slot_id'], unique=False)
+    op.create_index('idx_classrooms_features', 'classrooms', ['features'], unique=False, postgresql_using='gin', postgresql_ops={'features': 'jsonb_path_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('idx_classrooms_features', table_name='classrooms', postgresql_using='gin')
+    op.drop_index('idx_schedule_assignments_classroom_slot', table_name='schedule_assignments')
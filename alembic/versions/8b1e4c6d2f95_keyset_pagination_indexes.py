@@ -0,0 +1,27 @@
+"""Indexes for keyset pagination
+
+Revision ID: 8b1e4c6d2f95
+Revises: 3f9c2d1a7b40
+Create Date: 2026-10-18 12:51:37.402915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '8b1e4c6d2f95'
+down_revision: Union[str, None] = '3f9c2d1a7b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_users_created_id', 'users', ['created_at', 'id'], unique=False)
+    op.create_index('idx_faculties_created_id', 'faculties', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_faculties_created_id', table_name='faculties')
+    op.drop_index('idx_users_created_id', table_name='users')
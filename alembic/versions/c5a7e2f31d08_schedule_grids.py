@@ -0,0 +1,35 @@
+"""Materialized timetable grids of approved schedules
+
+Revision ID: c5a7e2f31d08
+Revises: 8b1e4c6d2f95
+Create Date: 2026-10-18 16:20:44.581203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5a7e2f31d08'
+down_revision: Union[str, None] = '8b1e4c6d2f95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('schedule_grids',
+    sa.Column('schedule_id', UUID(as_uuid=True), nullable=False),
+    sa.Column('view', sa.Enum('DEPARTMENT', 'INSTRUCTOR', 'CLASSROOM', 'CLASS_LEVEL', name='gridview'), nullable=False),
+    sa.Column('owner_key', sa.String(length=64), nullable=False),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['schedule_id'], ['schedules.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('schedule_id', 'view', 'owner_key')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('schedule_grids')
+    sa.Enum(name='gridview').drop(op.get_bind(), checkfirst=True)
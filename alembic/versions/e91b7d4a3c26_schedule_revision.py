@@ -0,0 +1,25 @@
+"""Per-schedule assignment revision
+
+Revision ID: e91b7d4a3c26
+Revises: c5a7e2f31d08
+Create Date: 2026-10-18 19:05:12.318840
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e91b7d4a3c26'
+down_revision: Union[str, None] = 'c5a7e2f31d08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('schedules', sa.Column('revision', sa.BigInteger(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('schedules', 'revision')
@@ -0,0 +1,7 @@
+from app.schemas.admin.metrics import PoolStats, HistogramSnapshot, MetricsResponse
+
+__all__ = [
+    "PoolStats",
+    "HistogramSnapshot",
+    "MetricsResponse",
+]
@@ -0,0 +1,26 @@
+from typing import Dict, Optional
+from pydantic import BaseModel
+
+
+class PoolStats(BaseModel):
+    size: int
+    max_overflow: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    timeout_seconds: float
+
+
+class HistogramSnapshot(BaseModel):
+    count: int
+    sum: float
+    max: float
+    buckets: Dict[str, int]
+
+
+class MetricsResponse(BaseModel):
+    """Process-local runtime metrics of the API worker"""
+    pool: PoolStats
+    read_pool: Optional[PoolStats] = None
+    counters: Dict[str, int]
+    histograms: Dict[str, HistogramSnapshot]
@@ -0,0 +1,5 @@
+from app.schemas.calendar.response import CalendarSubscriptionResponse
+
+__all__ = [
+    "CalendarSubscriptionResponse",
+]
@@ -0,0 +1,8 @@
+from app.core.constants import CalendarOwner
+from app.schemas.base import BaseSchema
+
+
+class CalendarSubscriptionResponse(BaseSchema):
+    """Secret feed URL to paste into a calendar client"""
+    owner: CalendarOwner
+    url: str
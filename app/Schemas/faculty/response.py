@@ -1,5 +1,6 @@
 from uuid import UUID
 from datetime import datetime
+from typing import Optional
 from app.schemas.faculty.base import FacultyBase
 from app.schemas.base import BaseSchema
 
@@ -12,8 +13,9 @@ class FacultyResponse(FacultyBase, BaseSchema):
 
 class FacultyListResponse(BaseSchema):
     items: list[FacultyResponse]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     page_size: int
+    next_cursor: Optional[str] = None
 
 
@@ -1,7 +1,24 @@
 from app.schemas.schedule.base import ScheduleBase
 from app.schemas.schedule.dto import ScheduleCreate, ScheduleSubmit, ScheduleApproval
 from app.schemas.schedule.response import ScheduleResponse, ScheduleDetailResponse
-from app.schemas.schedule.assignment import ScheduleAssignmentCreate, ScheduleAssignmentResponse, ScheduleAssignmentDetail
+from app.schemas.schedule.assignment import (
+    ScheduleAssignmentCreate,
+    ScheduleAssignmentResponse,
+    ScheduleAssignmentDetail,
+    ScheduleAssignmentBatchCreate,
+    ScheduleAssignmentBatchError,
+    ScheduleAssignmentBatchResponse,
+)
+from app.schemas.schedule.conflict import ScheduleConflict, ScheduleConflictReport
+from app.schemas.schedule.generation import (
+    ScheduleGenerateRequest,
+    ScheduleGenerationResponse,
+    UnplacedOffering,
+    FacultyGenerateRequest,
+    DepartmentGenerationResult,
+    FacultyGenerationResponse,
+)
+from app.schemas.schedule.optimization import ScheduleOptimizeRequest, ScheduleJobResponse
 
 __all__ = [
     "ScheduleBase",
@@ -13,6 +30,19 @@ __all__ = [
     "ScheduleAssignmentCreate",
     "ScheduleAssignmentResponse",
     "ScheduleAssignmentDetail",
+    "ScheduleAssignmentBatchCreate",
+    "ScheduleAssignmentBatchError",
+    "ScheduleAssignmentBatchResponse",
+    "ScheduleConflict",
+    "ScheduleConflictReport",
+    "ScheduleGenerateRequest",
+    "ScheduleGenerationResponse",
+    "UnplacedOffering",
+    "FacultyGenerateRequest",
+    "DepartmentGenerationResult",
+    "FacultyGenerationResponse",
+    "ScheduleOptimizeRequest",
+    "ScheduleJobResponse",
 ]
 
 
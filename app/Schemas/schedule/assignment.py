@@ -1,6 +1,7 @@
 from uuid import UUID
 from datetime import datetime
-from pydantic import BaseModel
+from typing import List
+from pydantic import BaseModel, Field
 from app.schemas.base import BaseSchema
 
 
@@ -21,3 +22,18 @@ class ScheduleAssignmentDetail(ScheduleAssignmentResponse):
     pass
 
 
+class ScheduleAssignmentBatchCreate(BaseModel):
+    """Many assignments validated and inserted together"""
+    items: List[ScheduleAssignmentCreate] = Field(..., min_length=1, max_length=5000)
+    atomic: bool = True  # insert nothing if any item is invalid
+
+
+class ScheduleAssignmentBatchError(BaseModel):
+    index: int
+    detail: str
+
+
+class ScheduleAssignmentBatchResponse(BaseModel):
+    created: List[ScheduleAssignmentResponse]
+    errors: List[ScheduleAssignmentBatchError]
+
@@ -0,0 +1,22 @@
+from uuid import UUID
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+from app.core.constants import ClassLevel, DayOfWeek
+
+
+class ScheduleConflict(BaseModel):
+    type: str
+    severity: int
+    day_of_week: DayOfWeek
+    resource_id: Optional[UUID] = None
+    class_level: Optional[ClassLevel] = None
+    group_no: Optional[int] = None
+    assignment_ids: List[UUID]
+
+
+class ScheduleConflictReport(BaseModel):
+    """Current conflicts of a schedule grouped by conflict type"""
+    schedule_id: UUID
+    total: int
+    max_severity: int
+    conflicts_by_type: Dict[str, List[ScheduleConflict]]
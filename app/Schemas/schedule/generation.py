@@ -0,0 +1,47 @@
+from uuid import UUID
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+
+class ScheduleGenerateRequest(BaseModel):
+    """Options for automatic schedule generation"""
+    replace_existing: bool = False
+    time_limit_seconds: Optional[float] = Field(None, gt=0, le=120)
+    max_backtracks: Optional[int] = Field(None, ge=0)
+
+
+class UnplacedOffering(BaseModel):
+    course_offering_id: UUID
+    missing_hours: int
+    reason: str
+
+
+class ScheduleGenerationResponse(BaseModel):
+    schedule_id: UUID
+    created_count: int
+    unplaced: List[UnplacedOffering]
+    backtracks: int
+    elapsed_ms: float
+
+
+class FacultyGenerateRequest(ScheduleGenerateRequest):
+    """Generate every draft or rejected department schedule of a faculty for a term"""
+    term_id: UUID
+
+
+class DepartmentGenerationResult(BaseModel):
+    department_id: UUID
+    schedule_id: Optional[UUID]
+    status: str
+    detail: Optional[str] = None
+    created_count: int = 0
+    unplaced: List[UnplacedOffering] = []
+    backtracks: int = 0
+
+
+class FacultyGenerationResponse(BaseModel):
+    faculty_id: UUID
+    term_id: UUID
+    departments: List[DepartmentGenerationResult]
+    workers: int
+    elapsed_ms: float
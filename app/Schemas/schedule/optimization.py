@@ -0,0 +1,27 @@
+from uuid import UUID
+from datetime import datetime
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, Field
+from app.schemas.base import BaseSchema
+from app.core.constants import JobStatus
+
+
+class ScheduleOptimizeRequest(BaseModel):
+    """Options for soft-constraint optimization of an existing schedule"""
+    time_limit_seconds: Optional[float] = Field(None, gt=0, le=300)
+    max_daily_lessons: Optional[int] = Field(None, ge=1)
+    apply: bool = True
+    seed: Optional[int] = None
+
+
+class ScheduleJobResponse(BaseSchema):
+    id: UUID
+    kind: str
+    schedule_id: Optional[UUID]
+    status: JobStatus
+    progress: float
+    message: Optional[str]
+    result: Optional[Dict[str, Any]]
+    error: Optional[str]
+    created_at: datetime
+    finished_at: Optional[datetime]
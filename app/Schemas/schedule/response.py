@@ -4,6 +4,7 @@ from typing import Optional, List
 from pydantic import BaseModel
 from app.schemas.schedule.base import ScheduleBase
 from app.schemas.base import BaseSchema
+from app.schemas.schedule.assignment import ScheduleAssignmentResponse
 from app.core.constants import ScheduleStatus
 
 
@@ -20,7 +21,7 @@ class ScheduleResponse(ScheduleBase, BaseSchema):
 
 class ScheduleDetailResponse(ScheduleResponse):
     """Full schedule with all assignments"""
-    assignments: List[dict]  # Will be ScheduleAssignmentDetail
+    assignments: List[ScheduleAssignmentResponse]
     review_notes: List[dict]  # Will be ReviewNoteResponse
 
 
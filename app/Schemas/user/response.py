@@ -15,8 +15,9 @@ class UserResponse(UserBase, BaseSchema):
 
 class UserListResponse(BaseSchema):
     items: list[UserResponse]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     page_size: int
+    next_cursor: Optional[str] = None
 
 
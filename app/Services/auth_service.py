@@ -3,8 +3,8 @@ from datetime import timedelta
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.security import (
-    hash_password,
-    verify_password,
+    hash_password_async,
+    verify_password_async,
     create_access_token,
     create_refresh_token,
     verify_token
@@ -29,7 +29,7 @@ class AuthService:
             raise ValueError("User with this email already exists")
         
         # Hash password
-        password_hash = hash_password(user_data.password)
+        password_hash = await hash_password_async(user_data.password)
         
         # Create user
         user_dict = user_data.model_dump(exclude={"password"})
@@ -44,7 +44,7 @@ class AuthService:
         if not user:
             return None
         
-        if not verify_password(password, user.password_hash):
+        if not await verify_password_async(password, user.password_hash):
             return None
         
         if not user.is_active:
@@ -91,10 +91,10 @@ class AuthService:
         if not user:
             return False
         
-        if not verify_password(old_password, user.password_hash):
+        if not await verify_password_async(old_password, user.password_hash):
             return False
         
-        new_password_hash = hash_password(new_password)
+        new_password_hash = await hash_password_async(new_password)
         await self.user_repo.update(user_id, {"password_hash": new_password_hash})
         return True
 
@@ -0,0 +1,240 @@
+import hashlib
+import hmac
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from config import settings
+from app.repositories.classroom import ClassroomRepository
+from app.repositories.department import DepartmentRepository
+from app.repositories.instructor import InstructorRepository
+from app.repositories.program_class import ProgramClassRepository
+from app.repositories.schedule import ScheduleRepository
+from app.repositories.schedule_assignment import ScheduleAssignmentRepository
+from app.repositories.term import TermRepository
+from app.core.cache import TTLCache
+from app.core.constants import CalendarOwner, CLASS_LEVEL_TO_COURSE_LEVEL
+from app.core.metrics import metrics
+from app.utils.etag import make_etag
+from app.utils.ical import CalendarEvent, render_calendar
+
+CALENDAR_MEDIA_TYPE = "text/calendar; charset=utf-8"
+# Hex digits of a feed token (128 bits)
+TOKEN_LENGTH = 32
+
+
+@dataclass(frozen=True)
+class TermVersion:
+    """What a term's feeds are rendered from; `tag` changes whenever any of it does"""
+    term_id: UUID
+    term_name: str
+    start_date: date
+    end_date: date
+    modified_at: datetime
+    tag: str
+
+
+@dataclass(frozen=True)
+class CalendarFeed:
+    owner: CalendarOwner
+    owner_id: UUID
+    version: TermVersion
+    etag: str
+
+
+# Keyed by term id, or None for the active term
+_term_versions: TTLCache[Optional[UUID], TermVersion] = TTLCache(
+    maxsize=256,
+    ttl=settings.CALENDAR_VERSION_TTL_SECONDS
+)
+# Program class id -> term id; a program class never moves between terms
+_program_class_terms: TTLCache[UUID, UUID] = TTLCache(maxsize=10000, ttl=3600.0)
+# Owners known to exist, so that a 304 poll needs no lookup
+_known_owners: TTLCache[Tuple[CalendarOwner, UUID], bool] = TTLCache(
+    maxsize=10000,
+    ttl=settings.CALENDAR_VERSION_TTL_SECONDS
+)
+# Rendered bodies keyed by ETag, which already covers owner and version
+_feeds: TTLCache[str, bytes] = TTLCache(maxsize=settings.CALENDAR_FEED_CACHE_SIZE, ttl=3600.0)
+
+
+def invalidate_term_calendars(term_id: UUID) -> None:
+    """Drop this worker's cached version of a term so its feeds re-render on the next poll"""
+    _term_versions.discard_where(lambda key, version: version.term_id == term_id)
+
+
+def calendar_token(owner: CalendarOwner, owner_id: UUID) -> str:
+    """Secret of a feed's URL: an HMAC of the owner under SECRET_KEY"""
+    message = f"calendar:{owner.value}:{owner_id}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()[:TOKEN_LENGTH]
+
+
+def verify_calendar_token(owner: CalendarOwner, owner_id: UUID, token: Optional[str]) -> bool:
+    return token is not None and hmac.compare_digest(token, calendar_token(owner, owner_id))
+
+
+def calendar_headers(feed: CalendarFeed) -> Dict[str, str]:
+    # The URL carries a secret, so shared caches must not keep the body
+    return {
+        "ETag": feed.etag,
+        "Cache-Control": f"private, max-age={settings.CALENDAR_MAX_AGE_SECONDS}, must-revalidate",
+    }
+
+
+class CalendarService:
+    """iCalendar feeds of the approved timetable per instructor, classroom or program class.
+    
+    Feed URLs carry calendar_token(), since calendar clients cannot send a
+    bearer token. Resolving a feed's ETag needs the owner's existence and the
+    term version, both cached per worker for CALENDAR_VERSION_TTL_SECONDS (the
+    version is also dropped on approve/reject), so a poll that ends in 304
+    usually touches no database at all. Rendered
+    bodies are cached by ETag, so a changed version renders each feed once.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        self.term_repo = TermRepository(db)
+        self.schedule_repo = ScheduleRepository(db)
+        self.assignment_repo = ScheduleAssignmentRepository(db)
+        self.db = db
+    
+    async def get_feed(
+        self,
+        owner: CalendarOwner,
+        owner_id: UUID,
+        term_id: Optional[UUID] = None
+    ) -> Optional[CalendarFeed]:
+        """Resolve a feed's version and ETag; None if the owner or term does not exist"""
+        if owner == CalendarOwner.PROGRAM_CLASS:
+            term_id = await self._program_class_term(owner_id)
+            if term_id is None:
+                return None
+        elif not await self.owner_exists(owner, owner_id):
+            return None
+        version = await self._get_term_version(term_id)
+        if version is None:
+            return None
+        return CalendarFeed(
+            owner=owner,
+            owner_id=owner_id,
+            version=version,
+            etag=make_etag(owner.value, owner_id, version.tag)
+        )
+    
+    async def render(self, feed: CalendarFeed) -> Optional[bytes]:
+        """Get the feed body, rendering it on a cache miss; None if the owner does not exist"""
+        body = _feeds.get(feed.etag)
+        if body is not None:
+            metrics.increment("calendar.feed_cache.hit")
+            return body
+        metrics.increment("calendar.feed_cache.miss")
+        
+        loaded = await self._load(feed)
+        if loaded is None:
+            return None
+        name, rows = loaded
+        version = feed.version
+        body = render_calendar(
+            name=f"{name} ({version.term_name})",
+            events=[
+                CalendarEvent(
+                    uid=f"{row.id}@timetable",
+                    summary=f"{row.course_code} {row.course_name}",
+                    day_of_week=row.day_of_week,
+                    start_time=row.start_time,
+                    end_time=row.end_time,
+                    location=row.room_code,
+                    description=(
+                        f"{row.instructor_name}, group {row.group_no}" if row.group_no is not None
+                        else row.instructor_name
+                    )
+                )
+                for row in rows
+            ],
+            term_start=version.start_date,
+            term_end=version.end_date,
+            stamp=version.modified_at,
+            timezone_hint=settings.CALENDAR_TIMEZONE
+        )
+        _feeds.set(feed.etag, body)
+        return body
+    
+    async def _load(self, feed: CalendarFeed) -> Optional[Tuple[str, List]]:
+        """Calendar name and lesson rows of the feed's owner"""
+        term_id = feed.version.term_id
+        if feed.owner == CalendarOwner.INSTRUCTOR:
+            instructor = await InstructorRepository(self.db).get_by_id(feed.owner_id)
+            if not instructor:
+                return None
+            rows = await self.assignment_repo.get_calendar_rows(term_id, instructor_id=instructor.id)
+            return instructor.full_name, rows
+        
+        if feed.owner == CalendarOwner.CLASSROOM:
+            classroom = await ClassroomRepository(self.db).get_by_id(feed.owner_id)
+            if not classroom:
+                return None
+            rows = await self.assignment_repo.get_calendar_rows(term_id, classroom_id=classroom.id)
+            return classroom.code, rows
+        
+        program_class = await ProgramClassRepository(self.db).get_by_id(feed.owner_id)
+        if not program_class:
+            return None
+        department = await DepartmentRepository(self.db).get_by_id(program_class.department_id)
+        rows = await self.assignment_repo.get_calendar_rows(
+            term_id,
+            student_group=(
+                program_class.department_id,
+                CLASS_LEVEL_TO_COURSE_LEVEL[program_class.class_level],
+                program_class.group_no
+            )
+        )
+        return f"{department.code} {program_class.label.value} group {program_class.group_no}", rows
+    
+    async def owner_exists(self, owner: CalendarOwner, owner_id: UUID) -> bool:
+        """Whether the instructor, classroom or program class exists"""
+        if _known_owners.get((owner, owner_id)):
+            return True
+        if owner == CalendarOwner.PROGRAM_CLASS:
+            return await self._program_class_term(owner_id) is not None
+        repository = InstructorRepository if owner == CalendarOwner.INSTRUCTOR else ClassroomRepository
+        if await repository(self.db).get_by_id(owner_id) is None:
+            return False
+        _known_owners.set((owner, owner_id), True)
+        return True
+    
+    async def _program_class_term(self, program_class_id: UUID) -> Optional[UUID]:
+        term_id = _program_class_terms.get(program_class_id)
+        if term_id is None:
+            program_class = await ProgramClassRepository(self.db).get_by_id(program_class_id)
+            if not program_class:
+                return None
+            term_id = program_class.term_id
+            _program_class_terms.set(program_class_id, term_id)
+        return term_id
+    
+    async def _get_term_version(self, term_id: Optional[UUID]) -> Optional[TermVersion]:
+        version = _term_versions.get(term_id)
+        if version is not None:
+            metrics.increment("calendar.version_cache.hit")
+            return version
+        metrics.increment("calendar.version_cache.miss")
+        
+        term = (
+            await self.term_repo.get_by_id(term_id) if term_id is not None
+            else await self.term_repo.get_active_term()
+        )
+        if not term:
+            return None
+        schedules, assignments, latest = await self.schedule_repo.get_term_version(term.id)
+        modified_at = max(latest, term.updated_at) if latest else term.updated_at
+        version = TermVersion(
+            term_id=term.id,
+            term_name=term.name,
+            start_date=term.start_date,
+            end_date=term.end_date,
+            modified_at=modified_at,
+            tag=f"{term.start_date}:{term.end_date}:{schedules}:{assignments}:{modified_at.isoformat()}"
+        )
+        _term_versions.set(term_id, version)
+        return version
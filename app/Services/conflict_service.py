@@ -0,0 +1,37 @@
+from uuid import UUID
+from typing import List, Dict, Any, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.schedule import ScheduleRepository
+from app.repositories.schedule_assignment import ScheduleAssignmentRepository
+from app.schemas.schedule.conflict import ScheduleConflictReport
+from app.scheduling.conflicts import detect_conflicts, conflict_registry
+from app.utils.conflicts import group_conflicts_by_type
+
+
+class ConflictService:
+    def __init__(self, db: AsyncSession):
+        self.schedule_repo = ScheduleRepository(db)
+        self.assignment_repo = ScheduleAssignmentRepository(db)
+        self.db = db
+    
+    async def detect_all_conflicts(self, schedule_id: UUID) -> List[Dict[str, Any]]:
+        """Detect every overlapping booking in a schedule, including non-aligned slots"""
+        rows = await self.assignment_repo.get_occupancy_rows(schedule_id)
+        return [conflict for bucket in detect_conflicts(rows).values() for conflict in bucket]
+    
+    async def get_conflict_report(self, schedule_id: UUID, full: bool = False) -> Optional[ScheduleConflictReport]:
+        """Get schedule conflicts from the cached per-schedule state, or from a full sweep when `full`"""
+        if not await self.schedule_repo.get_by_id(schedule_id):
+            return None
+        
+        if full:
+            conflicts = await self.detect_all_conflicts(schedule_id)
+        else:
+            state = await conflict_registry.get(self.db, schedule_id)
+            conflicts = state.conflicts()
+        return ScheduleConflictReport(
+            schedule_id=schedule_id,
+            total=len(conflicts),
+            max_severity=max((c["severity"] for c in conflicts), default=0),
+            conflicts_by_type=group_conflicts_by_type(conflicts)
+        )
@@ -0,0 +1,94 @@
+import csv
+import io
+import json
+from uuid import UUID
+from typing import Any, AsyncIterator, Dict, List, Sequence
+from sqlalchemy.ext.asyncio import AsyncSession
+from config import settings
+from app.db.session import routed_engine
+from app.repositories.schedule import ScheduleRepository
+from app.repositories.schedule_assignment import ScheduleAssignmentRepository
+from app.core.constants import ExportFormat
+
+EXPORT_COLUMNS = (
+    "assignment_id",
+    "course_code",
+    "course_name",
+    "group_no",
+    "instructor_name",
+    "room_code",
+    "day_of_week",
+    "start_time",
+    "end_time",
+)
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def _plain(row: Sequence[Any]) -> List[Any]:
+    """Row values as JSON/CSV friendly scalars"""
+    return [
+        value.value if hasattr(value, "value")
+        else value.isoformat() if hasattr(value, "isoformat")
+        else str(value) if isinstance(value, UUID)
+        else value
+        for value in row
+    ]
+
+
+def _ndjson_chunk(rows: Sequence[Sequence[Any]]) -> bytes:
+    return "".join(
+        json.dumps(dict(zip(EXPORT_COLUMNS, _plain(row))), ensure_ascii=False) + "\n"
+        for row in rows
+    ).encode()
+
+
+def _csv_chunk(rows: Sequence[Sequence[Any]]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(_plain(row) for row in rows)
+    return buffer.getvalue().encode()
+
+
+class ScheduleExportService:
+    def __init__(self, db: AsyncSession):
+        self.schedule_repo = ScheduleRepository(db)
+        self.db = db
+    
+    async def schedule_exists(self, schedule_id: UUID) -> bool:
+        return await self.schedule_repo.get_by_id(schedule_id) is not None
+    
+    async def stream_assignments(
+        self,
+        schedule_id: UUID,
+        export_format: ExportFormat
+    ) -> AsyncIterator[bytes]:
+        """Yield a schedule's timetable as NDJSON or CSV chunks.
+        
+        Rows come from a server-side cursor, EXPORT_BATCH_SIZE at a time, and
+        each batch is encoded and sent before the next is fetched, so memory
+        stays flat regardless of schedule size. The stream runs on its own
+        connection, because the request's session is closed once the response
+        starts, to the same primary or replica the session was routed to.
+        """
+        encode = _csv_chunk if export_format == ExportFormat.CSV else _ndjson_chunk
+        if export_format == ExportFormat.CSV:
+            yield _csv_chunk([EXPORT_COLUMNS])
+        
+        statement = ScheduleAssignmentRepository.export_statement(schedule_id).execution_options(
+            yield_per=settings.EXPORT_BATCH_SIZE
+        )
+        # Server-side cursors need a transaction
+        async with routed_engine(self.db).connect() as connection:
+            async with connection.begin():
+                result = await connection.stream(statement)
+                async for rows in result.partitions():
+                    yield encode(rows)
+
+
+def export_headers(schedule_id: UUID, export_format: ExportFormat) -> Dict[str, str]:
+    filename = f"schedule-{schedule_id}.{export_format.value}"
+    return {"Content-Disposition": f'attachment; filename="{filename}"'}
@@ -4,6 +4,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.faculty import FacultyRepository
 from app.schemas.faculty.dto import FacultyCreate, FacultyUpdate
 from app.schemas.faculty.response import FacultyResponse, FacultyListResponse
+from app.schemas.schedule.generation import (
+    FacultyGenerateRequest,
+    FacultyGenerationResponse,
+    DepartmentGenerationResult,
+    UnplacedOffering
+)
+from app.scheduling.faculty import FacultyScheduleEngine
 from app.utils.normalization import normalize_faculty_code
 from app.utils.validators import validate_faculty_code
 
@@ -43,17 +50,36 @@ class FacultyService:
     async def get_faculties(
         self,
         skip: int = 0,
-        limit: int = 50
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        include_total: bool = False
     ) -> FacultyListResponse:
-        """Get list of faculties"""
-        faculties = await self.faculty_repo.get_multi(skip=skip, limit=limit)
-        total = await self.faculty_repo.count()
+        """Get list of faculties, keyset-paginated unless a legacy offset is given.
+        
+        Requests without a cursor keep the offset contract: page and an exact
+        total are always set. Cursor requests get a total only on demand.
+        """
+        next_cursor = None
+        page = None
+        total = None
+        if cursor:
+            faculties, next_cursor = await self.faculty_repo.get_page(limit=limit, cursor=cursor)
+            if include_total:
+                total = await self.faculty_repo.estimate_count()
+        else:
+            page = (skip // limit) + 1
+            total = await self.faculty_repo.count()
+            if skip:
+                faculties = await self.faculty_repo.get_multi(skip=skip, limit=limit, order_by="created_at")
+            else:
+                faculties, next_cursor = await self.faculty_repo.get_page(limit=limit)
         
         return FacultyListResponse(
             items=[FacultyResponse.model_validate(f) for f in faculties],
             total=total,
-            page=(skip // limit) + 1,
-            page_size=limit
+            page=page,
+            page_size=limit,
+            next_cursor=next_cursor
         )
     
     async def update_faculty(
@@ -76,5 +102,47 @@ class FacultyService:
     async def delete_faculty(self, faculty_id: UUID) -> bool:
         """Delete faculty"""
         return await self.faculty_repo.delete(faculty_id)
-
-
+    
+    async def generate_schedules(
+        self,
+        faculty_id: UUID,
+        generate_data: FacultyGenerateRequest
+    ) -> FacultyGenerationResponse:
+        """Generate every department schedule of the faculty for a term in parallel"""
+        faculty = await self.faculty_repo.get_by_id(faculty_id)
+        if not faculty:
+            raise ValueError("Faculty not found")
+        
+        result = await FacultyScheduleEngine(self.db).generate(
+            faculty_id,
+            generate_data.term_id,
+            replace_existing=generate_data.replace_existing,
+            time_limit=generate_data.time_limit_seconds,
+            max_backtracks=generate_data.max_backtracks
+        )
+        
+        return FacultyGenerationResponse(
+            faculty_id=faculty_id,
+            term_id=generate_data.term_id,
+            departments=[
+                DepartmentGenerationResult(
+                    department_id=d.department_id,
+                    schedule_id=d.schedule_id,
+                    status=d.status,
+                    detail=d.detail,
+                    created_count=len(d.placements),
+                    unplaced=[
+                        UnplacedOffering(
+                            course_offering_id=u.course_offering_id,
+                            missing_hours=u.missing_hours,
+                            reason=u.reason
+                        )
+                        for u in d.unplaced.values()
+                    ],
+                    backtracks=d.backtracks
+                )
+                for d in result.departments
+            ],
+            workers=result.workers,
+            elapsed_ms=round(result.elapsed_seconds * 1000, 2)
+        )
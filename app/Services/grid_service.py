@@ -0,0 +1,163 @@
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import AsyncSessionLocal
+from app.models.schedule import Schedule
+from app.repositories.schedule import ScheduleRepository
+from app.repositories.schedule_assignment import ScheduleAssignmentRepository
+from app.repositories.schedule_grid import ScheduleGridRepository
+from app.repositories.time_slot import TimeSlotRepository
+from app.core.constants import (
+    DayOfWeek,
+    GridView,
+    ScheduleStatus,
+    CLASS_LEVEL_TO_LABEL,
+    COURSE_LEVEL_TO_CLASS_LEVEL,
+)
+from app.core.metrics import metrics
+
+
+def build_grids(schedule_id: UUID, slots: Sequence[Any], rows: Sequence[Any]) -> List[Dict[str, Any]]:
+    """Lay a schedule's assignment rows out as day x slot grids per view and owner.
+    
+    Every grid shares the term's day and slot axes, so clients can render
+    them without knowing the term's time slots; `cells[day][slot]` lists the
+    lessons in that cell. Returns schedule_grids rows with compact JSON
+    payloads.
+    """
+    used_days = {slot.day_of_week for slot in slots} | {row.day_of_week for row in rows}
+    days = [day for day in DayOfWeek if day in used_days]
+    times = sorted(
+        {(slot.start_time, slot.end_time) for slot in slots}
+        | {(row.start_time, row.end_time) for row in rows}
+    )
+    day_index = {day: i for i, day in enumerate(days)}
+    time_index = {span: i for i, span in enumerate(times)}
+    
+    grids: Dict[Tuple[GridView, str], Dict[str, Any]] = {}
+    
+    def cells_of(view: GridView, owner_key: str, label: Optional[str]) -> List[List[List[Dict[str, Any]]]]:
+        grid = grids.get((view, owner_key))
+        if grid is None:
+            grid = grids[(view, owner_key)] = {
+                "label": label,
+                "cells": [[[] for _ in times] for _ in days],
+            }
+        return grid["cells"]
+    
+    for row in rows:
+        entry = {
+            "assignment_id": str(row.assignment_id),
+            "course_code": row.course_code,
+            "course_name": row.course_name,
+            "group_no": row.group_no,
+            "instructor": row.instructor_name,
+            "room": row.room_code,
+        }
+        class_level = COURSE_LEVEL_TO_CLASS_LEVEL[row.class_level]
+        owners = (
+            (GridView.DEPARTMENT, "", None),
+            (GridView.INSTRUCTOR, str(row.instructor_id), row.instructor_name),
+            (GridView.CLASSROOM, str(row.classroom_id), row.room_code),
+            (GridView.CLASS_LEVEL, class_level.value, CLASS_LEVEL_TO_LABEL[class_level].value),
+        )
+        d = day_index[row.day_of_week]
+        t = time_index[(row.start_time, row.end_time)]
+        for view, owner_key, label in owners:
+            cells_of(view, owner_key, label)[d][t].append(entry)
+    
+    # An approved schedule without lessons still has an (empty) department grid
+    cells_of(GridView.DEPARTMENT, "", None)
+    
+    axes = {
+        "days": [day.value for day in days],
+        "slots": [[start.strftime("%H:%M"), end.strftime("%H:%M")] for start, end in times],
+    }
+    return [
+        {
+            "schedule_id": schedule_id,
+            "view": view,
+            "owner_key": owner_key,
+            "payload": json.dumps(
+                {
+                    "schedule_id": str(schedule_id),
+                    "view": view.value,
+                    "owner": owner_key or None,
+                    "label": grid["label"],
+                    **axes,
+                    "cells": grid["cells"],
+                },
+                separators=(",", ":"),
+                ensure_ascii=False
+            ),
+        }
+        for (view, owner_key), grid in grids.items()
+    ]
+
+
+class ScheduleGridService:
+    """Timetable grids materialized when a schedule is approved.
+    
+    An approved schedule is read far more often than it changes, so its grids
+    are rendered once on approval into schedule_grids and served from there
+    with a single primary-key lookup. Rejection removes them; approving again
+    rebuilds them. Schedules approved before grids existed have none; they are
+    materialized on the primary the first time one of their grids is asked for.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        self.grid_repo = ScheduleGridRepository(db)
+        self.assignment_repo = ScheduleAssignmentRepository(db)
+        self.db = db
+    
+    async def materialize(self, schedule: Schedule) -> List[Dict[str, Any]]:
+        """Render and store every grid of a schedule; returns the stored rows"""
+        slots = await TimeSlotRepository(self.db).get_by_term(schedule.term_id)
+        rows = await self.assignment_repo.get_grid_rows(schedule.id)
+        grids = build_grids(schedule.id, slots, rows)
+        await self.grid_repo.replace_for_schedule(schedule.id, grids)
+        metrics.increment("schedule.grids.materialized", len(grids))
+        return grids
+    
+    async def clear(self, schedule_id: UUID) -> None:
+        await self.grid_repo.delete_by_schedule(schedule_id)
+    
+    async def get_grid_json(self, schedule_id: UUID, view: GridView, owner_key: str) -> Optional[bytes]:
+        """Stored grid JSON, or None if the schedule is not approved or the owner has no lessons in it"""
+        payload = await self.grid_repo.get_payload(schedule_id, view, owner_key)
+        if payload is None and await self._needs_backfill(schedule_id, view):
+            payload = await self._backfill(schedule_id, view, owner_key)
+        return payload.encode() if payload is not None else None
+    
+    async def _needs_backfill(self, schedule_id: UUID, view: GridView) -> bool:
+        """Whether an approved schedule is missing its grids (every approved one has a department grid)"""
+        if view != GridView.DEPARTMENT:
+            if await self.grid_repo.get_payload(schedule_id, GridView.DEPARTMENT, "") is not None:
+                return False
+        schedule = await ScheduleRepository(self.db).get_by_id(schedule_id)
+        return schedule is not None and schedule.status == ScheduleStatus.APPROVED
+    
+    async def _backfill(self, schedule_id: UUID, view: GridView, owner_key: str) -> Optional[str]:
+        """Materialize a schedule's grids on the primary; returns the requested grid's JSON"""
+        async with AsyncSessionLocal() as db:
+            schedule = await ScheduleRepository(db).get_by_id(schedule_id)
+            if schedule is None or schedule.status != ScheduleStatus.APPROVED:
+                return None
+            grid_service = ScheduleGridService(db)
+            # Already there when the replica lags or another request got here first
+            if await grid_service.grid_repo.get_payload(schedule_id, GridView.DEPARTMENT, "") is not None:
+                return await grid_service.grid_repo.get_payload(schedule_id, view, owner_key)
+            try:
+                grids = await grid_service.materialize(schedule)
+                await db.commit()
+            except IntegrityError:
+                # A concurrent backfill stored the grids first
+                await db.rollback()
+                return await grid_service.grid_repo.get_payload(schedule_id, view, owner_key)
+            metrics.increment("schedule.grids.backfilled")
+        for grid in grids:
+            if grid["view"] == view and grid["owner_key"] == owner_key:
+                return grid["payload"]
+        return None
@@ -0,0 +1,123 @@
+import asyncio
+from uuid import UUID
+from typing import Any, Dict, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import AsyncSessionLocal
+from app.repositories.schedule import ScheduleRepository
+from app.repositories.schedule_assignment import ScheduleAssignmentRepository
+from app.schemas.schedule.optimization import ScheduleOptimizeRequest, ScheduleJobResponse
+from app.scheduling.jobs import Job, job_registry
+from app.scheduling.occupancy import occupancy_registry
+from app.scheduling.optimizer import ScheduleOptimizer
+from app.scheduling.snapshot import build_snapshot
+from app.core.constants import ScheduleStatus
+
+OPTIMIZE_JOB = "optimize"
+
+
+class OptimizationService:
+    def __init__(self, db: AsyncSession):
+        self.schedule_repo = ScheduleRepository(db)
+        self.db = db
+    
+    async def start_optimization(
+        self,
+        schedule_id: UUID,
+        optimize_data: ScheduleOptimizeRequest,
+        user_id: UUID
+    ) -> ScheduleJobResponse:
+        """Start a background job improving the schedule's soft-constraint score"""
+        schedule = await self.schedule_repo.get_by_id(schedule_id)
+        if not schedule:
+            raise ValueError("Schedule not found")
+        
+        if schedule.status == ScheduleStatus.PENDING_APPROVAL:
+            raise ValueError("Schedules pending approval cannot be optimized")
+        
+        if optimize_data.apply and schedule.status not in (ScheduleStatus.DRAFT, ScheduleStatus.REJECTED):
+            raise ValueError("Only draft or rejected schedules can be modified; use apply=false")
+        
+        if job_registry.is_running(OPTIMIZE_JOB, schedule_id):
+            raise ValueError("An optimization is already running for this schedule")
+        
+        async def run(job: Job) -> Dict[str, Any]:
+            return await _optimize(job, schedule_id, optimize_data)
+        
+        job = job_registry.submit(OPTIMIZE_JOB, schedule_id, run)
+        return ScheduleJobResponse.model_validate(job)
+    
+    @staticmethod
+    def get_job(schedule_id: UUID, job_id: UUID) -> Optional[ScheduleJobResponse]:
+        """Get an optimization job of a schedule; needs no database session"""
+        job = job_registry.get(job_id)
+        if not job or job.schedule_id != schedule_id:
+            return None
+        return ScheduleJobResponse.model_validate(job)
+
+
+async def _optimize(job: Job, schedule_id: UUID, optimize_data: ScheduleOptimizeRequest) -> Dict[str, Any]:
+    """Job body; runs on its own session since the request's session is gone by then"""
+    async with AsyncSessionLocal() as db:
+        schedule = await ScheduleRepository(db).get_by_id(schedule_id)
+        if not schedule:
+            raise ValueError("Schedule not found")
+        
+        assignment_repo = ScheduleAssignmentRepository(db)
+        version = await assignment_repo.get_version(schedule_id)
+        snapshot = await build_snapshot(db, schedule)
+        rows = await assignment_repo.get_occupancy_rows(schedule_id)
+        # Release the connection while the CPU-bound search runs
+        await db.commit()
+        
+        # The optimizer works over the snapshot's int indices
+        optimizer = ScheduleOptimizer(
+            snapshot.to_problem(),
+            [
+                (
+                    r.id,
+                    snapshot.offerings.get(r.course_offering_id),
+                    snapshot.slots.get(r.time_slot_id),
+                    snapshot.rooms.get(r.classroom_id),
+                    snapshot.instructors.get(r.instructor_id),
+                )
+                for r in rows
+            ],
+            time_limit=optimize_data.time_limit_seconds,
+            max_daily_lessons=optimize_data.max_daily_lessons,
+            seed=optimize_data.seed,
+            progress=lambda fraction, best: job.report(fraction * 0.95, f"best score {best}")
+        )
+        result = await asyncio.to_thread(optimizer.optimize)
+        slot_ids, room_ids = snapshot.slots.keys, snapshot.rooms.keys
+        moves = [(m.assignment_id, slot_ids[m.time_slot_id], room_ids[m.classroom_id]) for m in result.moves]
+        
+        applied = False
+        if optimize_data.apply and moves:
+            # Hold the schedule row lock from the re-check through the commit;
+            # every assignment write bumps the revision under it, so none can
+            # commit in between
+            if await assignment_repo.lock_version(schedule_id) != version:
+                raise ValueError("Schedule changed during optimization; no moves were applied")
+            await assignment_repo.update_placements(moves)
+            await assignment_repo.bump_version(schedule_id)
+            await db.commit()
+            occupancy_registry.invalidate(schedule_id)
+            applied = True
+        
+        return {
+            "initial_score": result.initial_score,
+            "final_score": result.final_score,
+            "penalties": result.penalties,
+            "iterations": result.iterations,
+            "accepted": result.accepted,
+            "elapsed_ms": round(result.elapsed_seconds * 1000, 2),
+            "applied": applied,
+            "moves": [
+                {
+                    "assignment_id": str(assignment_id),
+                    "time_slot_id": str(slot_id),
+                    "classroom_id": str(room_id),
+                }
+                for assignment_id, slot_id, room_id in moves
+            ],
+        }
@@ -1,15 +1,40 @@
 from uuid import UUID
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.schedule import ScheduleRepository
 from app.repositories.schedule_assignment import ScheduleAssignmentRepository
 from app.schemas.schedule.dto import ScheduleCreate, ScheduleSubmit, ScheduleApproval
 from app.schemas.schedule.response import ScheduleResponse, ScheduleDetailResponse
-from app.schemas.schedule.assignment import ScheduleAssignmentCreate, ScheduleAssignmentResponse
+from app.schemas.schedule.assignment import (
+    ScheduleAssignmentCreate,
+    ScheduleAssignmentResponse,
+    ScheduleAssignmentBatchCreate,
+    ScheduleAssignmentBatchError,
+    ScheduleAssignmentBatchResponse
+)
+from app.schemas.schedule.generation import (
+    ScheduleGenerateRequest,
+    ScheduleGenerationResponse,
+    UnplacedOffering
+)
+from app.services.calendar_service import invalidate_term_calendars
+from app.services.grid_service import ScheduleGridService
+from app.scheduling.engine import ScheduleEngine
+from app.scheduling.occupancy import (
+    occupancy_registry,
+    OccupancyRow,
+    INSTRUCTOR_DOUBLE_BOOKING,
+    CLASSROOM_DOUBLE_BOOKING,
+    STUDENT_GROUP_CONFLICT
+)
 from app.core.constants import ScheduleStatus
 
 
+schedule_detail_adapter = TypeAdapter(ScheduleDetailResponse)
+
+
 class ScheduleService:
     def __init__(self, db: AsyncSession):
         self.schedule_repo = ScheduleRepository(db)
@@ -38,21 +63,24 @@ class ScheduleService:
         return ScheduleResponse.model_validate(schedule)
     
     async def get_schedule(self, schedule_id: UUID) -> Optional[ScheduleDetailResponse]:
-        """Get schedule with all details"""
+        """Get schedule with all details, validated in a single pass"""
         schedule = await self.schedule_repo.get_by_id(schedule_id)
         if not schedule:
             return None
         
-        assignments = await self.assignment_repo.get_by_schedule(schedule_id)
-        
-        schedule_dict = ScheduleResponse.model_validate(schedule).model_dump()
-        schedule_dict["assignments"] = [
-            ScheduleAssignmentResponse.model_validate(a).model_dump()
-            for a in assignments
-        ]
-        schedule_dict["review_notes"] = []  # Can be populated from review_notes relationship
+        rows = await self.assignment_repo.get_assignment_rows(schedule_id)
         
-        return ScheduleDetailResponse(**schedule_dict)
+        schedule_data = {name: getattr(schedule, name) for name in ScheduleResponse.model_fields}
+        schedule_data["assignments"] = rows
+        schedule_data["review_notes"] = []  # Can be populated from review_notes relationship
+        return ScheduleDetailResponse.model_validate(schedule_data)
+    
+    async def get_schedule_json(self, schedule_id: UUID) -> Optional[bytes]:
+        """Get schedule details already serialized to JSON by pydantic-core"""
+        schedule = await self.get_schedule(schedule_id)
+        if not schedule:
+            return None
+        return schedule_detail_adapter.dump_json(schedule)
     
     async def add_assignment(
         self,
@@ -61,38 +89,176 @@ class ScheduleService:
         user_id: UUID
     ) -> ScheduleAssignmentResponse:
         """Add course assignment to schedule"""
-        # Check for conflicts
         from app.repositories.course_offering import CourseOfferingRepository
         course_offering_repo = CourseOfferingRepository(self.db)
-        course_offering = await course_offering_repo.get_by_id(assignment_data.course_offering_id)
+        rows = await course_offering_repo.get_scheduling_rows_by_ids([assignment_data.course_offering_id])
         
-        if not course_offering:
+        if not rows:
             raise ValueError("Course offering not found")
+        offering = rows[0]
         
-        # Check instructor conflict
-        has_conflict = await self.assignment_repo.check_instructor_conflict(
-            course_offering.instructor_id,
-            assignment_data.time_slot_id,
-            schedule_id
+        # Check for conflicts against the schedule's occupancy index
+        index = await occupancy_registry.get(self.db, schedule_id)
+        occupancy_row = OccupancyRow(
+            id=None,
+            course_offering_id=offering.id,
+            time_slot_id=assignment_data.time_slot_id,
+            classroom_id=assignment_data.classroom_id,
+            instructor_id=offering.instructor_id,
+            department_id=offering.department_id,
+            class_level=offering.class_level,
+            group_no=offering.group_no,
+            is_mandatory=offering.is_mandatory
         )
-        if has_conflict:
+        conflicts = index.row_conflicts(occupancy_row)
+        if INSTRUCTOR_DOUBLE_BOOKING in conflicts:
             raise ValueError("Instructor conflict detected")
-        
-        # Check classroom conflict
-        has_conflict = await self.assignment_repo.check_classroom_conflict(
-            assignment_data.classroom_id,
-            assignment_data.time_slot_id,
-            schedule_id
-        )
-        if has_conflict:
+        if CLASSROOM_DOUBLE_BOOKING in conflicts:
             raise ValueError("Classroom conflict detected")
+        if STUDENT_GROUP_CONFLICT in conflicts:
+            raise ValueError("Student group conflict detected")
+        
+        # Reserve the slot before awaiting the insert so concurrent requests in
+        # this process see it; other workers rebuild from the database instead
+        index.add_row(occupancy_row)
         
         assignment_dict = assignment_data.model_dump()
         assignment_dict["schedule_id"] = schedule_id
         
-        assignment = await self.assignment_repo.create(assignment_dict)
+        try:
+            assignment = await self.assignment_repo.create(assignment_dict)
+            revision = await self.assignment_repo.bump_version(schedule_id)
+        except Exception:
+            occupancy_registry.invalidate(schedule_id)
+            raise
+        occupancy_registry.record_added(schedule_id, index, revision)
         return ScheduleAssignmentResponse.model_validate(assignment)
     
+    async def add_assignments_bulk(
+        self,
+        schedule_id: UUID,
+        batch_data: ScheduleAssignmentBatchCreate,
+        user_id: UUID
+    ) -> ScheduleAssignmentBatchResponse:
+        """Validate a batch of assignments in memory and insert the valid ones at once"""
+        from app.repositories.course_offering import CourseOfferingRepository
+        from app.repositories.time_slot import TimeSlotRepository
+        from app.repositories.classroom import ClassroomRepository
+        
+        schedule = await self.schedule_repo.get_by_id(schedule_id)
+        if not schedule:
+            raise ValueError("Schedule not found")
+        
+        items = batch_data.items
+        offering_rows = await CourseOfferingRepository(self.db).get_scheduling_rows_by_ids(
+            list({item.course_offering_id for item in items})
+        )
+        slots = await TimeSlotRepository(self.db).get_by_ids([item.time_slot_id for item in items])
+        classrooms = await ClassroomRepository(self.db).get_by_ids([item.classroom_id for item in items])
+        offerings = {row.id: row for row in offering_rows}
+        slots_by_id = {slot.id: slot for slot in slots}
+        classrooms_by_id = {classroom.id: classroom for classroom in classrooms}
+        
+        # Validate against the existing schedule and against earlier items of the batch
+        index = await occupancy_registry.get(self.db, schedule_id)
+        errors: List[ScheduleAssignmentBatchError] = []
+        rows_to_insert = []
+        conflict_messages = {
+            INSTRUCTOR_DOUBLE_BOOKING: "Instructor conflict detected",
+            CLASSROOM_DOUBLE_BOOKING: "Classroom conflict detected",
+            STUDENT_GROUP_CONFLICT: "Student group conflict detected",
+        }
+        
+        for position, item in enumerate(items):
+            offering = offerings.get(item.course_offering_id)
+            slot = slots_by_id.get(item.time_slot_id)
+            classroom = classrooms_by_id.get(item.classroom_id)
+            
+            if not offering:
+                detail = "Course offering not found"
+            elif not slot or slot.term_id != schedule.term_id:
+                detail = "Time slot not found in schedule term"
+            elif not classroom or not classroom.is_active:
+                detail = "Classroom not found or inactive"
+            else:
+                occupancy_row = OccupancyRow(
+                    id=None,
+                    course_offering_id=offering.id,
+                    time_slot_id=item.time_slot_id,
+                    classroom_id=item.classroom_id,
+                    instructor_id=offering.instructor_id,
+                    department_id=offering.department_id,
+                    class_level=offering.class_level,
+                    group_no=offering.group_no,
+                    is_mandatory=offering.is_mandatory
+                )
+                conflicts = index.row_conflicts(occupancy_row)
+                if not conflicts:
+                    index.add_row(occupancy_row)
+                    rows_to_insert.append({**item.model_dump(), "schedule_id": schedule_id})
+                    continue
+                detail = conflict_messages[conflicts[0]]
+            
+            errors.append(ScheduleAssignmentBatchError(index=position, detail=detail))
+        
+        if errors and batch_data.atomic:
+            # Reservations made for the valid items must not outlive this request
+            occupancy_registry.invalidate(schedule_id)
+            return ScheduleAssignmentBatchResponse(created=[], errors=errors)
+        
+        try:
+            assignments = await self.assignment_repo.create_many(rows_to_insert)
+            if assignments:
+                revision = await self.assignment_repo.bump_version(schedule_id)
+        except Exception:
+            occupancy_registry.invalidate(schedule_id)
+            raise
+        
+        if assignments:
+            occupancy_registry.record_added(schedule_id, index, revision)
+        
+        return ScheduleAssignmentBatchResponse(
+            created=[ScheduleAssignmentResponse.model_validate(a) for a in assignments],
+            errors=errors
+        )
+    
+    async def generate_schedule(
+        self,
+        schedule_id: UUID,
+        generate_data: ScheduleGenerateRequest,
+        user_id: UUID
+    ) -> ScheduleGenerationResponse:
+        """Auto-generate assignments for every missing weekly hour of the schedule"""
+        schedule = await self.schedule_repo.get_by_id(schedule_id)
+        if not schedule:
+            raise ValueError("Schedule not found")
+        
+        if schedule.status not in (ScheduleStatus.DRAFT, ScheduleStatus.REJECTED):
+            raise ValueError("Only draft or rejected schedules can be generated")
+        
+        occupancy_registry.invalidate(schedule_id)
+        result = await ScheduleEngine(self.db).generate(
+            schedule,
+            replace_existing=generate_data.replace_existing,
+            time_limit=generate_data.time_limit_seconds,
+            max_backtracks=generate_data.max_backtracks
+        )
+        
+        return ScheduleGenerationResponse(
+            schedule_id=schedule_id,
+            created_count=len(result.placements),
+            unplaced=[
+                UnplacedOffering(
+                    course_offering_id=u.course_offering_id,
+                    missing_hours=u.missing_hours,
+                    reason=u.reason
+                )
+                for u in result.unplaced
+            ],
+            backtracks=result.backtracks,
+            elapsed_ms=round(result.elapsed_seconds * 1000, 2)
+        )
+    
     async def submit_for_approval(
         self,
         schedule_id: UUID,
@@ -115,6 +281,8 @@ class ScheduleService:
         schedule = await self.schedule_repo.approve_schedule(schedule_id, user_id)
         if not schedule:
             raise ValueError("Schedule not found")
+        await ScheduleGridService(self.db).materialize(schedule)
+        invalidate_term_calendars(schedule.term_id)
         return ScheduleResponse.model_validate(schedule)
     
     async def reject_schedule(
@@ -127,6 +295,8 @@ class ScheduleService:
         schedule = await self.schedule_repo.reject_schedule(schedule_id, user_id)
         if not schedule:
             raise ValueError("Schedule not found")
+        await ScheduleGridService(self.db).clear(schedule.id)
+        invalidate_term_calendars(schedule.term_id)
         return ScheduleResponse.model_validate(schedule)
 
 
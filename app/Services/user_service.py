@@ -1,6 +1,9 @@
+from functools import partial
 from uuid import UUID
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.principal import principal_cache
+from app.db.session import on_commit
 from app.repositories.user import UserRepository
 from app.schemas.user.dto import UserCreate, UserUpdate
 from app.schemas.user.response import UserResponse, UserListResponse
@@ -12,9 +15,13 @@ class UserService:
         self.user_repo = UserRepository(db)
         self.db = db
     
+    def _invalidate_principal(self, user_id: UUID) -> None:
+        """Drop the user's cached principals once the change is committed"""
+        on_commit(self.db, partial(principal_cache.invalidate_user, user_id))
+    
     async def create_user(self, user_data: UserCreate) -> UserResponse:
         """Create new user"""
-        from app.core.security import hash_password
+        from app.core.security import hash_password_async
         
         # Normalize email
         email = normalize_email(user_data.email)
@@ -27,7 +34,7 @@ class UserService:
         # Hash password and create user
         user_dict = user_data.model_dump(exclude={"password"})
         user_dict["email"] = email
-        user_dict["password_hash"] = hash_password(user_data.password)
+        user_dict["password_hash"] = await hash_password_async(user_data.password)
         user = await self.user_repo.create(user_dict)
         return UserResponse.model_validate(user)
     
@@ -42,17 +49,36 @@ class UserService:
         self,
         skip: int = 0,
         limit: int = 50,
-        filters: Optional[dict] = None
+        filters: Optional[dict] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = False
     ) -> UserListResponse:
-        """Get list of users"""
-        users = await self.user_repo.get_multi(skip=skip, limit=limit, filters=filters)
-        total = await self.user_repo.count(filters=filters)
+        """Get list of users, keyset-paginated unless a legacy offset is given.
+        
+        Requests without a cursor keep the offset contract: page and an exact
+        total are always set. Cursor requests get a total only on demand.
+        """
+        next_cursor = None
+        page = None
+        total = None
+        if cursor:
+            users, next_cursor = await self.user_repo.get_page(limit=limit, cursor=cursor, filters=filters)
+            if include_total:
+                total = await self.user_repo.count(filters=filters) if filters else await self.user_repo.estimate_count()
+        else:
+            page = (skip // limit) + 1
+            total = await self.user_repo.count(filters=filters)
+            if skip:
+                users = await self.user_repo.get_multi(skip=skip, limit=limit, filters=filters, order_by="created_at")
+            else:
+                users, next_cursor = await self.user_repo.get_page(limit=limit, filters=filters)
         
         return UserListResponse(
             items=[UserResponse.model_validate(u) for u in users],
             total=total,
-            page=(skip // limit) + 1,
-            page_size=limit
+            page=page,
+            page_size=limit,
+            next_cursor=next_cursor
         )
     
     async def update_user(self, user_id: UUID, user_data: UserUpdate) -> Optional[UserResponse]:
@@ -64,17 +90,21 @@ class UserService:
             update_dict["email"] = normalize_email(update_dict["email"])
         
         user = await self.user_repo.update(user_id, update_dict)
+        self._invalidate_principal(user_id)
         if not user:
             return None
         return UserResponse.model_validate(user)
     
     async def delete_user(self, user_id: UUID) -> bool:
         """Delete user"""
-        return await self.user_repo.delete(user_id)
+        deleted = await self.user_repo.delete(user_id)
+        self._invalidate_principal(user_id)
+        return deleted
     
     async def deactivate_user(self, user_id: UUID) -> Optional[UserResponse]:
         """Deactivate user"""
         user = await self.user_repo.update(user_id, {"is_active": False})
+        self._invalidate_principal(user_id)
         if not user:
             return None
         return UserResponse.model_validate(user)
@@ -82,6 +112,7 @@ class UserService:
     async def activate_user(self, user_id: UUID) -> Optional[UserResponse]:
         """Activate user"""
         user = await self.user_repo.update(user_id, {"is_active": True})
+        self._invalidate_principal(user_id)
         if not user:
             return None
         return UserResponse.model_validate(user)
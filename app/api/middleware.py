@@ -0,0 +1,75 @@
+import logging
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from config import settings
+from app.core.metrics import metrics
+from app.db.query_stats import QueryStats, begin_query_stats
+
+logger = logging.getLogger("app.requests")
+
+
+def server_timing(stats: QueryStats, total_ms: float) -> str:
+    """Server-Timing header value for a request's database work"""
+    return (
+        f'db;dur={stats.db_ms:.1f};desc="{stats.statements} queries, {stats.rows} rows", '
+        f"total;dur={total_ms:.1f}"
+    )
+
+
+class QueryStatsMiddleware:
+    """Report each request's statement count, DB time and rows.
+
+    The numbers go out as a Server-Timing header, covering the work done
+    before the response started, and as fields of one log line written when
+    the response is finished, covering everything including streamed bodies.
+    Written as plain ASGI so the endpoint runs in this middleware's context
+    and its statements land in the same QueryStats.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        stats = begin_query_stats(f'{scope["method"]} {scope["path"]}')
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                total_ms = (time.perf_counter() - started) * 1000
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing(stats, total_ms).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            total_ms = (time.perf_counter() - started) * 1000
+            metrics.observe("http.request.db_queries", stats.statements, bounds=(0, 1, 2, 5, 10, 20, 50, 100))
+            metrics.observe("http.request.db_ms", stats.db_ms)
+            if settings.QUERY_STATS_LOG:
+                logger.info(
+                    "%s %d %.1fms db_queries=%d db_ms=%.1f db_rows=%d",
+                    stats.label,
+                    status_code,
+                    total_ms,
+                    stats.statements,
+                    stats.db_ms,
+                    stats.rows,
+                    extra={
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status_code": status_code,
+                        "duration_ms": round(total_ms, 3),
+                        "db_queries": stats.statements,
+                        "db_ms": round(stats.db_ms, 3),
+                        "db_rows": stats.rows,
+                    },
+                )
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends
+from app.core.metrics import metrics
+from app.db.session import get_pool_stats, get_read_pool_stats
+from app.dependencies import require_admin
+from app.schemas.admin.metrics import MetricsResponse
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_model=MetricsResponse)
+async def get_metrics(
+    current_user = Depends(require_admin)
+):
+    """Connection pool statistics, counters and latency histograms of this worker (admin only)"""
+    return MetricsResponse(
+        pool=get_pool_stats(),
+        read_pool=get_read_pool_stats(),
+        counters=metrics.snapshot(),
+        histograms=metrics.histograms()
+    )
@@ -6,7 +6,7 @@ from app.services.auth_service import AuthService
 from app.schemas.auth.login import LoginRequest, LoginResponse
 from app.schemas.user.dto import PasswordReset, UserCreate
 from app.dependencies import get_current_user
-from app.models.user import User 
+from app.core.principal import Principal
 from app.schemas.auth.register import RegisterRequest , RegisterResponse
 
 
@@ -84,7 +84,7 @@ async def refresh_token(
 @router.put("/change-password")
 async def change_password(
     password_data: PasswordReset,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Change user password"""
@@ -0,0 +1,107 @@
+from uuid import UUID
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.services.calendar_service import (
+    CalendarService,
+    CALENDAR_MEDIA_TYPE,
+    calendar_headers,
+    calendar_token,
+    verify_calendar_token
+)
+from app.schemas.calendar.response import CalendarSubscriptionResponse
+from app.dependencies import get_current_user, get_read_db
+from app.core.constants import CalendarOwner
+from app.core.metrics import metrics
+from app.core.principal import Principal
+from app.utils.etag import etag_matches
+
+# Calendar clients subscribe by URL and cannot send bearer tokens, so feeds are
+# authorized by the secret token in their URL, handed out by /subscriptions
+router = APIRouter()
+
+# Feed route name and its path parameter per owner
+FEED_ROUTES = {
+    CalendarOwner.INSTRUCTOR: ("get_instructor_calendar", "instructor_id"),
+    CalendarOwner.CLASSROOM: ("get_classroom_calendar", "classroom_id"),
+    CalendarOwner.PROGRAM_CLASS: ("get_program_class_calendar", "program_class_id"),
+}
+
+
+async def _feed_response(
+    db: AsyncSession,
+    owner: CalendarOwner,
+    owner_id: UUID,
+    term_id: Optional[UUID],
+    token: Optional[str],
+    if_none_match: Optional[str]
+) -> Response:
+    # A wrong token looks like a missing calendar, so ids cannot be probed
+    if not verify_calendar_token(owner, owner_id, token):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Calendar not found")
+    calendar_service = CalendarService(db)
+    feed = await calendar_service.get_feed(owner, owner_id, term_id)
+    if feed is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Calendar not found")
+    headers = calendar_headers(feed)
+    if etag_matches(if_none_match, feed.etag):
+        metrics.increment("calendar.not_modified")
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    content = await calendar_service.render(feed)
+    if content is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Calendar not found")
+    return Response(content=content, media_type=CALENDAR_MEDIA_TYPE, headers=headers)
+
+
+@router.get("/subscriptions/{owner}/{owner_id}", response_model=CalendarSubscriptionResponse)
+async def get_calendar_subscription(
+    owner: CalendarOwner,
+    owner_id: UUID,
+    request: Request,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Feed URL, with its secret token, of an instructor, classroom or program class"""
+    calendar_service = CalendarService(db)
+    if not await calendar_service.owner_exists(owner, owner_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Calendar not found")
+    route_name, parameter = FEED_ROUTES[owner]
+    url = request.url_for(route_name, **{parameter: str(owner_id)}).include_query_params(
+        token=calendar_token(owner, owner_id)
+    )
+    return CalendarSubscriptionResponse(owner=owner, url=str(url))
+
+
+@router.get("/instructors/{instructor_id}.ics")
+async def get_instructor_calendar(
+    instructor_id: UUID,
+    token: Optional[str] = Query(None, description="Feed token from /subscriptions"),
+    term_id: Optional[UUID] = Query(None, description="Defaults to the active term"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Instructor's approved timetable as an iCalendar feed"""
+    return await _feed_response(db, CalendarOwner.INSTRUCTOR, instructor_id, term_id, token, if_none_match)
+
+
+@router.get("/classrooms/{classroom_id}.ics")
+async def get_classroom_calendar(
+    classroom_id: UUID,
+    token: Optional[str] = Query(None, description="Feed token from /subscriptions"),
+    term_id: Optional[UUID] = Query(None, description="Defaults to the active term"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Classroom's approved timetable as an iCalendar feed"""
+    return await _feed_response(db, CalendarOwner.CLASSROOM, classroom_id, term_id, token, if_none_match)
+
+
+@router.get("/program-classes/{program_class_id}.ics")
+async def get_program_class_calendar(
+    program_class_id: UUID,
+    token: Optional[str] = Query(None, description="Feed token from /subscriptions"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Program class's approved timetable for its term as an iCalendar feed"""
+    return await _feed_response(db, CalendarOwner.PROGRAM_CLASS, program_class_id, None, token, if_none_match)
@@ -1,24 +1,31 @@
 from uuid import UUID
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import get_db
 from app.services.faculty_service import FacultyService
 from app.schemas.faculty.dto import FacultyCreate, FacultyUpdate
 from app.schemas.faculty.response import FacultyResponse, FacultyListResponse
-from app.dependencies import require_admin
+from app.schemas.schedule.generation import FacultyGenerateRequest, FacultyGenerationResponse
+from app.dependencies import require_admin, require_dean, get_read_db
 
 router = APIRouter()
 
 
 @router.get("/", response_model=FacultyListResponse)
 async def list_faculties(
-    skip: int = Query(0, ge=0),
+    skip: int = Query(0, ge=0, description="Legacy offset; prefer cursor"),
     limit: int = Query(50, ge=1, le=100),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    include_total: bool = Query(False, description="Add an estimated total to cursor pages"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List all faculties"""
     faculty_service = FacultyService(db)
-    return await faculty_service.get_faculties(skip=skip, limit=limit)
+    try:
+        return await faculty_service.get_faculties(skip=skip, limit=limit, cursor=cursor, include_total=include_total)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.post("/", response_model=FacultyResponse, status_code=status.HTTP_201_CREATED)
@@ -38,7 +45,7 @@ async def create_faculty(
 @router.get("/{faculty_id}", response_model=FacultyResponse)
 async def get_faculty(
     faculty_id: UUID,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get faculty by ID"""
     faculty_service = FacultyService(db)
@@ -75,3 +82,17 @@ async def delete_faculty(
     if not success:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Faculty not found")
 
+
+@router.post("/{faculty_id}/generate", response_model=FacultyGenerationResponse)
+async def generate_faculty_schedules(
+    faculty_id: UUID,
+    generate_data: FacultyGenerateRequest,
+    current_user = Depends(require_dean),
+    db: AsyncSession = Depends(get_db)
+):
+    """Generate all department schedules of a faculty for a term (dean/admin only)"""
+    faculty_service = FacultyService(db)
+    try:
+        return await faculty_service.generate_schedules(faculty_id, generate_data)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
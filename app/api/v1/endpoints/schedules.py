@@ -1,13 +1,28 @@
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import get_db
 from app.services.schedule_service import ScheduleService
+from app.services.conflict_service import ConflictService
+from app.services.optimization_service import OptimizationService
+from app.services.export_service import ScheduleExportService, EXPORT_MEDIA_TYPES, export_headers
+from app.services.grid_service import ScheduleGridService
 from app.schemas.schedule.dto import ScheduleCreate, ScheduleSubmit, ScheduleApproval
 from app.schemas.schedule.response import ScheduleResponse, ScheduleDetailResponse
-from app.schemas.schedule.assignment import ScheduleAssignmentCreate, ScheduleAssignmentResponse
-from app.dependencies import get_current_user, require_dean
-from app.models.user import User
+from app.schemas.schedule.assignment import (
+    ScheduleAssignmentCreate,
+    ScheduleAssignmentResponse,
+    ScheduleAssignmentBatchCreate,
+    ScheduleAssignmentBatchResponse
+)
+from app.schemas.schedule.conflict import ScheduleConflictReport
+from app.schemas.schedule.generation import ScheduleGenerateRequest, ScheduleGenerationResponse
+from app.schemas.schedule.optimization import ScheduleOptimizeRequest, ScheduleJobResponse
+from app.dependencies import get_current_user, require_dean, get_read_db
+from app.core.principal import Principal
+from app.core.constants import ExportFormat, GridView
 
 router = APIRouter()
 
@@ -15,7 +30,7 @@ router = APIRouter()
 @router.post("/", response_model=ScheduleResponse, status_code=status.HTTP_201_CREATED)
 async def create_schedule(
     schedule_data: ScheduleCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Create new schedule"""
@@ -29,22 +44,75 @@ async def create_schedule(
 @router.get("/{schedule_id}", response_model=ScheduleDetailResponse)
 async def get_schedule(
     schedule_id: UUID,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get schedule details"""
     schedule_service = ScheduleService(db)
-    schedule = await schedule_service.get_schedule(schedule_id)
-    if not schedule:
+    content = await schedule_service.get_schedule_json(schedule_id)
+    if content is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Schedule not found")
+    # Already validated and serialized; skip response_model re-validation
+    return Response(content=content, media_type="application/json")
+
+
+@router.get("/{schedule_id}/export")
+async def export_schedule(
+    schedule_id: UUID,
+    format: ExportFormat = Query(ExportFormat.NDJSON),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Stream schedule assignments with course, instructor, room and time as NDJSON or CSV"""
+    export_service = ScheduleExportService(db)
+    if not await export_service.schedule_exists(schedule_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Schedule not found")
-    return schedule
+    return StreamingResponse(
+        export_service.stream_assignments(schedule_id, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers=export_headers(schedule_id, format)
+    )
+
+
+@router.get("/{schedule_id}/grids/{view}")
+async def get_schedule_grid(
+    schedule_id: UUID,
+    view: GridView,
+    owner: Optional[str] = Query(None, description="Instructor id, classroom id or class level; not used for the department view"),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get a pre-rendered day x slot grid of an approved schedule"""
+    if view != GridView.DEPARTMENT and not owner:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="owner is required for this view")
+    grid_service = ScheduleGridService(db)
+    owner_key = "" if view == GridView.DEPARTMENT else owner
+    content = await grid_service.get_grid_json(schedule_id, view, owner_key)
+    if content is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Grid not found")
+    return Response(content=content, media_type="application/json")
+
+
+@router.get("/{schedule_id}/conflicts", response_model=ScheduleConflictReport)
+async def get_schedule_conflicts(
+    schedule_id: UUID,
+    full: bool = Query(False, description="Sweep every assignment instead of using the cached state"),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get current schedule conflicts grouped by type"""
+    conflict_service = ConflictService(db)
+    report = await conflict_service.get_conflict_report(schedule_id, full)
+    if not report:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Schedule not found")
+    return report
 
 
 @router.post("/{schedule_id}/assignments", response_model=ScheduleAssignmentResponse, status_code=status.HTTP_201_CREATED)
 async def add_assignment(
     schedule_id: UUID,
     assignment_data: ScheduleAssignmentCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Add assignment to schedule"""
@@ -55,11 +123,69 @@ async def add_assignment(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+@router.post("/{schedule_id}/assignments:batch", response_model=ScheduleAssignmentBatchResponse)
+async def add_assignments_batch(
+    schedule_id: UUID,
+    batch_data: ScheduleAssignmentBatchCreate,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Add many assignments to schedule in one transaction"""
+    schedule_service = ScheduleService(db)
+    try:
+        return await schedule_service.add_assignments_bulk(schedule_id, batch_data, current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/{schedule_id}/generate", response_model=ScheduleGenerationResponse)
+async def generate_schedule(
+    schedule_id: UUID,
+    generate_data: ScheduleGenerateRequest,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Auto-generate schedule assignments with the constraint solver"""
+    schedule_service = ScheduleService(db)
+    try:
+        return await schedule_service.generate_schedule(schedule_id, generate_data, current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/{schedule_id}/optimize", response_model=ScheduleJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def optimize_schedule(
+    schedule_id: UUID,
+    optimize_data: ScheduleOptimizeRequest,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Start a background job improving the schedule's soft constraints"""
+    optimization_service = OptimizationService(db)
+    try:
+        return await optimization_service.start_optimization(schedule_id, optimize_data, current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/{schedule_id}/optimize/{job_id}", response_model=ScheduleJobResponse)
+async def get_optimization_job(
+    schedule_id: UUID,
+    job_id: UUID,
+    current_user: Principal = Depends(get_current_user)
+):
+    """Get progress and result of an optimization job"""
+    job = OptimizationService.get_job(schedule_id, job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
+
+
 @router.post("/{schedule_id}/submit", response_model=ScheduleResponse)
 async def submit_schedule(
     schedule_id: UUID,
     submit_data: ScheduleSubmit,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Submit schedule for approval"""
@@ -74,7 +200,7 @@ async def submit_schedule(
 async def approve_schedule(
     schedule_id: UUID,
     approval_data: ScheduleApproval,
-    current_user: User = Depends(require_dean),
+    current_user: Principal = Depends(require_dean),
     db: AsyncSession = Depends(get_db)
 ):
     """Approve schedule (dean/admin only)"""
@@ -1,32 +1,38 @@
 from uuid import UUID
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import get_db
 from app.services.user_service import UserService
 from app.schemas.user.dto import UserCreate, UserUpdate
 from app.schemas.user.response import UserResponse, UserListResponse
-from app.dependencies import require_admin, get_current_user
-from app.models.user import User
+from app.dependencies import require_admin, get_current_user, get_read_db
+from app.core.principal import Principal
 
 router = APIRouter()
 
 
 @router.get("/", response_model=UserListResponse)
 async def list_users(
-    skip: int = Query(0, ge=0),
+    skip: int = Query(0, ge=0, description="Legacy offset; prefer cursor"),
     limit: int = Query(50, ge=1, le=100),
-    current_user: User = Depends(require_admin),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    include_total: bool = Query(False, description="Add an estimated total to cursor pages"),
+    current_user: Principal = Depends(require_admin),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List all users (admin only)"""
     user_service = UserService(db)
-    return await user_service.get_users(skip=skip, limit=limit)
+    try:
+        return await user_service.get_users(skip=skip, limit=limit, cursor=cursor, include_total=include_total)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def create_user(
     user_data: UserCreate,
-    current_user: User = Depends(require_admin),
+    current_user: Principal = Depends(require_admin),
     db: AsyncSession = Depends(get_db)
 ):
     """Create new user (admin only)"""
@@ -39,17 +45,22 @@ async def create_user(
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get current user information"""
-    return UserResponse.model_validate(current_user)
+    user_service = UserService(db)
+    user = await user_service.get_user(current_user.id)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return user
 
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: UUID,
-    current_user: User = Depends(require_admin),
-    db: AsyncSession = Depends(get_db)
+    current_user: Principal = Depends(require_admin),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get user by ID (admin only)"""
     user_service = UserService(db)
@@ -63,7 +74,7 @@ async def get_user(
 async def update_user(
     user_id: UUID,
     user_data: UserUpdate,
-    current_user: User = Depends(require_admin),
+    current_user: Principal = Depends(require_admin),
     db: AsyncSession = Depends(get_db)
 ):
     """Update user (admin only)"""
@@ -77,7 +88,7 @@ async def update_user(
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_user(
     user_id: UUID,
-    current_user: User = Depends(require_admin),
+    current_user: Principal = Depends(require_admin),
     db: AsyncSession = Depends(get_db)
 ):
     """Delete user (admin only)"""
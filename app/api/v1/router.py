@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, users, faculties, schedules
+from app.api.v1.endpoints import admin, auth, users, faculties, schedules, calendars
 
 api_router = APIRouter()
 
@@ -7,4 +7,5 @@ api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(faculties.router, prefix="/faculties", tags=["faculties"])
 api_router.include_router(schedules.router, prefix="/schedules", tags=["schedules"])
-
+api_router.include_router(calendars.router, prefix="/calendars", tags=["calendars"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
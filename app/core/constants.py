@@ -71,6 +71,31 @@ class ReviewNoteType(str, Enum):
     REJECTION = "rejection"
 
 
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class CalendarOwner(str, Enum):
+    INSTRUCTOR = "instructor"
+    CLASSROOM = "classroom"
+    PROGRAM_CLASS = "program-class"
+
+
+class GridView(str, Enum):
+    DEPARTMENT = "department"
+    INSTRUCTOR = "instructor"
+    CLASSROOM = "classroom"
+    CLASS_LEVEL = "class-level"
+
+
 # Mapping between class_level and label
 CLASS_LEVEL_TO_LABEL = {
     ClassLevel.FIRST: ClassLabel.FIRST_YEAR,
@@ -79,3 +104,24 @@ CLASS_LEVEL_TO_LABEL = {
     ClassLevel.FOURTH: ClassLabel.FOURTH_YEAR,
 }
 
+
+
+# Mapping between course level and the class level of the students attending it
+COURSE_LEVEL_TO_CLASS_LEVEL = {
+    CourseLevel.FIRST_YEAR: ClassLevel.FIRST,
+    CourseLevel.SECOND_YEAR: ClassLevel.SECOND,
+    CourseLevel.THIRD_YEAR: ClassLevel.THIRD,
+    CourseLevel.FOURTH_YEAR: ClassLevel.FOURTH,
+}
+
+CLASS_LEVEL_TO_COURSE_LEVEL = {
+    class_level: course_level for course_level, class_level in COURSE_LEVEL_TO_CLASS_LEVEL.items()
+}
+
+
+# Classroom types a course type can be taught in
+COURSE_TYPE_TO_CLASSROOM_TYPES = {
+    CourseType.THEORY: (ClassroomType.CLASSROOM, ClassroomType.AMPHI),
+    CourseType.LAB: (ClassroomType.LAB,),
+    CourseType.PRACTICE: (ClassroomType.CLASSROOM, ClassroomType.LAB),
+}
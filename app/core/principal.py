@@ -0,0 +1,58 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from config import settings
+from app.core.cache import TTLCache
+from app.core.constants import UserRole
+from app.core.security import TokenData, token_hash
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Authenticated caller: the decoded token plus the user's auth-relevant columns"""
+    id: UUID
+    role: UserRole
+    department_id: Optional[UUID]
+    is_active: bool
+    token: TokenData
+
+    @classmethod
+    def from_user(cls, user, token: TokenData) -> "Principal":
+        return cls(
+            id=user.id,
+            role=user.role,
+            department_id=user.department_id,
+            is_active=user.is_active,
+            token=token
+        )
+
+
+class PrincipalCache:
+    """Principals keyed by (user id, token hash) for a short TTL.
+
+    Saves get_current_user the users lookup on every request. Entries never
+    outlive their token. UserService invalidates a user's entries once a
+    change to their role or active flag commits, which takes effect at once
+    in this process; other worker processes pick it up within
+    PRINCIPAL_CACHE_TTL_SECONDS.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache: TTLCache[tuple, Principal] = TTLCache(maxsize, ttl)
+
+    def get(self, token_data: TokenData, token: str) -> Optional[Principal]:
+        return self._cache.get((token_data.user_id, token_hash(token)))
+
+    def put(self, token: str, principal: Principal) -> None:
+        remaining = (principal.token.exp - datetime.now()).total_seconds()
+        self._cache.set((principal.id, token_hash(token)), principal, ttl=remaining)
+
+    def invalidate_user(self, user_id: UUID) -> int:
+        return self._cache.discard_where(lambda key, _: key[0] == user_id)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL_SECONDS)
@@ -1,13 +1,31 @@
+import asyncio
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Callable, Optional, TypeVar
 from config import settings
+from app.core.cache import TTLCache
+from app.core.metrics import metrics
 from pydantic import BaseModel
 from uuid import UUID
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+T = TypeVar("T")
+
+_hash_executor: Optional[ThreadPoolExecutor] = None
+_hash_slots: Optional[asyncio.Semaphore] = None
+
+# Verified tokens by digest; each entry expires with its token
+_token_cache: TTLCache[str, "TokenData"] = TTLCache(settings.TOKEN_CACHE_SIZE, float("inf"))
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many password hashes are already queued"""
+
 
 class TokenData(BaseModel):
     user_id: UUID
@@ -25,6 +43,57 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def hash_worker_count() -> int:
+    return settings.PASSWORD_HASH_WORKERS or min(4, os.cpu_count() or 1)
+
+
+def _get_hash_executor() -> ThreadPoolExecutor:
+    """Thread pool dedicated to bcrypt, created on first use"""
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ThreadPoolExecutor(max_workers=hash_worker_count(), thread_name_prefix="bcrypt")
+    return _hash_executor
+
+
+async def _run_hashing(func: Callable[..., T], *args: Any) -> T:
+    """Run a bcrypt call off the event loop.
+
+    bcrypt releases the GIL, so the pool hashes in parallel while the loop
+    keeps serving requests. At most workers + PASSWORD_HASH_QUEUE_SIZE calls
+    are admitted; callers beyond that wait for a slot and get
+    PasswordHasherBusy if none frees up within the queue timeout.
+    """
+    global _hash_slots
+    if _hash_slots is None:
+        _hash_slots = asyncio.Semaphore(hash_worker_count() + settings.PASSWORD_HASH_QUEUE_SIZE)
+    try:
+        await asyncio.wait_for(_hash_slots.acquire(), settings.PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        raise PasswordHasherBusy("Too many password operations in progress, please retry")
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_get_hash_executor(), func, *args)
+    finally:
+        _hash_slots.release()
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash password on the bcrypt thread pool"""
+    return await _run_hashing(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify password on the bcrypt thread pool"""
+    return await _run_hashing(verify_password, plain_password, hashed_password)
+
+
+def shutdown_password_hasher() -> None:
+    global _hash_executor, _hash_slots
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
+    _hash_slots = None
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
@@ -58,8 +127,27 @@ def create_refresh_token(data: dict) -> str:
     return encoded_jwt
 
 
+def token_hash(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 def verify_token(token: str) -> Optional[TokenData]:
-    """Verify and decode JWT token"""
+    """Verify and decode JWT token, reusing the result for a token seen before"""
+    key = token_hash(token)
+    token_data = _token_cache.get(key)
+    if token_data is not None:
+        metrics.increment("auth.token_cache.hit")
+        return token_data
+    
+    metrics.increment("auth.token_cache.miss")
+    token_data = _decode_token(token)
+    if token_data is not None:
+        remaining = (token_data.exp - datetime.now()).total_seconds()
+        _token_cache.set(key, token_data, ttl=remaining)
+    return token_data
+
+
+def _decode_token(token: str) -> Optional[TokenData]:
     try:
         payload = jwt.decode(
             token,
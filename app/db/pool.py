@@ -0,0 +1,55 @@
+import time
+from typing import Any, Dict
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app.core.metrics import metrics
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long checkouts take.
+
+    Every checkout lands in the <prefix>.acquire_ms histogram, including the
+    pre-ping and any new connection it opens. Checkouts that started with no
+    idle connection and no overflow left, so they had to wait for another
+    request to return one, are also recorded in <prefix>.wait_ms. Telling
+    that wait apart from query time is what separates pool exhaustion from
+    slow SQL. The prefix is `metric_prefix`, db.pool for the primary.
+    """
+
+    metric_prefix = "db.pool"
+
+    def connect(self):
+        exhausted = (
+            self._max_overflow > -1
+            and self.overflow() >= self._max_overflow
+            and self.checkedin() == 0
+        )
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            metrics.increment(f"{self.metric_prefix}.timeouts")
+            raise
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            metrics.observe(f"{self.metric_prefix}.acquire_ms", elapsed)
+            if exhausted:
+                metrics.increment(f"{self.metric_prefix}.waits")
+                metrics.observe(f"{self.metric_prefix}.wait_ms", elapsed)
+
+    def stats(self) -> Dict[str, Any]:
+        """Live pool occupancy"""
+        return {
+            "size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "timeout_seconds": self.timeout(),
+        }
+
+
+class ReplicaQueuePool(InstrumentedQueuePool):
+    """Read replica's pool; its metrics go under db.read_pool"""
+
+    metric_prefix = "db.read_pool"
@@ -0,0 +1,88 @@
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_STARTED = "query_stats_started"
+
+
+class QueryStats:
+    """Statements, database time and rows of one request"""
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.statements = 0
+        self.db_ms = 0.0
+        self.rows = 0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, elapsed_ms: float, rows: int) -> None:
+        self.statements += 1
+        self.db_ms += elapsed_ms
+        self.rows += rows
+        threshold = settings.N_PLUS_ONE_THRESHOLD
+        if threshold is None:
+            return
+        self.shapes[statement] += 1
+        # Warn once per shape, when it first crosses the threshold
+        if self.shapes[statement] == threshold + 1:
+            logger.warning(
+                "Possible N+1: statement ran more than %d times in %s: %s",
+                threshold,
+                self.label or "one request",
+                " ".join(statement.split())[:300],
+            )
+
+
+# Stats of the request being served; shared, not copied, by tasks it spawns
+# in its context (background jobs start in a fresh one, see JobRegistry.submit)
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def begin_query_stats(label: str = "") -> QueryStats:
+    """Start collecting statements executed in this context"""
+    stats = QueryStats(label)
+    _current.set(stats)
+    return stats
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault(_STARTED, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current.get()
+    started = conn.info.get(_STARTED)
+    if stats is None or not started:
+        return
+    elapsed_ms = (time.perf_counter() - started.pop()) * 1000
+    stats.record(statement, elapsed_ms, max(cursor.rowcount, 0))
+
+
+def _handle_error(exception_context) -> None:
+    # A failed statement never reaches after_cursor_execute
+    connection = exception_context.connection
+    if connection is not None and connection.info.get(_STARTED):
+        connection.info[_STARTED].pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count statements, time and rows per request on a (sync) engine.
+
+    Statements run outside a request, e.g. during warm-up or in background
+    jobs (which JobRegistry starts in a fresh context), are not counted.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
@@ -1,17 +1,42 @@
 from collections.abc import AsyncGenerator
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from typing import Any, Callable, Dict, Optional
+from uuid import UUID
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import ORMExecuteState, Session
 from config import settings
+from app.core.cache import TTLCache
+from app.core.metrics import metrics
+from app.db.pool import InstrumentedQueuePool, ReplicaQueuePool
+from app.db.query_stats import instrument_engine
 
-# Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
+ENGINE_OPTIONS = dict(
+    echo=settings.DB_ECHO,
     future=True,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    poolclass=InstrumentedQueuePool,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+)
+
+# Create async engine
+engine = create_async_engine(settings.DATABASE_URL, **ENGINE_OPTIONS)
+
+# Read replica; without one, reads share the primary engine
+read_engine = (
+    create_async_engine(settings.DATABASE_READ_URL, **{**ENGINE_OPTIONS, "poolclass": ReplicaQueuePool})
+    if settings.DATABASE_READ_URL
+    else engine
 )
 
+if settings.QUERY_STATS_ENABLED:
+    instrument_engine(engine.sync_engine)
+    if read_engine is not engine:
+        instrument_engine(read_engine.sync_engine)
+
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -21,13 +46,107 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+# session.info keys: whether the session wrote, the principal it ran for,
+# whether writing is refused, the engine a read session was routed to, and
+# callbacks waiting for the next commit
+HAS_WRITES = "has_writes"
+PRINCIPAL_ID = "principal_id"
+READ_ONLY = "read_only"
+ROUTED_ENGINE = "routed_engine"
+AFTER_COMMIT = "after_commit"
+
+# Read-only sessions run in autocommit: no BEGIN, COMMIT or reset ROLLBACK
+# round trips. Each statement reads its own snapshot, which browse endpoints
+# tolerate; anything needing one consistent snapshot should use get_db.
+ReadSessionLocal = async_sessionmaker(
+    read_engine.execution_options(isolation_level="AUTOCOMMIT"),
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+    info={READ_ONLY: True, ROUTED_ENGINE: read_engine},
+)
+
+# Read-only sessions on the primary, for reads inside a read-your-writes window
+PrimaryReadSessionLocal = async_sessionmaker(
+    engine.execution_options(isolation_level="AUTOCOMMIT"),
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+    info={READ_ONLY: True, ROUTED_ENGINE: engine},
+)
+
+# Users who committed a write recently; their reads stay on the primary
+_recent_writers: TTLCache[UUID, bool] = TTLCache(settings.READ_YOUR_WRITES_SIZE, settings.READ_YOUR_WRITES_SECONDS)
+
+
+@event.listens_for(Session, "before_flush")
+def _flushing(session: Session, flush_context, instances) -> None:
+    if session.info.get(READ_ONLY):
+        raise InvalidRequestError("Cannot flush changes in a read-only session")
+
+
+@event.listens_for(Session, "after_flush")
+def _flushed(session: Session, flush_context) -> None:
+    session.info[HAS_WRITES] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _executed(state: ORMExecuteState) -> None:
+    if not state.is_select:
+        if state.session.info.get(READ_ONLY):
+            raise InvalidRequestError("Cannot execute writes in a read-only session")
+        state.session.info[HAS_WRITES] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _committed(session: Session) -> None:
+    for callback in session.info.pop(AFTER_COMMIT, ()):
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _rolled_back(session: Session) -> None:
+    session.info.pop(AFTER_COMMIT, None)
+
+
+def on_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    """Run callback once the session's current transaction commits; dropped on rollback"""
+    session.info.setdefault(AFTER_COMMIT, []).append(callback)
+
+
+def wrote_recently(user_id: UUID) -> bool:
+    return _recent_writers.get(user_id) is not None
+
+
+def read_session_factory(user_id: Optional[UUID] = None) -> async_sessionmaker:
+    """Replica sessions, or primary ones inside the user's read-your-writes window"""
+    if read_engine is engine or (user_id is not None and wrote_recently(user_id)):
+        return PrimaryReadSessionLocal
+    return ReadSessionLocal
+
+
+def routed_engine(session: AsyncSession) -> AsyncEngine:
+    """Engine, in its default isolation, that a session's reads were routed to"""
+    return session.info.get(ROUTED_ENGINE, engine)
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency to get database session"""
+    """Dependency to get database session; commits only if the request wrote"""
     async with AsyncSessionLocal() as session:
         try:
             yield session
-            await session.commit()
+            if session.info.get(HAS_WRITES) or session.new or session.dirty or session.deleted:
+                await session.commit()
+                metrics.increment("db.session.commits")
+                if session.info.get(PRINCIPAL_ID):
+                    _recent_writers.set(session.info[PRINCIPAL_ID], True)
+            else:
+                # Nothing to commit. close() still ends the transaction the reads
+                # began with the pool's reset ROLLBACK; only the COMMIT is saved.
+                # Read-only endpoints avoid both through get_read_db.
+                metrics.increment("db.session.commits_skipped")
         except Exception:
             await session.rollback()
             raise
@@ -35,6 +154,16 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+def get_pool_stats() -> Dict[str, Any]:
+    """Live statistics of the engine's connection pool"""
+    return engine.pool.stats()
+
+
+def get_read_pool_stats() -> Optional[Dict[str, Any]]:
+    """Live statistics of the replica's connection pool, if one is configured"""
+    return None if read_engine is engine else read_engine.pool.stats()
+
+
 async def init_db():
     """Initialize database - create all tables"""
     from app.models.base import Base
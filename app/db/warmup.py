@@ -0,0 +1,83 @@
+import asyncio
+import logging
+import time
+import uuid
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import configure_mappers
+from config import settings
+from app.db.session import AsyncSessionLocal, ReadSessionLocal, engine, read_engine
+from app.repositories.classroom import ClassroomRepository
+from app.repositories.faculty import FacultyRepository
+from app.repositories.schedule import ScheduleRepository
+from app.repositories.schedule_assignment import ScheduleAssignmentRepository
+from app.repositories.user import UserRepository
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupState:
+    """Readiness of this worker, as reported by /health/ready"""
+
+    def __init__(self):
+        self.ready = False
+        self.error: Optional[str] = None
+        self.elapsed_seconds: Optional[float] = None
+
+
+warmup_state = WarmupState()
+
+
+async def _run_hot_statements(session: AsyncSession) -> None:
+    """Execute the statements behind the busiest endpoints with ids that match nothing.
+
+    Running them, rather than just compiling, fills the engine's compiled
+    cache with the exact statement shapes requests use and has asyncpg
+    prepare them on this connection.
+    """
+    missing = uuid.uuid4()
+    await UserRepository(session).get_by_id(missing)
+    await UserRepository(session).get_page(limit=settings.DEFAULT_PAGE_SIZE)
+    await FacultyRepository(session).get_page(limit=settings.DEFAULT_PAGE_SIZE)
+    await FacultyRepository(session).get_by_id(missing)
+    await ScheduleRepository(session).get_by_id(missing)
+    await ScheduleAssignmentRepository(session).get_by_schedule(missing)
+    await ScheduleAssignmentRepository(session).get_version(missing)
+    await ClassroomRepository(session).get_available_classrooms(missing, 0)
+
+
+async def _warm_engine(session_factory: async_sessionmaker, connections: int) -> None:
+    """Open `connections` pooled connections at once and prime each of them"""
+    async def prime() -> None:
+        async with session_factory() as session:
+            await _run_hot_statements(session)
+            await session.rollback()
+
+    await asyncio.gather(*(prime() for _ in range(connections)))
+
+
+async def warm_up() -> None:
+    """Configure mappers, prime statement caches and fill the pools, then mark the worker ready"""
+    started = time.perf_counter()
+    configure_mappers()
+    connections = max(1, min(settings.DB_WARMUP_CONNECTIONS, settings.DB_POOL_SIZE))
+    await _warm_engine(AsyncSessionLocal, connections)
+    if read_engine is not engine:
+        await _warm_engine(ReadSessionLocal, connections)
+    warmup_state.elapsed_seconds = time.perf_counter() - started
+    warmup_state.error = None
+    warmup_state.ready = True
+    logger.info("Warm-up finished in %.2fs (%d connections per engine)", warmup_state.elapsed_seconds, connections)
+
+
+async def warm_up_until_ready() -> None:
+    """Retry warm-up with backoff, e.g. when the database was unreachable at startup"""
+    delay = 1.0
+    while not warmup_state.ready:
+        try:
+            await asyncio.wait_for(warm_up(), settings.WARMUP_TIMEOUT_SECONDS)
+        except Exception as e:
+            warmup_state.error = str(e) or type(e).__name__
+            logger.warning("Warm-up failed, retrying in %.0fs: %s", delay, warmup_state.error)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
@@ -1,21 +1,24 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
-from app.db.session import get_db
+from collections.abc import AsyncGenerator
+from typing import List, Optional
+from app.db.session import PRINCIPAL_ID, get_db, read_session_factory
+from app.core.metrics import metrics
 from app.core.security import verify_token
+from app.core.principal import Principal, principal_cache
 from app.repositories.user import UserRepository
-from app.models.user import User
 from app.core.constants import UserRole
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db)
-) -> User:
-    """Get current authenticated user"""
+) -> Principal:
+    """Get current authenticated user, from the principal cache when possible"""
     token = credentials.credentials
     token_data = verify_token(token)
     
@@ -25,21 +28,39 @@ async def get_current_user(
             detail="Invalid authentication credentials"
         )
     
-    user_repo = UserRepository(db)
-    user = await user_repo.get_by_id(token_data.user_id)
+    principal = principal_cache.get(token_data, token)
+    if principal is None:
+        user_repo = UserRepository(db)
+        user = await user_repo.get_by_id(token_data.user_id)
+        if user:
+            principal = Principal.from_user(user, token_data)
+            principal_cache.put(token, principal)
     
-    if not user or not user.is_active:
+    if not principal or not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found or inactive"
         )
     
-    return user
+    # Lets get_db open the user's read-your-writes window if the request writes
+    db.info[PRINCIPAL_ID] = principal.id
+    return principal
+
+
+async def get_read_db(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+) -> AsyncGenerator[AsyncSession, None]:
+    """Read-only session on the replica, or on the primary right after the caller's own write"""
+    token_data = verify_token(credentials.credentials) if credentials else None
+    session_factory = read_session_factory(token_data.user_id if token_data else None)
+    metrics.increment("db.session.read_only")
+    async with session_factory() as session:
+        yield session
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
     """Ensure user is active"""
     if not current_user.is_active:
         raise HTTPException(
@@ -52,8 +73,8 @@ async def get_current_active_user(
 def require_role(allowed_roles: List[str]):
     """Dependency to check user role"""
     async def role_checker(
-        current_user: User = Depends(get_current_active_user)
-    ) -> User:
+        current_user: Principal = Depends(get_current_active_user)
+    ) -> Principal:
         if current_user.role.value not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -65,7 +86,7 @@ def require_role(allowed_roles: List[str]):
 
 
 # Role-specific dependencies
-async def require_admin(current_user: User = Depends(get_current_active_user)) -> User:
+async def require_admin(current_user: Principal = Depends(get_current_active_user)) -> Principal:
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -74,7 +95,7 @@ async def require_admin(current_user: User = Depends(get_current_active_user)) -
     return current_user
 
 
-async def require_dean(current_user: User = Depends(get_current_active_user)) -> User:
+async def require_dean(current_user: Principal = Depends(get_current_active_user)) -> Principal:
     if current_user.role not in [UserRole.ADMIN, UserRole.DEAN]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -83,7 +104,7 @@ async def require_dean(current_user: User = Depends(get_current_active_user)) ->
     return current_user
 
 
-async def require_dept_rep(current_user: User = Depends(get_current_active_user)) -> User:
+async def require_dept_rep(current_user: Principal = Depends(get_current_active_user)) -> Principal:
     if current_user.role not in [UserRole.ADMIN, UserRole.DEAN, UserRole.DEPARTMENT_REP]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
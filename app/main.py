@@ -1,9 +1,16 @@
-from fastapi import FastAPI
+import asyncio
+from typing import Optional
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 from config import settings
 from app.core.logging import setup_logging
+from app.core.security import PasswordHasherBusy, shutdown_password_hasher
 from app.api.v1.router import api_router
+from app.api.middleware import QueryStatsMiddleware
+from app.db.warmup import warm_up, warm_up_until_ready, warmup_state
+from app.scheduling.faculty import shutdown_process_pool
 
 
 # Setup logging
@@ -16,9 +23,24 @@ async def lifespan(app: FastAPI):
     logger.info("Starting application...")
     # Initialize database tables (in production, use Alembic migrations instead)
     # await init_db()
+    warmup_task: Optional[asyncio.Task] = None
+    if settings.WARMUP_ENABLED:
+        try:
+            await asyncio.wait_for(warm_up(), settings.WARMUP_TIMEOUT_SECONDS)
+        except Exception as e:
+            # Serve liveness anyway; /health/ready stays 503 until a retry succeeds
+            logger.warning("Warm-up failed at startup, retrying in background: %s", e)
+            warmup_state.error = str(e) or type(e).__name__
+            warmup_task = asyncio.create_task(warm_up_until_ready())
+    else:
+        warmup_state.ready = True
     yield
     # Shutdown
     logger.info("Shutting down application...")
+    if warmup_task:
+        warmup_task.cancel()
+    shutdown_process_pool()
+    shutdown_password_hasher()
 
 
 app = FastAPI(
@@ -36,6 +58,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request query count and DB time (Server-Timing header and request log)
+if settings.QUERY_STATS_ENABLED:
+    app.add_middleware(QueryStatsMiddleware)
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"}
+    )
+
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
 
@@ -50,5 +84,18 @@ async def root():
 
 
 @app.get("/health")
+@app.get("/health/live")
 async def health_check():
+    """Liveness: the process is up and serving"""
     return {"status": "healthy"}
+
+
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness: warm-up finished, so the worker can take traffic"""
+    if not warmup_state.ready:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "warming_up", "error": warmup_state.error}
+        )
+    return {"status": "ready", "warmup_seconds": round(warmup_state.elapsed_seconds or 0.0, 3)}
@@ -13,6 +13,7 @@ from app.models.classroom import Classroom
 from app.models.time_slot import TimeSlot
 from app.models.schedule import Schedule
 from app.models.schedule_assignment import ScheduleAssignment
+from app.models.schedule_grid import ScheduleGrid
 from app.models.schedule_review_note import ScheduleReviewNote
 
 __all__ = [
@@ -34,6 +35,7 @@ __all__ = [
     "TimeSlot",
     "Schedule",
     "ScheduleAssignment",
+    "ScheduleGrid",
     "ScheduleReviewNote",
 ]
 
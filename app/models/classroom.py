@@ -23,6 +23,7 @@ class Classroom(BaseModel):
     __table_args__ = (
         CheckConstraint('capacity BETWEEN 1 AND 300', name='check_capacity'),
         Index('idx_classrooms_department', 'department_id'),
+        Index('idx_classrooms_features', 'features', postgresql_using='gin', postgresql_ops={'features': 'jsonb_path_ops'}),
     )
     
     def __repr__(self):
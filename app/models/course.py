@@ -22,7 +22,7 @@ class Course(BaseModel):
     # Relationships
     department = relationship("Department", back_populates="courses")
     term = relationship("Term", back_populates="courses")
-    parent_course = relationship("Course", remote_side=[BaseModel.id], backref="child_courses")
+    parent_course = relationship("Course", remote_side="Course.id", backref="child_courses")
     offerings = relationship("CourseOffering", back_populates="course", cascade="all, delete-orphan")
     
     __table_args__ = (
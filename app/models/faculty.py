@@ -14,6 +14,7 @@ class Faculty(BaseModel):
     
     __table_args__ = (
         Index('idx_faculties_code', 'code'),
+        Index('idx_faculties_created_id', 'created_at', 'id'),
     )
     
     def __repr__(self):
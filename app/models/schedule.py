@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, UniqueConstraint, Index
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID, ENUM
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
@@ -15,6 +15,8 @@ class Schedule(BaseModel):
     submitted_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=False)
     evaluated_at = Column(DateTime(timezone=True), nullable=True)
     evaluated_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    # Bumped in the same transaction as every write to the schedule's assignments
+    revision = Column(BigInteger, default=0, server_default="0", nullable=False)
     
     # Relationships
     term = relationship("Term", back_populates="schedules")
@@ -23,6 +25,7 @@ class Schedule(BaseModel):
     evaluator = relationship("User", foreign_keys=[evaluated_by], back_populates="evaluated_schedules")
     assignments = relationship("ScheduleAssignment", back_populates="schedule", cascade="all, delete-orphan")
     review_notes = relationship("ScheduleReviewNote", back_populates="schedule", cascade="all, delete-orphan")
+    grids = relationship("ScheduleGrid", back_populates="schedule", cascade="all, delete-orphan", passive_deletes=True)
     
     __table_args__ = (
         Index('idx_schedules_term_dept', 'term_id', 'department_id'),
@@ -21,6 +21,7 @@ class ScheduleAssignment(BaseModel):
     __table_args__ = (
         UniqueConstraint('schedule_id', 'course_offering_id', 'time_slot_id', name='uq_schedule_assignment'),
         Index('idx_schedule_assignments_composite', 'schedule_id', 'time_slot_id', 'classroom_id'),
+        Index('idx_schedule_assignments_classroom_slot', 'classroom_id', 'time_slot_id'),
     )
     
     def __repr__(self):
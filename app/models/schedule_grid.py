@@ -0,0 +1,24 @@
+from sqlalchemy import Column, String, Text, ForeignKey, DateTime
+from sqlalchemy.dialects.postgresql import UUID, ENUM
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.models.base import Base
+from app.core.constants import GridView
+
+
+class ScheduleGrid(Base):
+    """Pre-rendered day x slot grid of an approved schedule, one row per view and owner"""
+    __tablename__ = "schedule_grids"
+    
+    schedule_id = Column(UUID(as_uuid=True), ForeignKey("schedules.id", ondelete="CASCADE"), primary_key=True)
+    view = Column(ENUM(GridView), primary_key=True)
+    # Instructor/classroom id or class level value; empty for the department view
+    owner_key = Column(String(64), primary_key=True)
+    payload = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    # Relationships
+    schedule = relationship("Schedule", back_populates="grids")
+    
+    def __repr__(self):
+        return f"<ScheduleGrid(schedule_id={self.schedule_id}, view={self.view.value}, owner_key={self.owner_key})>"
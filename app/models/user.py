@@ -22,9 +22,13 @@ class User(BaseModel):
     instructor_availability_created = relationship("InstructorAvailability", back_populates="created_by_user")
     review_notes = relationship("ScheduleReviewNote", back_populates="created_by_user")
     
+    # Columns usable in list filters; never password_hash
+    __filterable__ = ("id", "full_name", "email", "role", "department_id", "is_active", "created_at", "updated_at")
+    
     __table_args__ = (
         Index('idx_users_email', 'email'),
         Index('idx_users_department', 'department_id'),
+        Index('idx_users_created_id', 'created_at', 'id'),
     )
     
     def __repr__(self):
@@ -1,8 +1,11 @@
-from typing import Generic, TypeVar, Type, List, Optional, Dict, Any
+from typing import Generic, TypeVar, Type, List, Optional, Dict, Any, Tuple
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete, and_, func
+from sqlalchemy import select, insert, update, delete, and_, func, tuple_, table, column
 from sqlalchemy.orm import selectinload
+from app.utils.pagination import encode_cursor, decode_cursor
+
+pg_class = table("pg_class", column("oid"), column("reltuples"))
 
 ModelType = TypeVar("ModelType")
 
@@ -13,12 +16,22 @@ class BaseRepository(Generic[ModelType]):
         self.db = db
     
     async def create(self, obj_in: Dict[str, Any]) -> ModelType:
-        """Create new record"""
-        db_obj = self.model(**obj_in)
-        self.db.add(db_obj)
-        await self.db.flush()
-        await self.db.refresh(db_obj)
-        return db_obj
+        """Create new record with one INSERT ... RETURNING, server defaults included"""
+        result = await self.db.scalars(
+            insert(self.model).values(**obj_in).returning(self.model)
+        )
+        return result.one()
+    
+    async def create_many(self, objs_in: List[Dict[str, Any]]) -> List[ModelType]:
+        """Create records with one multi-row INSERT ... RETURNING, in input order"""
+        if not objs_in:
+            return []
+        
+        result = await self.db.scalars(
+            insert(self.model).returning(self.model, sort_by_parameter_order=True),
+            objs_in
+        )
+        return list(result.all())
     
     async def get_by_id(self, id: UUID) -> Optional[ModelType]:
         """Get single record by ID"""
@@ -27,6 +40,15 @@ class BaseRepository(Generic[ModelType]):
         )
         return result.scalar_one_or_none()
     
+    async def get_by_ids(self, ids: List[UUID]) -> List[ModelType]:
+        """Get records by a list of IDs with a single IN query"""
+        if not ids:
+            return []
+        result = await self.db.execute(
+            select(self.model).where(self.model.id.in_(set(ids)))
+        )
+        return list(result.scalars().all())
+    
     async def get_by_field(self, field: str, value: Any) -> Optional[ModelType]:
         """Get single record by any field"""
         field_attr = getattr(self.model, field, None)
@@ -67,6 +89,57 @@ class BaseRepository(Generic[ModelType]):
         result = await self.db.execute(query)
         return list(result.scalars().all())
     
+    async def get_page(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """Get records in (created_at, id) order after a keyset cursor.
+        
+        Unlike OFFSET paging, each page costs the same however deep it is:
+        the cursor seeks straight to the last row seen. Returns the page and
+        the cursor of the next one, or None on the last page.
+        """
+        query = select(self.model)
+        
+        if filters:
+            from app.utils.filters import build_dynamic_filters
+            filter_list = build_dynamic_filters(self.model, filters)
+            if filter_list:
+                query = query.where(and_(*filter_list))
+        
+        if cursor:
+            created_at, last_id = decode_cursor(cursor)
+            query = query.where(
+                tuple_(self.model.created_at, self.model.id) > tuple_(created_at, last_id)
+            )
+        
+        # One extra row tells whether another page follows
+        query = query.order_by(self.model.created_at, self.model.id).limit(limit + 1)
+        result = await self.db.execute(query)
+        items = list(result.scalars().all())
+        
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+        return items, next_cursor
+    
+    async def estimate_count(self) -> int:
+        """Approximate row count from planner statistics (pg_class.reltuples).
+        
+        Falls back to an exact count when the table has no statistics yet.
+        """
+        result = await self.db.execute(
+            select(pg_class.c.reltuples)
+            .where(pg_class.c.oid == func.to_regclass(self.model.__tablename__))
+        )
+        estimate = result.scalar()
+        if estimate is None or estimate <= 0:
+            return await self.count()
+        return int(estimate)
+    
     async def update(self, id: UUID, obj_in: Dict[str, Any]) -> Optional[ModelType]:
         """Update existing record"""
         # Remove None values
@@ -75,13 +148,27 @@ class BaseRepository(Generic[ModelType]):
         if not update_data:
             return await self.get_by_id(id)
         
-        await self.db.execute(
+        result = await self.db.scalars(
             update(self.model)
             .where(self.model.id == id)
             .values(**update_data)
+            .returning(self.model)
+            .execution_options(populate_existing=True)
         )
-        await self.db.flush()
-        return await self.get_by_id(id)
+        return result.one_or_none()
+    
+    async def update_many(self, objs_in: List[Dict[str, Any]]) -> int:
+        """Update records by primary key with one executemany UPDATE.
+        
+        Each dict holds the record's "id" plus the values to set; rows are
+        grouped by their set of keys, so uniform batches go out as a single
+        statement. Returns the number of rows given.
+        """
+        if not objs_in:
+            return 0
+        
+        await self.db.execute(update(self.model), objs_in)
+        return len(objs_in)
     
     async def delete(self, id: UUID) -> bool:
         """Delete record (hard delete)"""
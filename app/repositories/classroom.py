@@ -2,7 +2,7 @@ from typing import List, Optional, Dict, Any
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, aliased
 from app.models.classroom import Classroom
 from app.repositories.base import BaseRepository
 
@@ -30,26 +30,86 @@ class ClassroomRepository(BaseRepository[Classroom]):
         )
         return list(result.scalars().all())
     
-    async def get_available_classrooms(
+    async def get_active(self) -> List[Classroom]:
+        """Get all active classrooms"""
+        result = await self.db.execute(
+            select(Classroom).where(Classroom.is_active == True)
+        )
+        return list(result.scalars().all())
+    
+    def _available_query(
         self,
-        time_slot_id: UUID,
-        schedule_id: UUID,
+        target_slot_ids: List[UUID],
         min_capacity: int,
         classroom_type: Optional[str] = None,
         required_features: Optional[Dict[str, Any]] = None
-    ) -> List[Classroom]:
-        """Get classrooms available at specific time slot"""
-        # This is a simplified version - full implementation would check schedule_assignments
-        query = select(Classroom).where(
-            and_(
-                Classroom.is_active == True,
-                Classroom.capacity >= min_capacity
-            )
+    ):
+        """Active classrooms paired with each target slot they are free in.
+
+        A room is busy when any assignment of the term, in any schedule, books
+        it in a slot of the same day overlapping the target slot; that is
+        checked with a NOT EXISTS anti-join served by
+        idx_schedule_assignments_classroom_slot.
+        """
+        from app.models.schedule_assignment import ScheduleAssignment
+        from app.models.time_slot import TimeSlot
+        
+        target = aliased(TimeSlot, name="target_slot")
+        busy = aliased(TimeSlot, name="busy_slot")
+        booked = (
+            select(ScheduleAssignment.id)
+            .join(busy, ScheduleAssignment.time_slot_id == busy.id)
+            .where(and_(
+                ScheduleAssignment.classroom_id == Classroom.id,
+                busy.term_id == target.term_id,
+                busy.day_of_week == target.day_of_week,
+                busy.start_time < target.end_time,
+                busy.end_time > target.start_time
+            ))
         )
         
+        query = (
+            select(target.id, Classroom)
+            .join(target, target.id.in_(target_slot_ids))
+            .where(and_(
+                Classroom.is_active == True,
+                Classroom.capacity >= min_capacity,
+                ~booked.exists()
+            ))
+        )
         if classroom_type:
             query = query.where(Classroom.classroom_type == classroom_type)
-        
-        result = await self.db.execute(query)
-        return list(result.scalars().all())
-
+        if required_features:
+            query = query.where(Classroom.features.contains(required_features))
+        return query.order_by(Classroom.capacity, Classroom.code)
+    
+    async def get_available_classrooms(
+        self,
+        time_slot_id: UUID,
+        min_capacity: int,
+        classroom_type: Optional[str] = None,
+        required_features: Optional[Dict[str, Any]] = None
+    ) -> List[Classroom]:
+        """Get classrooms free at a time slot across every schedule of its term"""
+        result = await self.db.execute(
+            self._available_query([time_slot_id], min_capacity, classroom_type, required_features)
+        )
+        return [row.Classroom for row in result.all()]
+    
+    async def get_available_classrooms_for_slots(
+        self,
+        time_slot_ids: List[UUID],
+        min_capacity: int,
+        classroom_type: Optional[str] = None,
+        required_features: Optional[Dict[str, Any]] = None
+    ) -> Dict[UUID, List[Classroom]]:
+        """Get free classrooms for several time slots in one round trip"""
+        available: Dict[UUID, List[Classroom]] = {slot_id: [] for slot_id in time_slot_ids}
+        if not time_slot_ids:
+            return available
+        result = await self.db.execute(
+            self._available_query(list(set(time_slot_ids)), min_capacity, classroom_type, required_features)
+        )
+        for slot_id, classroom in result.all():
+            available[slot_id].append(classroom)
+        return available
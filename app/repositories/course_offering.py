@@ -1,7 +1,9 @@
 from typing import List, Optional
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, and_
+from sqlalchemy.engine import Row
+from app.models.course import Course
 from app.models.course_offering import CourseOffering
 from app.repositories.base import BaseRepository
 
@@ -9,4 +11,41 @@ from app.repositories.base import BaseRepository
 class CourseOfferingRepository(BaseRepository[CourseOffering]):
     def __init__(self, db: AsyncSession):
         super().__init__(CourseOffering, db)
-
+    
+    def _scheduling_columns(self):
+        return (
+            select(
+                CourseOffering.id,
+                CourseOffering.instructor_id,
+                CourseOffering.classroom_id,
+                CourseOffering.student_count,
+                CourseOffering.group_no,
+                Course.department_id,
+                Course.class_level,
+                Course.course_type,
+                Course.weekly_hours,
+                Course.is_mandatory,
+            )
+            .join(Course, CourseOffering.course_id == Course.id)
+        )
+    
+    async def get_scheduling_rows(self, term_id: UUID, department_id: UUID) -> List[Row]:
+        """Get offering and course columns needed for scheduling a department term"""
+        result = await self.db.execute(
+            self._scheduling_columns()
+            .where(and_(
+                CourseOffering.term_id == term_id,
+                Course.department_id == department_id
+            ))
+            .order_by(Course.code, CourseOffering.group_no)
+        )
+        return list(result.all())
+    
+    async def get_scheduling_rows_by_ids(self, offering_ids: List[UUID]) -> List[Row]:
+        """Get scheduling columns for specific offerings"""
+        if not offering_ids:
+            return []
+        result = await self.db.execute(
+            self._scheduling_columns().where(CourseOffering.id.in_(offering_ids))
+        )
+        return list(result.all())
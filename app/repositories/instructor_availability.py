@@ -0,0 +1,32 @@
+from typing import List, Optional
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_
+from sqlalchemy.engine import Row
+from app.models.instructor_availability import InstructorAvailability
+from app.repositories.base import BaseRepository
+
+
+class InstructorAvailabilityRepository(BaseRepository[InstructorAvailability]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(InstructorAvailability, db)
+    
+    async def get_unavailable_slots(
+        self,
+        term_id: UUID,
+        instructor_ids: Optional[List[UUID]] = None
+    ) -> List[Row]:
+        """Get (instructor_id, time_slot_id) pairs marked unavailable for term"""
+        query = select(
+            InstructorAvailability.instructor_id,
+            InstructorAvailability.time_slot_id
+        ).where(and_(
+            InstructorAvailability.term_id == term_id,
+            InstructorAvailability.is_available == False
+        ))
+        
+        if instructor_ids is not None:
+            query = query.where(InstructorAvailability.instructor_id.in_(instructor_ids))
+        
+        result = await self.db.execute(query)
+        return list(result.all())
@@ -0,0 +1,8 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.program_class import ProgramClass
+from app.repositories.base import BaseRepository
+
+
+class ProgramClassRepository(BaseRepository[ProgramClass]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(ProgramClass, db)
@@ -1,8 +1,8 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import UUID
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, func
 from sqlalchemy.orm import selectinload
 from app.models.schedule import Schedule
 from app.core.constants import ScheduleStatus
@@ -33,6 +33,22 @@ class ScheduleRepository(BaseRepository[Schedule]):
         )
         return result.scalar_one_or_none()
     
+    async def get_by_term_and_departments(
+        self,
+        term_id: UUID,
+        department_ids: List[UUID]
+    ) -> List[Schedule]:
+        """Get the term's schedules of several departments with a single IN query"""
+        if not department_ids:
+            return []
+        result = await self.db.execute(
+            select(Schedule).where(and_(
+                Schedule.term_id == term_id,
+                Schedule.department_id.in_(department_ids)
+            ))
+        )
+        return list(result.scalars().all())
+    
     async def get_schedules_by_status(
         self,
         status: ScheduleStatus,
@@ -83,4 +99,23 @@ class ScheduleRepository(BaseRepository[Schedule]):
             "evaluated_at": datetime.utcnow(),
             "evaluated_by": user_id
         })
-
+    
+    async def get_term_version(self, term_id: UUID) -> Tuple[int, int, Optional[datetime]]:
+        """Get (approved schedule count, assignment count, latest update) of the term's approved schedules"""
+        from app.models.schedule_assignment import ScheduleAssignment
+        
+        result = await self.db.execute(
+            select(
+                func.count(func.distinct(Schedule.id)),
+                func.count(ScheduleAssignment.id),
+                func.greatest(func.max(Schedule.updated_at), func.max(ScheduleAssignment.updated_at))
+            )
+            .select_from(Schedule)
+            .outerjoin(ScheduleAssignment, ScheduleAssignment.schedule_id == Schedule.id)
+            .where(and_(
+                Schedule.term_id == term_id,
+                Schedule.status == ScheduleStatus.APPROVED
+            ))
+        )
+        schedules, assignments, latest = result.one()
+        return schedules, assignments, latest
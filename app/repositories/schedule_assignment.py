@@ -1,9 +1,11 @@
-from typing import List, Optional
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, delete, update, and_, or_, Select
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import selectinload
 from app.models.schedule_assignment import ScheduleAssignment
+from app.core.constants import CourseLevel, ScheduleStatus
 from app.repositories.base import BaseRepository
 
 
@@ -24,52 +26,235 @@ class ScheduleAssignmentRepository(BaseRepository[ScheduleAssignment]):
         )
         return list(result.scalars().all())
     
-    async def check_instructor_conflict(
-        self,
-        instructor_id: UUID,
-        time_slot_id: UUID,
-        schedule_id: UUID,
-        exclude_assignment_id: Optional[UUID] = None
-    ) -> bool:
-        """Check if instructor has conflict at time slot"""
+    async def get_assignment_rows(self, schedule_id: UUID) -> List[Row]:
+        """Get a schedule's assignment columns only, without loading ORM objects"""
+        result = await self.db.execute(
+            select(
+                ScheduleAssignment.id,
+                ScheduleAssignment.schedule_id,
+                ScheduleAssignment.course_offering_id,
+                ScheduleAssignment.time_slot_id,
+                ScheduleAssignment.classroom_id,
+                ScheduleAssignment.created_at
+            )
+            .where(ScheduleAssignment.schedule_id == schedule_id)
+            .order_by(ScheduleAssignment.created_at, ScheduleAssignment.id)
+        )
+        return list(result.all())
+    
+    @staticmethod
+    def export_statement(schedule_id: UUID) -> Select:
+        """Flat timetable rows of a schedule, in day and time order"""
+        from app.models.classroom import Classroom
+        from app.models.course import Course
         from app.models.course_offering import CourseOffering
+        from app.models.instructor import Instructor
+        from app.models.time_slot import TimeSlot
         
-        # Check if instructor is teaching another course at the same time slot
-        query = select(ScheduleAssignment).join(CourseOffering).where(
-            and_(
-                CourseOffering.instructor_id == instructor_id,
-                ScheduleAssignment.time_slot_id == time_slot_id,
-                ScheduleAssignment.schedule_id == schedule_id
+        return (
+            select(
+                ScheduleAssignment.id.label("assignment_id"),
+                Course.code.label("course_code"),
+                Course.name.label("course_name"),
+                CourseOffering.group_no,
+                Instructor.full_name.label("instructor_name"),
+                Classroom.code.label("room_code"),
+                TimeSlot.day_of_week,
+                TimeSlot.start_time,
+                TimeSlot.end_time
             )
+            .join(CourseOffering, ScheduleAssignment.course_offering_id == CourseOffering.id)
+            .join(Course, CourseOffering.course_id == Course.id)
+            .join(Instructor, CourseOffering.instructor_id == Instructor.id)
+            .join(Classroom, ScheduleAssignment.classroom_id == Classroom.id)
+            .join(TimeSlot, ScheduleAssignment.time_slot_id == TimeSlot.id)
+            .where(ScheduleAssignment.schedule_id == schedule_id)
+            .order_by(TimeSlot.day_of_week, TimeSlot.start_time, Course.code, ScheduleAssignment.id)
         )
+    
+    async def get_grid_rows(self, schedule_id: UUID) -> List[Row]:
+        """Get export_statement rows plus the instructor, classroom and course level they belong to"""
+        from app.models.course import Course
+        from app.models.course_offering import CourseOffering
         
-        if exclude_assignment_id:
-            query = query.where(ScheduleAssignment.id != exclude_assignment_id)
+        result = await self.db.execute(
+            self.export_statement(schedule_id).add_columns(
+                CourseOffering.instructor_id,
+                ScheduleAssignment.classroom_id,
+                Course.class_level
+            )
+        )
+        return list(result.all())
+    
+    async def get_calendar_rows(
+        self,
+        term_id: UUID,
+        instructor_id: Optional[UUID] = None,
+        classroom_id: Optional[UUID] = None,
+        student_group: Optional[Tuple[UUID, CourseLevel, int]] = None
+    ) -> List[Row]:
+        """Get lessons of the term's approved schedules for one instructor, classroom or
+        (department_id, course level, group_no) student group"""
+        from app.models.classroom import Classroom
+        from app.models.course import Course
+        from app.models.course_offering import CourseOffering
+        from app.models.instructor import Instructor
+        from app.models.schedule import Schedule
+        from app.models.time_slot import TimeSlot
         
+        query = (
+            select(
+                ScheduleAssignment.id,
+                Course.code.label("course_code"),
+                Course.name.label("course_name"),
+                CourseOffering.group_no,
+                Instructor.full_name.label("instructor_name"),
+                Classroom.code.label("room_code"),
+                TimeSlot.day_of_week,
+                TimeSlot.start_time,
+                TimeSlot.end_time
+            )
+            .join(Schedule, ScheduleAssignment.schedule_id == Schedule.id)
+            .join(CourseOffering, ScheduleAssignment.course_offering_id == CourseOffering.id)
+            .join(Course, CourseOffering.course_id == Course.id)
+            .join(Instructor, CourseOffering.instructor_id == Instructor.id)
+            .join(Classroom, ScheduleAssignment.classroom_id == Classroom.id)
+            .join(TimeSlot, ScheduleAssignment.time_slot_id == TimeSlot.id)
+            .where(and_(
+                Schedule.term_id == term_id,
+                Schedule.status == ScheduleStatus.APPROVED
+            ))
+            .order_by(TimeSlot.day_of_week, TimeSlot.start_time, Course.code, ScheduleAssignment.id)
+        )
+        if instructor_id is not None:
+            query = query.where(CourseOffering.instructor_id == instructor_id)
+        if classroom_id is not None:
+            query = query.where(ScheduleAssignment.classroom_id == classroom_id)
+        if student_group is not None:
+            department_id, class_level, group_no = student_group
+            # Mandatory courses of the group's year; offerings without a group are shared by all groups
+            query = query.where(and_(
+                Course.department_id == department_id,
+                Course.class_level == class_level,
+                Course.is_mandatory == True,
+                or_(CourseOffering.group_no == group_no, CourseOffering.group_no.is_(None))
+            ))
         result = await self.db.execute(query)
-        conflicting = result.scalar_one_or_none()
-        return conflicting is not None
+        return list(result.all())
+    
+    async def get_version(self, schedule_id: UUID) -> Optional[int]:
+        """Get the schedule's assignment revision, used to detect schedule changes"""
+        from app.models.schedule import Schedule
+        
+        result = await self.db.execute(select(Schedule.revision).where(Schedule.id == schedule_id))
+        return result.scalar_one_or_none()
+    
+    async def lock_version(self, schedule_id: UUID) -> Optional[int]:
+        """Get the schedule's assignment revision with SELECT ... FOR UPDATE, locking its row until the transaction ends"""
+        from app.models.schedule import Schedule
+        
+        result = await self.db.execute(
+            select(Schedule.revision).where(Schedule.id == schedule_id).with_for_update()
+        )
+        return result.scalar_one_or_none()
+    
+    async def bump_version(self, schedule_id: UUID) -> int:
+        """Advance the schedule's assignment revision; call in the transaction that wrote its assignments.
+        
+        The UPDATE holds the schedule row lock until commit, so concurrent
+        writers get consecutive revisions in commit order.
+        """
+        from app.models.schedule import Schedule
+        
+        result = await self.db.execute(
+            update(Schedule)
+            .where(Schedule.id == schedule_id)
+            .values(revision=Schedule.revision + 1)
+            .returning(Schedule.revision)
+        )
+        return result.scalar_one()
     
-    async def check_classroom_conflict(
+    async def get_stamps(self, schedule_id: UUID) -> List[Row]:
+        """Get (id, updated_at, time_slot_id, classroom_id) of every assignment in a schedule"""
+        result = await self.db.execute(
+            select(
+                ScheduleAssignment.id,
+                ScheduleAssignment.updated_at,
+                ScheduleAssignment.time_slot_id,
+                ScheduleAssignment.classroom_id
+            )
+            .where(ScheduleAssignment.schedule_id == schedule_id)
+        )
+        return list(result.all())
+    
+    async def get_occupancy_rows(
         self,
-        classroom_id: UUID,
-        time_slot_id: UUID,
         schedule_id: UUID,
-        exclude_assignment_id: Optional[UUID] = None
-    ) -> bool:
-        """Check if classroom has conflict at time slot"""
-        query = select(ScheduleAssignment).where(
-            and_(
-                ScheduleAssignment.classroom_id == classroom_id,
-                ScheduleAssignment.time_slot_id == time_slot_id,
-                ScheduleAssignment.schedule_id == schedule_id
+        assignment_ids: Optional[List[UUID]] = None
+    ) -> List[Row]:
+        """Get assignment, instructor, student group and slot time columns for a schedule in one query"""
+        from app.models.course import Course
+        from app.models.course_offering import CourseOffering
+        from app.models.time_slot import TimeSlot
+        
+        query = (
+            select(
+                ScheduleAssignment.id,
+                ScheduleAssignment.course_offering_id,
+                ScheduleAssignment.time_slot_id,
+                ScheduleAssignment.classroom_id,
+                CourseOffering.instructor_id,
+                Course.department_id,
+                Course.class_level,
+                CourseOffering.group_no,
+                Course.is_mandatory,
+                TimeSlot.day_of_week,
+                TimeSlot.start_time,
+                TimeSlot.end_time,
             )
+            .join(CourseOffering, ScheduleAssignment.course_offering_id == CourseOffering.id)
+            .join(Course, CourseOffering.course_id == Course.id)
+            .join(TimeSlot, ScheduleAssignment.time_slot_id == TimeSlot.id)
+            .where(ScheduleAssignment.schedule_id == schedule_id)
         )
-        
-        if exclude_assignment_id:
-            query = query.where(ScheduleAssignment.id != exclude_assignment_id)
-        
+        if assignment_ids is not None:
+            query = query.where(ScheduleAssignment.id.in_(assignment_ids))
         result = await self.db.execute(query)
-        conflicting = result.scalar_one_or_none()
-        return conflicting is not None
-
+        return list(result.all())
+    
+    async def get_term_occupancy(self, term_id: UUID) -> List[Row]:
+        """Get slot, classroom and instructor of every assignment in the term's schedules"""
+        from app.models.course_offering import CourseOffering
+        from app.models.schedule import Schedule
+        
+        result = await self.db.execute(
+            select(
+                ScheduleAssignment.schedule_id,
+                ScheduleAssignment.course_offering_id,
+                ScheduleAssignment.time_slot_id,
+                ScheduleAssignment.classroom_id,
+                CourseOffering.instructor_id,
+            )
+            .join(CourseOffering, ScheduleAssignment.course_offering_id == CourseOffering.id)
+            .join(Schedule, ScheduleAssignment.schedule_id == Schedule.id)
+            .where(Schedule.term_id == term_id)
+        )
+        return list(result.all())
+    
+    async def update_placements(self, placements: List[Tuple[UUID, UUID, UUID]]) -> None:
+        """Move assignments given as (id, time_slot_id, classroom_id) with one executemany UPDATE"""
+        if not placements:
+            return
+        await self.update_many([
+            {"id": a, "time_slot_id": slot, "classroom_id": room}
+            for a, slot, room in placements
+        ])
+        await self.db.flush()
+    
+    async def delete_by_schedule(self, schedule_id: UUID) -> int:
+        """Delete all assignments of schedule"""
+        result = await self.db.execute(
+            delete(ScheduleAssignment).where(ScheduleAssignment.schedule_id == schedule_id)
+        )
+        await self.db.flush()
+        return result.rowcount
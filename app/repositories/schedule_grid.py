@@ -0,0 +1,36 @@
+from typing import List, Optional, Dict, Any
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, delete, and_
+from app.models.schedule_grid import ScheduleGrid
+from app.core.constants import GridView
+from app.repositories.base import BaseRepository
+
+
+class ScheduleGridRepository(BaseRepository[ScheduleGrid]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(ScheduleGrid, db)
+    
+    async def get_payload(self, schedule_id: UUID, view: GridView, owner_key: str) -> Optional[str]:
+        """Get a stored grid's JSON by primary key"""
+        result = await self.db.execute(
+            select(ScheduleGrid.payload).where(and_(
+                ScheduleGrid.schedule_id == schedule_id,
+                ScheduleGrid.view == view,
+                ScheduleGrid.owner_key == owner_key
+            ))
+        )
+        return result.scalar_one_or_none()
+    
+    async def replace_for_schedule(self, schedule_id: UUID, grids: List[Dict[str, Any]]) -> None:
+        """Swap a schedule's grids for `grids` with one DELETE and one executemany INSERT"""
+        await self.delete_by_schedule(schedule_id)
+        if grids:
+            await self.db.execute(insert(ScheduleGrid), grids)
+    
+    async def delete_by_schedule(self, schedule_id: UUID) -> int:
+        """Delete all grids of a schedule"""
+        result = await self.db.execute(
+            delete(ScheduleGrid).where(ScheduleGrid.schedule_id == schedule_id)
+        )
+        return result.rowcount
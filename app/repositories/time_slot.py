@@ -19,6 +19,7 @@ class TimeSlotRepository(BaseRepository[TimeSlot]):
             select(TimeSlot)
             .where(TimeSlot.term_id == term_id)
             .options(selectinload(TimeSlot.term))
+            .order_by(TimeSlot.day_of_week, TimeSlot.start_time)
         )
         return list(result.scalars().all())
     
@@ -37,4 +38,15 @@ class TimeSlotRepository(BaseRepository[TimeSlot]):
             .order_by(TimeSlot.start_time)
         )
         return list(result.scalars().all())
-
+    
+    async def get_by_schedule(self, schedule_id: UUID) -> List[TimeSlot]:
+        """Get all time slots of the term a schedule belongs to"""
+        from app.models.schedule import Schedule
+        
+        result = await self.db.execute(
+            select(TimeSlot)
+            .join(Schedule, Schedule.term_id == TimeSlot.term_id)
+            .where(Schedule.id == schedule_id)
+            .order_by(TimeSlot.day_of_week, TimeSlot.start_time)
+        )
+        return list(result.scalars().all())
@@ -0,0 +1,12 @@
+from app.scheduling.problem import SchedulingProblem
+from app.scheduling.engine import ScheduleEngine, ScheduleSolver, SolverResult
+from app.scheduling.snapshot import SchedulingSnapshot, build_snapshot
+
+__all__ = [
+    "SchedulingProblem",
+    "ScheduleEngine",
+    "ScheduleSolver",
+    "SolverResult",
+    "SchedulingSnapshot",
+    "build_snapshot",
+]
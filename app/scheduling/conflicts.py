@@ -0,0 +1,208 @@
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.schedule_assignment import ScheduleAssignmentRepository
+from app.scheduling.intervals import DayIntervalIndex, overlapping_pairs
+from app.scheduling.occupancy import (
+    INSTRUCTOR_DOUBLE_BOOKING,
+    CLASSROOM_DOUBLE_BOOKING,
+    STUDENT_GROUP_CONFLICT,
+)
+from app.scheduling.problem import student_group_key
+from app.utils.conflicts import calculate_conflict_severity
+from app.utils.time_utils import time_to_minutes
+
+
+def _group_key(row):
+    return student_group_key(row.department_id, row.class_level, row.group_no, row.is_mandatory)
+
+
+def _groups_clash(first, second) -> bool:
+    """Two lessons of one class level clash unless they are for different groups"""
+    first_group = _group_key(first)[2]
+    second_group = _group_key(second)[2]
+    return first_group is None or second_group is None or first_group == second_group
+
+
+def _conflict(conflict_type: str, first, second) -> Dict[str, Any]:
+    group_key = _group_key(first) if conflict_type == STUDENT_GROUP_CONFLICT else None
+    resource_id = None
+    if conflict_type == INSTRUCTOR_DOUBLE_BOOKING:
+        resource_id = first.instructor_id
+    elif conflict_type == CLASSROOM_DOUBLE_BOOKING:
+        resource_id = first.classroom_id
+    return {
+        "type": conflict_type,
+        "severity": calculate_conflict_severity(conflict_type),
+        "day_of_week": first.day_of_week,
+        "resource_id": resource_id,
+        "class_level": group_key[1] if group_key else None,
+        "group_no": group_key[2] if group_key else None,
+        "assignment_ids": [first.id, second.id],
+    }
+
+
+def resource_keys(row) -> List[Tuple]:
+    """(conflict type, resource, day) buckets an occupancy row takes part in"""
+    keys = [
+        (INSTRUCTOR_DOUBLE_BOOKING, row.instructor_id, row.day_of_week),
+        (CLASSROOM_DOUBLE_BOOKING, row.classroom_id, row.day_of_week),
+    ]
+    group_key = _group_key(row)
+    if group_key is not None:
+        keys.append((STUDENT_GROUP_CONFLICT, group_key[:2], row.day_of_week))
+    return keys
+
+
+def _bucket_conflicts(conflict_type: str, intervals: List) -> List[Dict[str, Any]]:
+    if len(intervals) < 2:
+        return []
+    conflicts = []
+    for first, second in overlapping_pairs(intervals):
+        if conflict_type == STUDENT_GROUP_CONFLICT and not _groups_clash(first, second):
+            continue
+        conflicts.append(_conflict(conflict_type, first, second))
+    return conflicts
+
+
+def _interval(row) -> Tuple[int, int, Any]:
+    return time_to_minutes(row.start_time), time_to_minutes(row.end_time), row
+
+
+def detect_conflicts(rows: Iterable) -> Dict[Tuple, List[Dict[str, Any]]]:
+    """Find instructor, classroom and student group overlaps among occupancy rows.
+
+    Rows go into a DayIntervalIndex per (conflict type, resource) and day, and
+    each row looks up the earlier-starting rows it overlaps in O(log n + k), so
+    the whole schedule costs O(n log n + k) rather than comparing every pair of
+    assignments. Conflicts are returned per (type, resource, day) bucket.
+    """
+    intervals = sorted((_interval(row) for row in rows), key=lambda i: (i[0], i[1]))
+    order = {row.id: position for position, (_, _, row) in enumerate(intervals)}
+    index = DayIntervalIndex(
+        (key[:2], key[2], start, end, row)
+        for start, end, row in intervals
+        for key in resource_keys(row)
+    )
+
+    conflicts: Dict[Tuple, List[Dict[str, Any]]] = {}
+    for start, end, row in intervals:
+        for key in resource_keys(row):
+            for other in index.overlapping(key[:2], key[2], start, end):
+                if order[other.id] >= order[row.id]:
+                    continue
+                if key[0] == STUDENT_GROUP_CONFLICT and not _groups_clash(other, row):
+                    continue
+                conflicts.setdefault(key, []).append(_conflict(key[0], other, row))
+    return conflicts
+
+
+class ConflictState:
+    """Conflicts of one schedule, kept per (type, resource, day) bucket.
+
+    The first build runs detect_conflicts over the whole schedule; after that,
+    adding or removing an assignment only re-sweeps the instructor, classroom
+    and student group buckets of that assignment's day.
+    """
+
+    def __init__(self, rows: Iterable = ()):
+        self.rows: Dict[UUID, Any] = {}
+        self.stamps: Dict[UUID, Any] = {}
+        self.version: Optional[int] = None
+        self._buckets: Dict[Tuple, Dict[UUID, Any]] = {}
+        for row in rows:
+            self._insert(row)
+        self._conflicts: Dict[Tuple, List[Dict[str, Any]]] = detect_conflicts(self.rows.values())
+
+    def _insert(self, row) -> List[Tuple]:
+        self.rows[row.id] = row
+        keys = resource_keys(row)
+        for key in keys:
+            self._buckets.setdefault(key, {})[row.id] = row
+        return keys
+
+    def _delete(self, assignment_id: UUID) -> List[Tuple]:
+        row = self.rows.pop(assignment_id, None)
+        self.stamps.pop(assignment_id, None)
+        if row is None:
+            return []
+        keys = resource_keys(row)
+        for key in keys:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.pop(assignment_id, None)
+                if not bucket:
+                    del self._buckets[key]
+        return keys
+
+    def _recompute(self, keys: Iterable[Tuple]) -> None:
+        for key in set(keys):
+            bucket = self._buckets.get(key)
+            conflicts = _bucket_conflicts(key[0], [_interval(r) for r in bucket.values()]) if bucket else []
+            if conflicts:
+                self._conflicts[key] = conflicts
+            else:
+                self._conflicts.pop(key, None)
+
+    def apply(self, removed: Iterable[UUID] = (), added: Iterable = ()) -> None:
+        """Remove and (re)add assignments, re-sweeping only the buckets they touch"""
+        touched = []
+        for assignment_id in removed:
+            touched.extend(self._delete(assignment_id))
+        for row in added:
+            touched.extend(self._delete(row.id))
+            touched.extend(self._insert(row))
+        self._recompute(touched)
+
+    def conflicts(self) -> List[Dict[str, Any]]:
+        return [conflict for bucket in self._conflicts.values() for conflict in bucket]
+
+
+class ConflictRegistry:
+    """Per-schedule conflict states refreshed from the assignments that changed.
+
+    An unchanged schedule revision serves the cached report after one primary
+    key lookup. Otherwise every assignment's id, update time and placement is
+    listed and just the new, updated or moved rows are loaded; the placement
+    is compared too, since update times are transaction start times and are
+    not guaranteed to change.
+    """
+
+    def __init__(self, max_schedules: int = 256):
+        self.max_schedules = max_schedules
+        self._states: "OrderedDict[UUID, ConflictState]" = OrderedDict()
+
+    async def get(self, db: AsyncSession, schedule_id: UUID) -> ConflictState:
+        """Get an up to date conflict state for schedule"""
+        repo = ScheduleAssignmentRepository(db)
+        version = await repo.get_version(schedule_id)
+
+        state = self._states.get(schedule_id)
+        if state is None or state.version != version:
+            stamps = {
+                row.id: (row.updated_at, row.time_slot_id, row.classroom_id)
+                for row in await repo.get_stamps(schedule_id)
+            }
+            if state is None:
+                state = self._states[schedule_id] = ConflictState(
+                    await repo.get_occupancy_rows(schedule_id)
+                )
+            else:
+                removed = [a for a in state.rows if a not in stamps]
+                changed = [a for a, stamp in stamps.items() if state.stamps.get(a) != stamp]
+                added = await repo.get_occupancy_rows(schedule_id, changed) if changed else []
+                state.apply(removed, added)
+            state.stamps = stamps
+            state.version = version
+        self._states.move_to_end(schedule_id)
+
+        while len(self._states) > self.max_schedules:
+            self._states.popitem(last=False)
+        return state
+
+    def invalidate(self, schedule_id: UUID) -> None:
+        self._states.pop(schedule_id, None)
+
+
+conflict_registry = ConflictRegistry()
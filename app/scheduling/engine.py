@@ -0,0 +1,465 @@
+import asyncio
+import heapq
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from config import settings
+from app.models.schedule import Schedule
+from app.repositories.schedule_assignment import ScheduleAssignmentRepository
+from app.scheduling.feasibility import RoomFeasibility
+from app.scheduling.occupancy import OccupancyIndex
+from app.scheduling.problem import SchedulingProblem, StudentGroupKey
+from app.scheduling.snapshot import SchedulingSnapshot, build_snapshot
+
+UNPLACED_NO_CLASSROOM = "no_compatible_classroom"
+UNPLACED_NO_SLOT = "no_feasible_slot"
+
+
+@dataclass
+class Placement:
+    course_offering_id: UUID
+    time_slot_id: UUID
+    classroom_id: UUID
+
+
+@dataclass
+class Unplaced:
+    course_offering_id: UUID
+    missing_hours: int
+    reason: str
+
+
+@dataclass
+class SolverResult:
+    placements: List[Placement] = field(default_factory=list)
+    unplaced: List[Unplaced] = field(default_factory=list)
+    backtracks: int = 0
+    elapsed_seconds: float = 0.0
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """Yield the positions of set bits, lowest first"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class _Frame:
+    """One lesson decision on the search trail"""
+    __slots__ = ("offering", "candidates", "position", "assigned")
+
+    def __init__(self, offering: int, candidates: List[Tuple[int, int]]):
+        self.offering = offering
+        self.candidates = candidates
+        self.position = 0
+        self.assigned: Optional[Tuple[int, int]] = None
+
+
+class ScheduleSolver:
+    """Backtracking solver with forward checking over an in-memory problem.
+
+    Every offering needs `weekly_hours` distinct slots, each with a classroom.
+    Instructor, classroom and student group occupancy live in an OccupancyIndex
+    whose slot ordinals follow problem.slots, so a conflict test is a single
+    AND. The most constrained offering is placed first; when the time or
+    backtrack budget runs out the solver stops backtracking and reports what
+    it could not place.
+    """
+
+    def __init__(
+        self,
+        problem: SchedulingProblem,
+        time_limit: Optional[float] = None,
+        max_backtracks: Optional[int] = None
+    ):
+        self.problem = problem
+        self.time_limit = time_limit if time_limit is not None else settings.SCHEDULER_TIME_LIMIT_SECONDS
+        self.max_backtracks = max_backtracks if max_backtracks is not None else settings.SCHEDULER_MAX_BACKTRACKS
+        self.backtracks = 0
+
+        slots = problem.slots
+        offerings = problem.offerings
+        self.full_mask = (1 << len(slots)) - 1
+        self.slot_index = {s.id: i for i, s in enumerate(slots)}
+        self.room_index = {r.id: i for i, r in enumerate(problem.rooms)}
+        self.room_ids = [r.id for r in problem.rooms]
+        self.offering_index = {o.id: i for i, o in enumerate(offerings)}
+
+        # Neighbouring slots on the same day, used to keep an offering's hours together
+        self.adjacent = [0] * len(slots)
+        for i in range(len(slots) - 1):
+            if slots[i].day_of_week == slots[i + 1].day_of_week:
+                self.adjacent[i] |= 1 << (i + 1)
+                self.adjacent[i + 1] |= 1 << i
+
+        self.occupancy = OccupancyIndex()
+        self.occupancy.register_slots((s.id, s.day_of_week, s.start_minutes, s.end_minutes) for s in slots)
+        self.instructor_static: Dict[UUID, int] = {}
+        self.instructor_remaining: Dict[UUID, int] = {}
+        self.offering_busy = [0] * len(offerings)
+        self.remaining = [o.weekly_hours for o in offerings]
+        self.skipped = set()
+        self.unplaced: Dict[int, Unplaced] = {}
+
+        unavailable: Dict[UUID, int] = {}
+        for instructor_id, slot_id in problem.unavailable:
+            if slot_id in self.slot_index:
+                unavailable[instructor_id] = unavailable.get(instructor_id, 0) | (1 << self.slot_index[slot_id])
+        for o in offerings:
+            self.instructor_static[o.instructor_id] = self.full_mask & ~unavailable.get(o.instructor_id, 0)
+
+        self.feasibility = RoomFeasibility.from_problem(problem)
+        # Per slot ordinal, bitset of rooms already booked there
+        self.slot_rooms = [0] * len(slots)
+        self.candidate_rooms = [self._compatible_rooms(o) for o in range(len(offerings))]
+        self.neighbors = self._build_neighbors()
+        # Lazy MRV queue: entries are (priority, version, offering); stale versions are skipped
+        self._queue: List[Tuple[Tuple[int, int, int], int, int]] = []
+        self._queue_version = [0] * len(offerings)
+        self._dirty = set(range(len(offerings)))
+
+        self._apply_existing()
+
+        for i, o in enumerate(offerings):
+            self.instructor_remaining[o.instructor_id] = (
+                self.instructor_remaining.get(o.instructor_id, 0) + self.remaining[i]
+            )
+            if self.remaining[i] and not self.candidate_rooms[i]:
+                self._skip(i, UNPLACED_NO_CLASSROOM)
+        self._trim_infeasible_demand()
+
+    def _conflicting_group_keys(self, key: Optional[StudentGroupKey]) -> Tuple[StudentGroupKey, ...]:
+        """Group keys whose occupancy blocks an offering attended by `key`"""
+        if key is None:
+            return ()
+        department_id, class_level, group_no = key
+        if group_no is None:
+            return tuple({
+                o.group_key for o in self.problem.offerings
+                if o.group_key is not None and o.group_key[:2] == (department_id, class_level)
+            })
+        return (key, (department_id, class_level, None))
+
+    def _compatible_rooms(self, o: int) -> List[int]:
+        """Room ordinals that can host an offering, preferred room first then best fit"""
+        offering = self.problem.offerings[o]
+        preferred = self.room_index.get(offering.classroom_id)
+        rooms = [i for i in iter_bits(self.feasibility.rows[o]) if i != preferred]
+        rooms.sort(key=lambda i: (
+            self.problem.rooms[i].department_id != self.problem.department_id,
+            self.problem.rooms[i].capacity
+        ))
+        if preferred is not None and self.feasibility.rows[o] >> preferred & 1:
+            rooms.insert(0, preferred)
+        return rooms
+
+    def _build_neighbors(self) -> List[Tuple[int, ...]]:
+        """Offerings sharing an instructor or a student group with each offering"""
+        by_instructor: Dict[UUID, List[int]] = {}
+        by_group: Dict[StudentGroupKey, List[int]] = {}
+        for i, o in enumerate(self.problem.offerings):
+            by_instructor.setdefault(o.instructor_id, []).append(i)
+            if o.group_key is not None:
+                by_group.setdefault(o.group_key, []).append(i)
+
+        neighbors = []
+        for i, o in enumerate(self.problem.offerings):
+            related = set(by_instructor[o.instructor_id])
+            for key in self._conflicting_group_keys(o.group_key):
+                related.update(by_group.get(key, ()))
+            related.discard(i)
+            neighbors.append(tuple(sorted(related)))
+        return neighbors
+
+    def _apply_existing(self) -> None:
+        """Mark pinned assignments and other schedules' bookings as occupied"""
+        for instructor_id, slot_id, room_id in self.problem.blocked:
+            if slot_id in self.slot_index:
+                self.occupancy.occupy(self.occupancy.slot_bit(slot_id), instructor_id, room_id)
+                self._book_room(slot_id, room_id)
+
+        for offering_id, instructor_id, slot_id, room_id in self.problem.pinned:
+            if slot_id not in self.slot_index:
+                continue
+            bit = self.occupancy.slot_bit(slot_id)
+            index = self.offering_index.get(offering_id)
+            group_key = self.problem.offerings[index].group_key if index is not None else None
+            self.occupancy.occupy(bit, instructor_id, room_id, group_key)
+            self._book_room(slot_id, room_id)
+            if index is not None and not self.offering_busy[index] & bit:
+                self.offering_busy[index] |= bit
+                self.remaining[index] = max(0, self.remaining[index] - 1)
+
+    def _book_room(self, slot_id, room_id) -> None:
+        room = self.room_index.get(room_id)
+        if room is not None:
+            self.slot_rooms[self.slot_index[slot_id]] |= 1 << room
+
+    def _trim_infeasible_demand(self) -> None:
+        """Drop hours that cannot fit even on an empty grid so search never chases them"""
+        for o in range(len(self.problem.offerings)):
+            if not self._is_active(o):
+                continue
+            shortfall = self.remaining[o] - self._feasible_mask(o).bit_count()
+            if shortfall > 0:
+                self._drop_hours(o, shortfall)
+
+        by_instructor: Dict[UUID, List[int]] = {}
+        for o, offering in enumerate(self.problem.offerings):
+            if self._is_active(o):
+                by_instructor.setdefault(offering.instructor_id, []).append(o)
+        for instructor_id, members in by_instructor.items():
+            free = self.instructor_static[instructor_id] & ~self._instructor_blocked(instructor_id)
+            excess = self.instructor_remaining[instructor_id] - free.bit_count()
+            for o in sorted(members, key=lambda m: -self.remaining[m]):
+                if excess <= 0:
+                    break
+                dropped = min(excess, self.remaining[o])
+                self._drop_hours(o, dropped)
+                excess -= dropped
+
+    def _drop_hours(self, o: int, hours: int) -> None:
+        offering = self.problem.offerings[o]
+        self.remaining[o] -= hours
+        self.instructor_remaining[offering.instructor_id] -= hours
+        self._dirty.add(o)
+        self._record_unplaced(o, hours, UNPLACED_NO_SLOT)
+
+    def _record_unplaced(self, o: int, hours: int, reason: str) -> None:
+        if o in self.unplaced:
+            self.unplaced[o].missing_hours += hours
+        else:
+            self.unplaced[o] = Unplaced(self.problem.offerings[o].id, hours, reason)
+
+    def _is_active(self, o: int) -> bool:
+        return self.remaining[o] > 0 and o not in self.skipped
+
+    def _feasible_mask(self, o: int) -> int:
+        """Slots where an offering's instructor, group and the offering itself are free"""
+        offering = self.problem.offerings[o]
+        busy = (
+            self.occupancy.instructor_mask(offering.instructor_id)
+            | self.occupancy.group_mask(offering.group_key)
+            | self.offering_busy[o]
+        )
+        return self.instructor_static[offering.instructor_id] & ~self.occupancy.expand(busy)
+
+    def _instructor_blocked(self, instructor_id: UUID) -> int:
+        return self.occupancy.expand(self.occupancy.instructor_mask(instructor_id))
+
+    def _priority(self, o: int) -> Tuple[int, int, int]:
+        return (
+            self._feasible_mask(o).bit_count() - self.remaining[o],
+            -len(self.neighbors[o]),
+            o,
+        )
+
+    def _select_offering(self) -> Optional[int]:
+        """Most constrained active offering (fewest free slots per missing hour).
+
+        Only offerings touched since the last call (the placed or removed one
+        and its neighbours) are re-prioritised, so a selection costs
+        O(degree log n) instead of a scan over every offering.
+        """
+        for o in self._dirty:
+            self._queue_version[o] += 1
+            if self._is_active(o):
+                heapq.heappush(self._queue, (self._priority(o), self._queue_version[o], o))
+        self._dirty.clear()
+
+        while self._queue:
+            _, version, o = self._queue[0]
+            if version == self._queue_version[o] and self._is_active(o):
+                return o
+            heapq.heappop(self._queue)
+        return None
+
+    def _touch(self, o: int) -> None:
+        self._dirty.add(o)
+        self._dirty.update(self.neighbors[o])
+
+    def _candidates(self, o: int) -> List[Tuple[int, int]]:
+        """(slot, room) values for an offering's next lesson in preference order"""
+        near = 0
+        for slot in iter_bits(self.offering_busy[o]):
+            near |= self.adjacent[slot]
+
+        slots = sorted(
+            iter_bits(self._feasible_mask(o)),
+            key=lambda s: (not (near >> s) & 1, s)
+        )
+        candidates = []
+        for slot in slots:
+            busy = 0
+            for other in iter_bits(self.occupancy.expand(1 << slot)):
+                busy |= self.slot_rooms[other]
+            free = self.feasibility.free_rooms(o, busy)
+            if not free:
+                continue
+            for room in self.candidate_rooms[o]:
+                if free >> room & 1:
+                    candidates.append((slot, room))
+                    break
+        return candidates
+
+    def _place(self, o: int, slot: int, room: int) -> None:
+        bit = 1 << slot
+        offering = self.problem.offerings[o]
+        self.occupancy.occupy(bit, offering.instructor_id, self.room_ids[room], offering.group_key)
+        self.slot_rooms[slot] |= 1 << room
+        self.offering_busy[o] |= bit
+        self.remaining[o] -= 1
+        self.instructor_remaining[offering.instructor_id] -= 1
+        self._touch(o)
+
+    def _unplace(self, o: int, slot: int, room: int) -> None:
+        bit = 1 << slot
+        offering = self.problem.offerings[o]
+        self.occupancy.release(bit, offering.instructor_id, self.room_ids[room], offering.group_key)
+        self.slot_rooms[slot] &= ~(1 << room)
+        self.offering_busy[o] &= ~bit
+        self.remaining[o] += 1
+        self.instructor_remaining[offering.instructor_id] += 1
+        self._touch(o)
+
+    def _skip(self, o: int, reason: str) -> None:
+        offering = self.problem.offerings[o]
+        self.skipped.add(o)
+        self.instructor_remaining[offering.instructor_id] -= self.remaining[o]
+        self._record_unplaced(o, self.remaining[o], reason)
+
+    def _forward_check(self, o: int) -> bool:
+        """Check that no affected offering or instructor has run out of slots"""
+        instructor_id = self.problem.offerings[o].instructor_id
+        free = self.instructor_static[instructor_id] & ~self._instructor_blocked(instructor_id)
+        if free.bit_count() < self.instructor_remaining[instructor_id]:
+            return False
+
+        if self._is_active(o) and self._feasible_mask(o).bit_count() < self.remaining[o]:
+            return False
+        for other in self.neighbors[o]:
+            if self._is_active(other) and self._feasible_mask(other).bit_count() < self.remaining[other]:
+                return False
+        return True
+
+    def solve(self) -> SolverResult:
+        """Place every missing lesson, backtracking while the budget allows"""
+        started = time.perf_counter()
+        deadline = started + self.time_limit
+        stack: List[_Frame] = []
+
+        while True:
+            if not stack or stack[-1].assigned is not None:
+                o = self._select_offering()
+                if o is None:
+                    break
+                stack.append(_Frame(o, self._candidates(o)))
+
+            frame = stack[-1]
+            o = frame.offering
+            while frame.position < len(frame.candidates):
+                slot, room = frame.candidates[frame.position]
+                frame.position += 1
+                self._place(o, slot, room)
+                if self._forward_check(o):
+                    frame.assigned = (slot, room)
+                    break
+                self._unplace(o, slot, room)
+            if frame.assigned is not None:
+                continue
+
+            # Dead end: undo the previous decision, or give up on this offering
+            stack.pop()
+            out_of_budget = (
+                self.backtracks >= self.max_backtracks
+                or time.perf_counter() > deadline
+            )
+            if stack and not out_of_budget:
+                self.backtracks += 1
+                previous = stack[-1]
+                self._unplace(previous.offering, *previous.assigned)
+                previous.assigned = None
+            else:
+                self._skip(o, UNPLACED_NO_SLOT)
+
+        slots = self.problem.slots
+        rooms = self.problem.rooms
+        offerings = self.problem.offerings
+        return SolverResult(
+            placements=[
+                Placement(
+                    course_offering_id=offerings[frame.offering].id,
+                    time_slot_id=slots[frame.assigned[0]].id,
+                    classroom_id=rooms[frame.assigned[1]].id,
+                )
+                for frame in stack
+            ],
+            unplaced=list(self.unplaced.values()),
+            backtracks=self.backtracks,
+            elapsed_seconds=time.perf_counter() - started,
+        )
+
+
+def solve_problem(
+    problem: SchedulingProblem,
+    time_limit: Optional[float] = None,
+    max_backtracks: Optional[int] = None
+) -> SolverResult:
+    """Solve a problem from scratch; module level so a process pool can pickle it"""
+    return ScheduleSolver(problem, time_limit=time_limit, max_backtracks=max_backtracks).solve()
+
+
+def resolve_result(snapshot: SchedulingSnapshot, result: SolverResult) -> SolverResult:
+    """Translate a result solved over snapshot indices back to UUIDs"""
+    offerings, slots, rooms = snapshot.offerings.keys, snapshot.slots.keys, snapshot.rooms.keys
+    return SolverResult(
+        placements=[
+            Placement(offerings[p.course_offering_id], slots[p.time_slot_id], rooms[p.classroom_id])
+            for p in result.placements
+        ],
+        unplaced=[
+            Unplaced(offerings[u.course_offering_id], u.missing_hours, u.reason)
+            for u in result.unplaced
+        ],
+        backtracks=result.backtracks,
+        elapsed_seconds=result.elapsed_seconds
+    )
+
+
+class ScheduleEngine:
+    """Generates a schedule: bulk load into a SchedulingSnapshot, solve over its int indices, bulk insert"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.assignment_repo = ScheduleAssignmentRepository(db)
+
+    async def generate(
+        self,
+        schedule: Schedule,
+        replace_existing: bool = False,
+        time_limit: Optional[float] = None,
+        max_backtracks: Optional[int] = None
+    ) -> SolverResult:
+        """Fill the schedule's missing weekly hours and persist the placements"""
+        if replace_existing:
+            await self.assignment_repo.delete_by_schedule(schedule.id)
+
+        snapshot = await build_snapshot(self.db, schedule)
+        solver = ScheduleSolver(snapshot.to_problem(), time_limit=time_limit, max_backtracks=max_backtracks)
+        # The search is CPU bound; run it off the event loop
+        result = resolve_result(snapshot, await asyncio.to_thread(solver.solve))
+
+        await self.assignment_repo.create_many([
+            {
+                "schedule_id": schedule.id,
+                "course_offering_id": p.course_offering_id,
+                "time_slot_id": p.time_slot_id,
+                "classroom_id": p.classroom_id,
+            }
+            for p in result.placements
+        ])
+        await self.assignment_repo.bump_version(schedule.id)
+        return result
@@ -0,0 +1,258 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from config import settings
+from app.core.constants import ScheduleStatus
+from app.db.session import AsyncSessionLocal
+from app.repositories.department import DepartmentRepository
+from app.repositories.schedule import ScheduleRepository
+from app.repositories.schedule_assignment import ScheduleAssignmentRepository
+from app.scheduling.engine import Placement, SolverResult, Unplaced, iter_bits, resolve_result, solve_problem
+from app.scheduling.feasibility import RoomFeasibility
+from app.scheduling.occupancy import OccupancyIndex, INSTRUCTOR_DOUBLE_BOOKING, occupancy_registry
+from app.scheduling.problem import SchedulingProblem
+from app.scheduling.snapshot import SchedulingSnapshot, build_snapshot
+
+UNPLACED_CONTENTION = "shared_resource_contention"
+
+DEPARTMENT_GENERATED = "generated"
+DEPARTMENT_SKIPPED = "skipped"
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def pool_size() -> int:
+    return settings.SCHEDULER_WORKERS or os.cpu_count() or 1
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Process pool shared by faculty generations, created on first use"""
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=pool_size())
+    return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+
+@dataclass
+class DepartmentOutcome:
+    department_id: UUID
+    schedule_id: Optional[UUID]
+    status: str
+    detail: Optional[str] = None
+    placements: List[Placement] = field(default_factory=list)
+    unplaced: Dict[UUID, Unplaced] = field(default_factory=dict)
+    backtracks: int = 0
+    snapshot: Optional[SchedulingSnapshot] = None
+    # snapshot.to_problem(), over the snapshot's int indices
+    problem: Optional[SchedulingProblem] = None
+    feasibility: Optional[RoomFeasibility] = None
+
+
+@dataclass
+class FacultyGenerationResult:
+    departments: List[DepartmentOutcome]
+    workers: int
+    elapsed_seconds: float
+
+
+class FacultyScheduleEngine:
+    """Generates every department schedule of a faculty in parallel.
+
+    Department problems are independent apart from shared classrooms (and the
+    odd instructor teaching for two departments), so each is loaded into a
+    SchedulingSnapshot and its int-indexed problem is solved in a separate
+    process. Results are translated back to UUIDs and merged in department
+    order against one term-wide OccupancyIndex: a lesson whose room
+    was taken by an earlier department moves to another free compatible room,
+    and lessons that still clash are re-solved in a second parallel round with
+    the merged bookings blocked. Each department is written in its own
+    transaction.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def generate(
+        self,
+        faculty_id: UUID,
+        term_id: UUID,
+        replace_existing: bool = False,
+        time_limit: Optional[float] = None,
+        max_backtracks: Optional[int] = None
+    ) -> FacultyGenerationResult:
+        started = time.perf_counter()
+        departments = await DepartmentRepository(self.db).get_by_faculty(faculty_id)
+        schedules = {
+            s.department_id: s
+            for s in await ScheduleRepository(self.db).get_by_term_and_departments(
+                term_id,
+                [d.id for d in departments]
+            )
+        }
+
+        outcomes: List[DepartmentOutcome] = []
+        for department in sorted(departments, key=lambda d: d.code):
+            schedule = schedules.get(department.id)
+            if not schedule:
+                outcomes.append(DepartmentOutcome(department.id, None, DEPARTMENT_SKIPPED, "No schedule for term"))
+            elif schedule.status not in (ScheduleStatus.DRAFT, ScheduleStatus.REJECTED):
+                outcomes.append(DepartmentOutcome(
+                    department.id, schedule.id, DEPARTMENT_SKIPPED, f"Schedule is {schedule.status.value}"
+                ))
+            else:
+                outcomes.append(DepartmentOutcome(department.id, schedule.id, DEPARTMENT_GENERATED))
+
+        active = [o for o in outcomes if o.status == DEPARTMENT_GENERATED]
+        replaced = {o.schedule_id for o in active} if replace_existing else frozenset()
+        for outcome in active:
+            outcome.snapshot = await build_snapshot(self.db, schedules[outcome.department_id], replaced)
+            outcome.problem = outcome.snapshot.to_problem()
+            outcome.feasibility = RoomFeasibility.from_problem(outcome.problem)
+        # The solves can take seconds; do not hold the connection meanwhile
+        await self.db.commit()
+
+        if active:
+            pool = get_process_pool()
+            merged = self._seed_index(active[0].snapshot)
+            results = await self._solve_all(pool, [o.problem for o in active], time_limit, max_backtracks)
+            losers = []
+            for outcome, result in zip(active, results):
+                result = resolve_result(outcome.snapshot, result)
+                outcome.backtracks += result.backtracks
+                outcome.unplaced = {u.course_offering_id: u for u in result.unplaced}
+                if self._merge(merged, outcome, result.placements):
+                    losers.append(outcome)
+
+            if losers:
+                retry = [self._retry_problem(o, active) for o in losers]
+                results = await self._solve_all(pool, retry, time_limit, max_backtracks)
+                for outcome, result in zip(losers, results):
+                    result = resolve_result(outcome.snapshot, result)
+                    outcome.backtracks += result.backtracks
+                    outcome.unplaced = {u.course_offering_id: u for u in result.unplaced}
+                    self._merge(merged, outcome, result.placements)
+
+            for outcome in active:
+                await self._write(outcome, replace_existing)
+
+        return FacultyGenerationResult(
+            departments=outcomes,
+            workers=min(pool_size(), len(active)),
+            elapsed_seconds=time.perf_counter() - started
+        )
+
+    async def _solve_all(
+        self,
+        pool: ProcessPoolExecutor,
+        problems: List[SchedulingProblem],
+        time_limit: Optional[float],
+        max_backtracks: Optional[int]
+    ) -> List[SolverResult]:
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(*(
+            loop.run_in_executor(pool, partial(solve_problem, problem, time_limit, max_backtracks))
+            for problem in problems
+        ))
+
+    def _seed_index(self, snapshot: SchedulingSnapshot) -> OccupancyIndex:
+        """Term-wide occupancy of every booking that is not being regenerated"""
+        index = OccupancyIndex()
+        index.register_slots(snapshot.slot_times())
+        for instructor_id, slot_id, room_id in snapshot.bookings():
+            index.occupy(index.slot_bit(slot_id), instructor_id, room_id)
+        return index
+
+    def _merge(self, index: OccupancyIndex, outcome: DepartmentOutcome, placements: List[Placement]) -> bool:
+        """Accept placements that fit the merged bookings; return whether any were lost"""
+        snapshot = outcome.snapshot
+        lost = False
+        for placement in placements:
+            o = snapshot.offerings.get(placement.course_offering_id)
+            instructor_id = snapshot.instructors.keys[snapshot.offering_instructor[o]]
+            bit = index.slot_bit(placement.time_slot_id)
+            conflicts = index.find_conflicts(bit, instructor_id, placement.classroom_id)
+            if conflicts and INSTRUCTOR_DOUBLE_BOOKING not in conflicts:
+                room_id = self._free_room(index, outcome, o, bit)
+                if room_id is not None:
+                    placement = Placement(placement.course_offering_id, placement.time_slot_id, room_id)
+                    conflicts = []
+            if conflicts:
+                lost = True
+                missing = outcome.unplaced.get(placement.course_offering_id)
+                outcome.unplaced[placement.course_offering_id] = Unplaced(
+                    placement.course_offering_id,
+                    (missing.missing_hours if missing else 0) + 1,
+                    missing.reason if missing else UNPLACED_CONTENTION
+                )
+                continue
+            index.occupy(bit, instructor_id, placement.classroom_id)
+            outcome.placements.append(placement)
+        return lost
+
+    def _free_room(self, index: OccupancyIndex, outcome: DepartmentOutcome, o: int, bit: int) -> Optional[UUID]:
+        """A feasible room for offering `o` that no merged booking uses at `bit`"""
+        snapshot, rooms = outcome.snapshot, outcome.problem.rooms
+        slot_mask = index.expand(bit)
+        busy = 0
+        for room in range(snapshot.hosting_room_count):
+            if index.classroom_mask(snapshot.rooms.keys[room]) & slot_mask:
+                busy |= 1 << room
+        free = list(iter_bits(outcome.feasibility.free_rooms(o, busy)))
+        if not free:
+            return None
+        best = min(free, key=lambda r: (rooms[r].department_id != snapshot.department, rooms[r].capacity))
+        return snapshot.rooms.keys[best]
+
+    def _retry_problem(self, outcome: DepartmentOutcome, active: List[DepartmentOutcome]) -> SchedulingProblem:
+        """Department problem with its accepted lessons pinned and other departments' blocked"""
+        snapshot, problem = outcome.snapshot, outcome.problem
+        pinned: List[Tuple[int, int, int, int]] = list(problem.pinned)
+        for p in outcome.placements:
+            o = snapshot.offerings.get(p.course_offering_id)
+            pinned.append((o, snapshot.offering_instructor[o], snapshot.slots.get(p.time_slot_id), snapshot.rooms.get(p.classroom_id)))
+        blocked = list(problem.blocked)
+        for other in active:
+            if other is outcome:
+                continue
+            for p in other.placements:
+                o = other.snapshot.offerings.get(p.course_offering_id)
+                instructor_id = other.snapshot.instructors.keys[other.snapshot.offering_instructor[o]]
+                # Other departments' instructors and rooms may be new to this snapshot
+                blocked.append((
+                    snapshot.instructors.add(instructor_id),
+                    snapshot.slots.add(p.time_slot_id),
+                    snapshot.rooms.add(p.classroom_id)
+                ))
+        return replace(problem, pinned=pinned, blocked=blocked)
+
+    async def _write(self, outcome: DepartmentOutcome, replace_existing: bool) -> None:
+        """Persist one department in its own transaction"""
+        async with AsyncSessionLocal() as session:
+            repo = ScheduleAssignmentRepository(session)
+            if replace_existing:
+                await repo.delete_by_schedule(outcome.schedule_id)
+            await repo.create_many([
+                {
+                    "schedule_id": outcome.schedule_id,
+                    "course_offering_id": p.course_offering_id,
+                    "time_slot_id": p.time_slot_id,
+                    "classroom_id": p.classroom_id,
+                }
+                for p in outcome.placements
+            ])
+            await repo.bump_version(outcome.schedule_id)
+            await session.commit()
+        occupancy_registry.invalidate(outcome.schedule_id)
@@ -0,0 +1,105 @@
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from app.core.constants import COURSE_TYPE_TO_CLASSROOM_TYPES
+from app.scheduling.problem import SchedulingProblem
+
+
+def features_match(available: Optional[Dict[str, Any]], required: Optional[Dict[str, Any]]) -> bool:
+    """Whether a classroom's features JSON satisfies every required feature"""
+    if not required:
+        return True
+    available = available or {}
+    for name, value in required.items():
+        have = available.get(name)
+        if isinstance(value, bool):
+            if bool(have) != value:
+                return False
+        elif isinstance(value, (int, float)):
+            if not isinstance(have, (int, float)) or have < value:
+                return False
+        elif have != value:
+            return False
+    return True
+
+
+class RoomFeasibility:
+    """Offerings x classrooms feasibility matrix, one int bitset per offering.
+
+    Bit r of row o is set when room r has a compatible type, enough seats and
+    the required features for offering o. Rows are built column-wise: one
+    mask per classroom type, one per distinct capacity threshold and one per
+    distinct feature requirement, so each row is a couple of ANDs rather than
+    a comparison per (offering, room) pair. Combined with a slot's busy-room
+    mask, `free_rooms` answers "which rooms can host offering o at slot s" in
+    one AND.
+    """
+
+    def __init__(
+        self,
+        room_types: Sequence,
+        room_capacities: Sequence[int],
+        room_features: Sequence[Optional[Dict[str, Any]]],
+        offering_types: Iterable,
+        offering_students: Iterable[int],
+        offering_features: Optional[Iterable[Optional[Dict[str, Any]]]] = None
+    ):
+        self.room_count = len(room_capacities)
+        self.all_rooms = (1 << self.room_count) - 1
+
+        type_masks: Dict[Any, int] = {}
+        for room, room_type in enumerate(room_types):
+            type_masks[room_type] = type_masks.get(room_type, 0) | (1 << room)
+
+        # Rooms sorted by capacity; rooms seating at least n = suffix from bisect(n)
+        by_capacity = sorted(range(self.room_count), key=lambda r: room_capacities[r])
+        self._capacities = [room_capacities[r] for r in by_capacity]
+        self._suffix = [0] * (self.room_count + 1)
+        for position in range(self.room_count - 1, -1, -1):
+            self._suffix[position] = self._suffix[position + 1] | (1 << by_capacity[position])
+
+        course_type_masks: Dict[Any, int] = {}
+        feature_masks: Dict[tuple, int] = {}
+        offering_features = offering_features if offering_features is not None else ()
+        feature_iter = iter(offering_features)
+
+        self.rows: List[int] = []
+        for course_type, students in zip(offering_types, offering_students):
+            type_mask = course_type_masks.get(course_type)
+            if type_mask is None:
+                type_mask = 0
+                for classroom_type in COURSE_TYPE_TO_CLASSROOM_TYPES.get(course_type, ()):
+                    type_mask |= type_masks.get(classroom_type, 0)
+                course_type_masks[course_type] = type_mask
+
+            row = type_mask & self.seating(students)
+            required = next(feature_iter, None)
+            if required:
+                key = tuple(sorted(required.items()))
+                feature_mask = feature_masks.get(key)
+                if feature_mask is None:
+                    feature_mask = 0
+                    for room, features in enumerate(room_features):
+                        if features_match(features, required):
+                            feature_mask |= 1 << room
+                    feature_masks[key] = feature_mask
+                row &= feature_mask
+            self.rows.append(row)
+
+    @classmethod
+    def from_problem(cls, problem: SchedulingProblem) -> "RoomFeasibility":
+        return cls(
+            [r.classroom_type for r in problem.rooms],
+            [r.capacity for r in problem.rooms],
+            [r.features for r in problem.rooms],
+            [o.course_type for o in problem.offerings],
+            [o.student_count for o in problem.offerings],
+            [o.required_features for o in problem.offerings],
+        )
+
+    def seating(self, students: int) -> int:
+        """Rooms with at least `students` seats"""
+        return self._suffix[bisect_left(self._capacities, students)]
+
+    def free_rooms(self, offering: int, busy_rooms: int) -> int:
+        """Rooms that can host an offering given the rooms already busy at a slot"""
+        return self.rows[offering] & ~busy_rooms
@@ -0,0 +1,82 @@
+import heapq
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Tuple
+
+# (start_minutes, end_minutes, payload), half-open [start, end)
+Interval = Tuple[int, int, Any]
+
+
+class IntervalTree:
+    """Static interval tree over a sorted array.
+
+    Intervals are sorted by start and viewed as an implicit balanced binary
+    tree (the middle element of every range is its root); each node stores the
+    largest end in its subtree. Queries skip subtrees that end before the
+    window and stop descending right once starts pass it, so a query costs
+    O(log n + k) for k overlapping intervals.
+    """
+
+    def __init__(self, intervals: Iterable[Interval] = ()):
+        items = sorted(intervals, key=lambda i: (i[0], i[1]))
+        self._starts = [i[0] for i in items]
+        self._ends = [i[1] for i in items]
+        self._payloads = [i[2] for i in items]
+        self._max_end = [0] * len(items)
+        self._build(0, len(items))
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def _build(self, lo: int, hi: int) -> int:
+        if lo >= hi:
+            return -1
+        mid = (lo + hi) // 2
+        self._max_end[mid] = max(
+            self._ends[mid],
+            self._build(lo, mid),
+            self._build(mid + 1, hi)
+        )
+        return self._max_end[mid]
+
+    def overlapping(self, start: int, end: int) -> List[Any]:
+        """Payloads of intervals overlapping [start, end)"""
+        found = []
+        stack = [(0, len(self._starts))]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            if self._max_end[mid] <= start:
+                continue
+            stack.append((lo, mid))
+            if self._starts[mid] < end:
+                if self._ends[mid] > start:
+                    found.append(self._payloads[mid])
+                stack.append((mid + 1, hi))
+        return found
+
+
+def overlapping_pairs(intervals: Iterable[Interval]) -> Iterator[Tuple[Any, Any]]:
+    """Yield payload pairs of overlapping intervals with a sweep line, O(n log n + k)"""
+    active: List[Tuple[int, int, Any]] = []
+    for position, (start, end, payload) in enumerate(sorted(intervals, key=lambda i: (i[0], i[1]))):
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+        for _, _, other in active:
+            yield other, payload
+        heapq.heappush(active, (end, position, payload))
+
+
+class DayIntervalIndex:
+    """Interval trees per (resource key, day of week) over minute offsets"""
+
+    def __init__(self, entries: Iterable[Tuple[Hashable, Any, int, int, Any]] = ()):
+        grouped: Dict[Tuple[Hashable, Any], List[Interval]] = {}
+        for key, day, start, end, payload in entries:
+            grouped.setdefault((key, day), []).append((start, end, payload))
+        self._trees = {k: IntervalTree(v) for k, v in grouped.items()}
+
+    def overlapping(self, key: Hashable, day, start: int, end: int) -> List[Any]:
+        """Payloads booked for `key` overlapping [start, end) on `day`"""
+        tree = self._trees.get((key, day))
+        return tree.overlapping(start, end) if tree else []
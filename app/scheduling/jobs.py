@@ -0,0 +1,95 @@
+import asyncio
+import contextvars
+import logging
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+from uuid import UUID
+from config import settings
+from app.core.constants import JobStatus
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Job:
+    """Background scheduling job tracked in process memory"""
+    kind: str
+    schedule_id: Optional[UUID]
+    id: UUID = field(default_factory=uuid.uuid4)
+    status: JobStatus = JobStatus.PENDING
+    progress: float = 0.0
+    message: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: Optional[datetime] = None
+
+    def report(self, progress: float, message: Optional[str] = None) -> None:
+        """Update progress; safe to call from a worker thread"""
+        self.progress = max(self.progress, min(progress, 1.0))
+        if message is not None:
+            self.message = message
+
+
+class JobRegistry:
+    """Runs jobs as asyncio tasks and keeps the most recent ones for polling.
+
+    Jobs live in this process's memory, so a job can only be polled on the
+    worker that started it. Run the API as a single worker process while
+    optimization jobs are in use; with several workers a poll that lands on
+    another worker answers 404.
+    """
+
+    def __init__(self, max_jobs: Optional[int] = None):
+        self.max_jobs = max_jobs if max_jobs is not None else settings.JOB_HISTORY_SIZE
+        self._jobs: "OrderedDict[UUID, Job]" = OrderedDict()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def submit(
+        self,
+        kind: str,
+        schedule_id: Optional[UUID],
+        run: Callable[[Job], Awaitable[Optional[Dict[str, Any]]]]
+    ) -> Job:
+        """Start `run(job)` in the background and return the job handle"""
+        job = Job(kind=kind, schedule_id=schedule_id)
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.max_jobs:
+            self._jobs.popitem(last=False)
+
+        # A fresh context, so the job does not add its statements to the
+        # submitting request's query stats after that request has finished
+        task = asyncio.create_task(self._run(job, run), context=contextvars.Context())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def _run(self, job: Job, run: Callable[[Job], Awaitable[Optional[Dict[str, Any]]]]) -> None:
+        job.status = JobStatus.RUNNING
+        try:
+            job.result = await run(job)
+            job.progress = 1.0
+            job.status = JobStatus.SUCCEEDED
+        except Exception as e:
+            logger.exception("%s job %s failed", job.kind, job.id)
+            job.error = str(e)
+            job.status = JobStatus.FAILED
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+
+    def get(self, job_id: UUID) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def is_running(self, kind: str, schedule_id: UUID) -> bool:
+        return any(
+            job.kind == kind
+            and job.schedule_id == schedule_id
+            and job.status in (JobStatus.PENDING, JobStatus.RUNNING)
+            for job in self._jobs.values()
+        )
+
+
+job_registry = JobRegistry()
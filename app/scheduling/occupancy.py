@@ -0,0 +1,243 @@
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.constants import ClassLevel
+from app.repositories.schedule_assignment import ScheduleAssignmentRepository
+from app.repositories.time_slot import TimeSlotRepository
+from app.scheduling.intervals import IntervalTree
+from app.scheduling.problem import StudentGroupKey, student_group_key
+from app.utils.time_utils import time_to_minutes
+
+INSTRUCTOR_DOUBLE_BOOKING = "instructor_double_booking"
+CLASSROOM_DOUBLE_BOOKING = "classroom_double_booking"
+STUDENT_GROUP_CONFLICT = "student_group_conflict"
+
+
+class OccupancyRow(NamedTuple):
+    """Shape of ScheduleAssignmentRepository.get_occupancy_rows results"""
+    id: UUID
+    course_offering_id: UUID
+    time_slot_id: UUID
+    classroom_id: UUID
+    instructor_id: UUID
+    department_id: Optional[UUID]
+    class_level: object
+    group_no: Optional[int]
+    is_mandatory: bool
+    day_of_week: object = None
+    start_time: object = None
+    end_time: object = None
+
+
+class OccupancyIndex:
+    """Instructor, classroom and student group occupancy as bitmasks over slot ordinals.
+
+    Every time slot gets an ordinal the first time it is seen; a resource's
+    occupancy is an int with that ordinal's bit set, so a conflict test is one
+    AND. When slot times are registered, slots that partially overlap (a 50
+    minute lecture against a 75 minute lab) block each other too. Double
+    bookings already present in the data are counted separately so releasing
+    one of them does not free a slot that is still taken.
+    """
+
+    def __init__(self, slot_ids: Iterable[UUID] = ()):
+        self.slot_ordinals: Dict[UUID, int] = {}
+        # ordinal -> mask of every slot overlapping it (itself included)
+        self._overlaps: List[int] = []
+        self._partial_overlaps = False
+        self.instructors: Dict[UUID, int] = {}
+        self.classrooms: Dict[UUID, int] = {}
+        self.groups: Dict[StudentGroupKey, int] = {}
+        self.version: Optional[int] = None
+        self._level_groups: Dict[Tuple[UUID, ClassLevel], Set[StudentGroupKey]] = {}
+        self._overbooked: Counter = Counter()
+        for slot_id in slot_ids:
+            self.slot_bit(slot_id)
+
+    def slot_bit(self, slot_id: UUID) -> int:
+        """Bit of a time slot, assigning the next ordinal to unseen slots"""
+        ordinal = self.slot_ordinals.get(slot_id)
+        if ordinal is None:
+            ordinal = self.slot_ordinals[slot_id] = len(self.slot_ordinals)
+            self._overlaps.append(1 << ordinal)
+        return 1 << ordinal
+
+    def register_slots(self, slots: Iterable[Tuple[UUID, object, int, int]]) -> None:
+        """Register (slot_id, day_of_week, start_minutes, end_minutes) to detect partial overlaps"""
+        by_day: Dict[object, List[Tuple[int, int, int]]] = {}
+        for slot_id, day, start, end in slots:
+            ordinal = self.slot_bit(slot_id).bit_length() - 1
+            by_day.setdefault(day, []).append((start, end, ordinal))
+
+        for intervals in by_day.values():
+            tree = IntervalTree(intervals)
+            for start, end, ordinal in intervals:
+                mask = 1 << ordinal
+                for other in tree.overlapping(start, end):
+                    mask |= 1 << other
+                if mask != 1 << ordinal:
+                    self._partial_overlaps = True
+                self._overlaps[ordinal] = mask
+
+    def expand(self, mask: int) -> int:
+        """Every slot overlapping any slot in `mask`"""
+        if not self._partial_overlaps:
+            return mask
+        expanded = mask
+        while mask:
+            low = mask & -mask
+            expanded |= self._overlaps[low.bit_length() - 1]
+            mask ^= low
+        return expanded
+
+    def instructor_mask(self, instructor_id: UUID) -> int:
+        return self.instructors.get(instructor_id, 0)
+
+    def classroom_mask(self, classroom_id: UUID) -> int:
+        return self.classrooms.get(classroom_id, 0)
+
+    def group_mask(self, key: Optional[StudentGroupKey]) -> int:
+        """Slots unavailable to a student group, including whole-level lessons"""
+        if key is None:
+            return 0
+        department_id, class_level, group_no = key
+        if group_no is None:
+            mask = 0
+            for other in self._level_groups.get((department_id, class_level), ()):
+                mask |= self.groups[other]
+            return mask
+        return self.groups.get(key, 0) | self.groups.get((department_id, class_level, None), 0)
+
+    def find_conflicts(
+        self,
+        bit: int,
+        instructor_id: Optional[UUID],
+        classroom_id: Optional[UUID],
+        group_key: Optional[StudentGroupKey] = None
+    ) -> List[str]:
+        """Conflict types a booking at `bit` would cause"""
+        conflicts = []
+        bit = self.expand(bit)
+        if instructor_id is not None and self.instructor_mask(instructor_id) & bit:
+            conflicts.append(INSTRUCTOR_DOUBLE_BOOKING)
+        if classroom_id is not None and self.classroom_mask(classroom_id) & bit:
+            conflicts.append(CLASSROOM_DOUBLE_BOOKING)
+        if self.group_mask(group_key) & bit:
+            conflicts.append(STUDENT_GROUP_CONFLICT)
+        return conflicts
+
+    def occupy(
+        self,
+        bit: int,
+        instructor_id: Optional[UUID],
+        classroom_id: Optional[UUID],
+        group_key: Optional[StudentGroupKey] = None
+    ) -> None:
+        """Mark a booking's resources as busy at `bit`"""
+        if instructor_id is not None:
+            self._set("instructor", self.instructors, instructor_id, bit)
+        if classroom_id is not None:
+            self._set("classroom", self.classrooms, classroom_id, bit)
+        if group_key is not None:
+            self._level_groups.setdefault(group_key[:2], set()).add(group_key)
+            self._set("group", self.groups, group_key, bit)
+
+    def release(
+        self,
+        bit: int,
+        instructor_id: Optional[UUID],
+        classroom_id: Optional[UUID],
+        group_key: Optional[StudentGroupKey] = None
+    ) -> None:
+        """Undo a previous occupy()"""
+        if instructor_id is not None:
+            self._clear("instructor", self.instructors, instructor_id, bit)
+        if classroom_id is not None:
+            self._clear("classroom", self.classrooms, classroom_id, bit)
+        if group_key is not None:
+            self._clear("group", self.groups, group_key, bit)
+
+    def _set(self, kind: str, table: Dict, key, bit: int) -> None:
+        current = table.get(key, 0)
+        if current & bit:
+            self._overbooked[(kind, key, bit)] += 1
+        else:
+            table[key] = current | bit
+
+    def _clear(self, kind: str, table: Dict, key, bit: int) -> None:
+        overbooked = (kind, key, bit)
+        if self._overbooked[overbooked]:
+            self._overbooked[overbooked] -= 1
+        else:
+            table[key] = table.get(key, 0) & ~bit
+
+    def add_row(self, row) -> None:
+        """Occupy the resources of an occupancy row (see get_occupancy_rows)"""
+        self.occupy(
+            self.slot_bit(row.time_slot_id),
+            row.instructor_id,
+            row.classroom_id,
+            student_group_key(row.department_id, row.class_level, row.group_no, row.is_mandatory)
+        )
+
+    def row_conflicts(self, row) -> List[str]:
+        """Conflict types adding an occupancy row would cause"""
+        return self.find_conflicts(
+            self.slot_bit(row.time_slot_id),
+            row.instructor_id,
+            row.classroom_id,
+            student_group_key(row.department_id, row.class_level, row.group_no, row.is_mandatory)
+        )
+
+
+class OccupancyRegistry:
+    """Per-schedule occupancy indexes kept across requests.
+
+    A cached index is reused while the schedule's assignment revision is
+    unchanged, so writes from other workers or sessions force a rebuild
+    instead of being missed.
+    """
+
+    def __init__(self, max_schedules: int = 256):
+        self.max_schedules = max_schedules
+        self._indexes: "OrderedDict[UUID, OccupancyIndex]" = OrderedDict()
+
+    async def get(self, db: AsyncSession, schedule_id: UUID) -> OccupancyIndex:
+        """Get a current index for schedule, rebuilding it with one query if stale"""
+        repo = ScheduleAssignmentRepository(db)
+        version = await repo.get_version(schedule_id)
+
+        index = self._indexes.get(schedule_id)
+        if index is None or index.version != version:
+            slots = await TimeSlotRepository(db).get_by_schedule(schedule_id)
+            index = OccupancyIndex()
+            index.register_slots(
+                (s.id, s.day_of_week, time_to_minutes(s.start_time), time_to_minutes(s.end_time))
+                for s in slots
+            )
+            for row in await repo.get_occupancy_rows(schedule_id):
+                index.add_row(row)
+            index.version = version
+            self._indexes[schedule_id] = index
+        self._indexes.move_to_end(schedule_id)
+
+        while len(self._indexes) > self.max_schedules:
+            self._indexes.popitem(last=False)
+        return index
+
+    def record_added(self, schedule_id: UUID, index: OccupancyIndex, revision: int) -> None:
+        """Advance a cached index to `revision` after inserting rows already applied to it.
+
+        Only the revision right after the cached one is taken; any other means
+        someone else wrote in between, and the index is left to be rebuilt.
+        """
+        if self._indexes.get(schedule_id) is not index or index.version != revision - 1:
+            return
+        index.version = revision
+
+    def invalidate(self, schedule_id: UUID) -> None:
+        self._indexes.pop(schedule_id, None)
+
+
+occupancy_registry = OccupancyRegistry()
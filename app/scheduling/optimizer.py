@@ -0,0 +1,276 @@
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+from config import settings
+from app.core.constants import COURSE_TYPE_TO_CLASSROOM_TYPES
+from app.scheduling.occupancy import OccupancyIndex
+from app.scheduling.problem import SchedulingProblem
+from app.utils.conflicts import calculate_conflict_severity
+
+PREFERENCE_VIOLATION = "preference_violation"
+CAPACITY_EXCEEDED = "capacity_exceeded"
+DAILY_LOAD_EXCEEDED = "daily_load_exceeded"
+
+# (assignment_id, course_offering_id, time_slot_id, classroom_id, instructor_id)
+AssignmentTuple = Tuple[UUID, UUID, UUID, UUID, UUID]
+
+
+@dataclass
+class Move:
+    assignment_id: UUID
+    time_slot_id: UUID
+    classroom_id: UUID
+
+
+@dataclass
+class OptimizationResult:
+    moves: List[Move] = field(default_factory=list)
+    initial_score: int = 0
+    final_score: int = 0
+    penalties: Dict[str, int] = field(default_factory=dict)
+    iterations: int = 0
+    accepted: int = 0
+    elapsed_seconds: float = 0.0
+
+
+class ScheduleOptimizer:
+    """Simulated annealing over slot and room changes of existing assignments.
+
+    The score is a weighted count of soft violations, each weighted with
+    calculate_conflict_severity: lessons outside the offering's preferred
+    classroom, rooms smaller than the offering, and instructor days above
+    SCHEDULER_MAX_DAILY_LESSONS. A move touches one assignment, so its score
+    delta is computed from that assignment and two per-day load counters
+    instead of re-scoring the schedule. Hard constraints are never relaxed:
+    a move is only tried when the OccupancyIndex reports no conflict.
+    """
+
+    def __init__(
+        self,
+        problem: SchedulingProblem,
+        assignments: List[AssignmentTuple],
+        time_limit: Optional[float] = None,
+        max_daily_lessons: Optional[int] = None,
+        seed: Optional[int] = None,
+        progress: Optional[Callable[[float, int], None]] = None
+    ):
+        self.problem = problem
+        self.time_limit = time_limit if time_limit is not None else settings.OPTIMIZER_TIME_LIMIT_SECONDS
+        self.max_daily = max_daily_lessons if max_daily_lessons is not None else settings.SCHEDULER_MAX_DAILY_LESSONS
+        self.random = random.Random(seed)
+        self.progress = progress
+
+        self.weights = {
+            kind: calculate_conflict_severity(kind)
+            for kind in (PREFERENCE_VIOLATION, CAPACITY_EXCEEDED, DAILY_LOAD_EXCEEDED)
+        }
+        self.slots = problem.slots
+        self.rooms = problem.rooms
+        self.slot_index = {s.id: i for i, s in enumerate(self.slots)}
+        self.room_index = {r.id: i for i, r in enumerate(self.rooms)}
+        self.offerings = {o.id: o for o in problem.offerings}
+
+        self.occupancy = OccupancyIndex()
+        self.occupancy.register_slots(
+            (s.id, s.day_of_week, s.start_minutes, s.end_minutes) for s in self.slots
+        )
+        self.unavailable: Dict[UUID, int] = {}
+        for instructor_id, slot_id in problem.unavailable:
+            if slot_id in self.slot_index:
+                self.unavailable[instructor_id] = (
+                    self.unavailable.get(instructor_id, 0) | self.occupancy.slot_bit(slot_id)
+                )
+        for instructor_id, slot_id, room_id in problem.blocked:
+            if slot_id in self.slot_index:
+                self.occupancy.occupy(self.occupancy.slot_bit(slot_id), instructor_id, room_id)
+
+        # Movable assignments; others (unknown offering or slot) just occupy their resources
+        self.assignment_ids: List[UUID] = []
+        self.assignment_offerings = []
+        self.positions: List[Tuple[int, int]] = []
+        self.room_choices: List[List[int]] = []
+        self.load: Dict[Tuple[UUID, object], int] = {}
+        # Slots each offering starts in; see _is_free
+        self.original_slots: Dict[UUID, set] = {}
+        for assignment_id, offering_id, slot_id, room_id, instructor_id in assignments:
+            offering = self.offerings.get(offering_id)
+            if offering is None or slot_id not in self.slot_index or room_id not in self.room_index:
+                # Its instructor and room stay booked even when the offering is unknown
+                if slot_id in self.slot_index:
+                    self.occupancy.occupy(
+                        self.occupancy.slot_bit(slot_id),
+                        instructor_id,
+                        room_id,
+                        offering.group_key if offering is not None else None
+                    )
+                continue
+            slot, room = self.slot_index[slot_id], self.room_index[room_id]
+            self.assignment_ids.append(assignment_id)
+            self.assignment_offerings.append(offering)
+            self.positions.append((slot, room))
+            self.original_slots.setdefault(offering_id, set()).add(slot)
+            self.room_choices.append(self._room_choices(offering, room))
+            self.occupancy.occupy(1 << slot, offering.instructor_id, room_id, offering.group_key)
+            key = (offering.instructor_id, self.slots[slot].day_of_week)
+            self.load[key] = self.load.get(key, 0) + 1
+        self.initial_positions = list(self.positions)
+
+    def _room_choices(self, offering, current: int) -> List[int]:
+        """Rooms an offering may move to: compatible and large enough, plus its current room"""
+        allowed_types = COURSE_TYPE_TO_CLASSROOM_TYPES.get(offering.course_type, ())
+        choices = [
+            i for i, r in enumerate(self.rooms)
+            if r.classroom_type in allowed_types and r.capacity >= offering.student_count
+        ]
+        if current not in choices:
+            choices.append(current)
+        return choices
+
+    def _local_penalty(self, offering, room: int) -> int:
+        penalty = 0
+        if self.rooms[room].id != offering.classroom_id:
+            penalty += self.weights[PREFERENCE_VIOLATION]
+        if self.rooms[room].capacity < offering.student_count:
+            penalty += self.weights[CAPACITY_EXCEEDED]
+        return penalty
+
+    def _excess(self, lessons: int) -> int:
+        return max(0, lessons - self.max_daily)
+
+    def score(self) -> int:
+        """Full weighted score, used once at the start and for reporting"""
+        total = sum(
+            self._local_penalty(offering, room)
+            for offering, (_, room) in zip(self.assignment_offerings, self.positions)
+        )
+        total += self.weights[DAILY_LOAD_EXCEEDED] * sum(self._excess(n) for n in self.load.values())
+        return total
+
+    def penalty_counts(self) -> Dict[str, int]:
+        counts = {PREFERENCE_VIOLATION: 0, CAPACITY_EXCEEDED: 0, DAILY_LOAD_EXCEEDED: 0}
+        for offering, (_, room) in zip(self.assignment_offerings, self.positions):
+            counts[PREFERENCE_VIOLATION] += self.rooms[room].id != offering.classroom_id
+            counts[CAPACITY_EXCEEDED] += self.rooms[room].capacity < offering.student_count
+        counts[DAILY_LOAD_EXCEEDED] = sum(self._excess(n) for n in self.load.values())
+        return counts
+
+    def _delta(self, a: int, slot: int, room: int) -> int:
+        """Score change of moving assignment `a` to (slot, room), O(1)"""
+        offering = self.assignment_offerings[a]
+        old_slot, old_room = self.positions[a]
+        delta = self._local_penalty(offering, room) - self._local_penalty(offering, old_room)
+        old_day = self.slots[old_slot].day_of_week
+        new_day = self.slots[slot].day_of_week
+        if old_day != new_day:
+            old_load = self.load[(offering.instructor_id, old_day)]
+            new_load = self.load.get((offering.instructor_id, new_day), 0)
+            delta += self.weights[DAILY_LOAD_EXCEEDED] * (
+                self._excess(old_load - 1) - self._excess(old_load)
+                + self._excess(new_load + 1) - self._excess(new_load)
+            )
+        return delta
+
+    def _place(self, a: int, slot: int, room: int) -> None:
+        offering = self.assignment_offerings[a]
+        old_slot, old_room = self.positions[a]
+        old_key = (offering.instructor_id, self.slots[old_slot].day_of_week)
+        new_key = (offering.instructor_id, self.slots[slot].day_of_week)
+        self.load[old_key] -= 1
+        self.load[new_key] = self.load.get(new_key, 0) + 1
+        self.occupancy.occupy(1 << slot, offering.instructor_id, self.rooms[room].id, offering.group_key)
+        self.positions[a] = (slot, room)
+
+    def _propose(self, a: int) -> Tuple[int, int]:
+        slot, room = self.positions[a]
+        if self.random.random() < 0.5:
+            slot = self.random.randrange(len(self.slots))
+        if slot == self.positions[a][0] or self.random.random() < 0.5:
+            room = self.random.choice(self.room_choices[a])
+        return slot, room
+
+    def _is_free(self, a: int, slot: int, room: int) -> bool:
+        offering = self.assignment_offerings[a]
+        # Never move a lesson into a slot another lesson of the same offering started in, so
+        # the final updates can run in any order without tripping uq_schedule_assignment
+        if slot != self.initial_positions[a][0] and slot in self.original_slots[offering.id]:
+            return False
+        bit = 1 << slot
+        if self.unavailable.get(offering.instructor_id, 0) & bit:
+            return False
+        return not self.occupancy.find_conflicts(
+            bit, offering.instructor_id, self.rooms[room].id, offering.group_key
+        )
+
+    def optimize(self) -> OptimizationResult:
+        started = time.monotonic()
+        result = OptimizationResult()
+        current = best = result.initial_score = self.score()
+        initial_positions = self.initial_positions
+        best_positions = list(self.positions)
+        if not self.positions or not self.slots:
+            result.final_score = current
+            result.penalties = self.penalty_counts()
+            return result
+
+        start_temperature = float(max(self.weights.values()))
+        end_temperature = 0.5
+        temperature = start_temperature
+        iterations = accepted = 0
+        while True:
+            if iterations & 255 == 0:
+                elapsed = time.monotonic() - started
+                fraction = min(1.0, elapsed / self.time_limit) if self.time_limit > 0 else 1.0
+                if fraction >= 1.0 or best == 0:
+                    break
+                temperature = start_temperature * (end_temperature / start_temperature) ** fraction
+                if self.progress and iterations & 4095 == 0:
+                    self.progress(fraction, best)
+            iterations += 1
+
+            a = self.random.randrange(len(self.positions))
+            slot, room = self._propose(a)
+            if (slot, room) == self.positions[a]:
+                continue
+            offering = self.assignment_offerings[a]
+            old_slot, old_room = self.positions[a]
+            self.occupancy.release(1 << old_slot, offering.instructor_id, self.rooms[old_room].id, offering.group_key)
+            if not self._is_free(a, slot, room):
+                self.occupancy.occupy(1 << old_slot, offering.instructor_id, self.rooms[old_room].id, offering.group_key)
+                continue
+
+            delta = self._delta(a, slot, room)
+            if delta <= 0 or self.random.random() < math.exp(-delta / temperature):
+                self._place(a, slot, room)
+                current += delta
+                accepted += 1
+                if current < best:
+                    best = current
+                    best_positions = list(self.positions)
+            else:
+                self.occupancy.occupy(1 << old_slot, offering.instructor_id, self.rooms[old_room].id, offering.group_key)
+
+        self._restore(best_positions)
+        result.moves = [
+            Move(self.assignment_ids[a], self.slots[slot].id, self.rooms[room].id)
+            for a, (slot, room) in enumerate(best_positions)
+            if (slot, room) != initial_positions[a]
+        ]
+        result.final_score = best
+        result.penalties = self.penalty_counts()
+        result.iterations = iterations
+        result.accepted = accepted
+        result.elapsed_seconds = time.monotonic() - started
+        if self.progress:
+            self.progress(1.0, best)
+        return result
+
+    def _restore(self, positions: List[Tuple[int, int]]) -> None:
+        """Bring load counters in line with the best positions found"""
+        self.positions = positions
+        self.load = {}
+        for offering, (slot, _) in zip(self.assignment_offerings, positions):
+            key = (offering.instructor_id, self.slots[slot].day_of_week)
+            self.load[key] = self.load.get(key, 0) + 1
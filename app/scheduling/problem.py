@@ -0,0 +1,73 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+from app.core.constants import (
+    ClassLevel,
+    ClassroomType,
+    CourseLevel,
+    CourseType,
+    DayOfWeek,
+    COURSE_LEVEL_TO_CLASS_LEVEL,
+)
+
+# (department_id, class_level, group_no) - group_no None means the whole class level
+StudentGroupKey = Tuple[UUID, ClassLevel, Optional[int]]
+
+
+@dataclass
+class SlotSpec:
+    id: UUID
+    day_of_week: DayOfWeek
+    start_minutes: int
+    end_minutes: int
+
+
+@dataclass
+class RoomSpec:
+    id: UUID
+    classroom_type: ClassroomType
+    capacity: int
+    department_id: Optional[UUID]
+    features: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class OfferingSpec:
+    id: UUID
+    instructor_id: UUID
+    classroom_id: UUID
+    student_count: int
+    weekly_hours: int
+    course_type: CourseType
+    group_key: Optional[StudentGroupKey]
+    # Classroom features the offering needs, matched against Classroom.features
+    required_features: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class SchedulingProblem:
+    """Everything the solver needs for one schedule, detached from the ORM"""
+    schedule_id: UUID
+    term_id: UUID
+    department_id: UUID
+    slots: List[SlotSpec]
+    rooms: List[RoomSpec]
+    offerings: List[OfferingSpec]
+    # (instructor_id, time_slot_id) pairs the instructor cannot teach
+    unavailable: Set[Tuple[UUID, UUID]] = field(default_factory=set)
+    # (course_offering_id, instructor_id, time_slot_id, classroom_id) already in this schedule
+    pinned: List[Tuple[UUID, UUID, UUID, UUID]] = field(default_factory=list)
+    # (instructor_id, time_slot_id, classroom_id) booked by other schedules of the term
+    blocked: List[Tuple[UUID, UUID, UUID]] = field(default_factory=list)
+
+
+def student_group_key(
+    department_id: UUID,
+    class_level: CourseLevel,
+    group_no: Optional[int],
+    is_mandatory: bool
+) -> Optional[StudentGroupKey]:
+    """Key of the program class group attending an offering (None for electives)"""
+    if not is_mandatory or department_id is None:
+        return None
+    return (department_id, COURSE_LEVEL_TO_CLASS_LEVEL[class_level], group_no)
@@ -0,0 +1,261 @@
+from array import array
+from dataclasses import dataclass, field
+from typing import AbstractSet, Any, Dict, Generic, Hashable, Iterator, List, Optional, Tuple, TypeVar
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.constants import (
+    ClassLevel,
+    ClassroomType,
+    CourseType,
+    DayOfWeek,
+    COURSE_LEVEL_TO_CLASS_LEVEL,
+)
+from app.models.schedule import Schedule
+from app.repositories.classroom import ClassroomRepository
+from app.repositories.course_offering import CourseOfferingRepository
+from app.repositories.instructor_availability import InstructorAvailabilityRepository
+from app.repositories.schedule_assignment import ScheduleAssignmentRepository
+from app.repositories.time_slot import TimeSlotRepository
+from app.scheduling.problem import OfferingSpec, RoomSpec, SchedulingProblem, SlotSpec
+from app.utils.time_utils import time_to_minutes
+
+DAYS = list(DayOfWeek)
+CLASSROOM_TYPES = list(ClassroomType)
+COURSE_TYPES = list(CourseType)
+CLASS_LEVELS = list(ClassLevel)
+
+NONE = -1
+
+K = TypeVar("K", bound=Hashable)
+
+
+class Interner(Generic[K]):
+    """Dense int index for hashable keys, in first-seen order"""
+
+    def __init__(self):
+        self.keys: List[K] = []
+        self._index: Dict[K, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, key: K) -> int:
+        index = self._index.get(key)
+        if index is None:
+            index = self._index[key] = len(self.keys)
+            self.keys.append(key)
+        return index
+
+    def get(self, key: K, default: int = NONE) -> int:
+        return self._index.get(key, default)
+
+
+@dataclass
+class SchedulingSnapshot:
+    """Scheduling inputs of one schedule as int columns.
+
+    Every UUID (slot, room, instructor, department, offering) and every
+    program class is mapped to a dense index, and per-entity attributes live
+    in `array.array` columns indexed by it, so a 10k-offering term takes a few
+    MB and loops over it touch only ints. Rooms referenced only by other
+    schedules' bookings are interned after the hosting rooms and have no
+    attribute columns.
+    """
+    schedule_id: UUID
+    term_id: UUID
+    department: int
+    slots: Interner = field(default_factory=Interner)
+    rooms: Interner = field(default_factory=Interner)
+    instructors: Interner = field(default_factory=Interner)
+    departments: Interner = field(default_factory=Interner)
+    offerings: Interner = field(default_factory=Interner)
+    # (department, class level ordinal, group_no or NONE)
+    program_classes: Interner = field(default_factory=Interner)
+
+    slot_day: array = field(default_factory=lambda: array("b"))
+    slot_start: array = field(default_factory=lambda: array("H"))
+    slot_end: array = field(default_factory=lambda: array("H"))
+
+    room_type: array = field(default_factory=lambda: array("b"))
+    room_capacity: array = field(default_factory=lambda: array("H"))
+    room_department: array = field(default_factory=lambda: array("i"))
+    room_features: List[Dict[str, Any]] = field(default_factory=list)
+
+    offering_instructor: array = field(default_factory=lambda: array("i"))
+    offering_room: array = field(default_factory=lambda: array("i"))
+    offering_students: array = field(default_factory=lambda: array("H"))
+    offering_hours: array = field(default_factory=lambda: array("B"))
+    offering_type: array = field(default_factory=lambda: array("b"))
+    offering_class: array = field(default_factory=lambda: array("i"))
+
+    unavailable_instructor: array = field(default_factory=lambda: array("i"))
+    unavailable_slot: array = field(default_factory=lambda: array("i"))
+
+    # Assignments of this schedule; offering is NONE when outside the snapshot
+    pinned_offering: array = field(default_factory=lambda: array("i"))
+    pinned_instructor: array = field(default_factory=lambda: array("i"))
+    pinned_slot: array = field(default_factory=lambda: array("i"))
+    pinned_room: array = field(default_factory=lambda: array("i"))
+
+    # Bookings of the term's other schedules
+    blocked_instructor: array = field(default_factory=lambda: array("i"))
+    blocked_slot: array = field(default_factory=lambda: array("i"))
+    blocked_room: array = field(default_factory=lambda: array("i"))
+
+    def add_slot(self, slot_id: UUID, day_of_week: DayOfWeek, start_minutes: int, end_minutes: int) -> int:
+        index = self.slots.add(slot_id)
+        if index == len(self.slot_day):
+            self.slot_day.append(DAYS.index(day_of_week))
+            self.slot_start.append(start_minutes)
+            self.slot_end.append(end_minutes)
+        return index
+
+    def add_room(
+        self,
+        room_id: UUID,
+        classroom_type: ClassroomType,
+        capacity: int,
+        department_id: Optional[UUID],
+        features: Optional[Dict[str, Any]] = None
+    ) -> int:
+        index = self.rooms.add(room_id)
+        if index == len(self.room_type):
+            self.room_type.append(CLASSROOM_TYPES.index(classroom_type))
+            self.room_capacity.append(capacity)
+            self.room_department.append(self.departments.add(department_id) if department_id else NONE)
+            self.room_features.append(features or {})
+        return index
+
+    def add_offering(self, row) -> int:
+        """Add a CourseOfferingRepository scheduling row"""
+        index = self.offerings.add(row.id)
+        if index < len(self.offering_instructor):
+            return index
+        program_class = NONE
+        if row.is_mandatory and row.department_id is not None:
+            program_class = self.program_classes.add((
+                self.departments.add(row.department_id),
+                CLASS_LEVELS.index(COURSE_LEVEL_TO_CLASS_LEVEL[row.class_level]),
+                row.group_no if row.group_no is not None else NONE,
+            ))
+        self.offering_instructor.append(self.instructors.add(row.instructor_id))
+        self.offering_room.append(self.rooms.get(row.classroom_id))
+        self.offering_students.append(row.student_count)
+        self.offering_hours.append(row.weekly_hours)
+        self.offering_type.append(COURSE_TYPES.index(row.course_type))
+        self.offering_class.append(program_class)
+        return index
+
+    @property
+    def hosting_room_count(self) -> int:
+        return len(self.room_type)
+
+    def memory_bytes(self) -> int:
+        """Size of the int columns (interned UUIDs not included)"""
+        return sum(
+            value.itemsize * len(value)
+            for value in vars(self).values()
+            if isinstance(value, array)
+        )
+
+    def group_key(self, program_class: int) -> Optional[Tuple[int, ClassLevel, Optional[int]]]:
+        if program_class == NONE:
+            return None
+        department, level, group_no = self.program_classes.keys[program_class]
+        return (department, CLASS_LEVELS[level], None if group_no == NONE else group_no)
+
+    def to_problem(self) -> SchedulingProblem:
+        """SchedulingProblem over the dense indices, for ScheduleSolver"""
+        problem = SchedulingProblem(
+            schedule_id=self.schedule_id,
+            term_id=self.term_id,
+            department_id=self.department,
+            slots=[
+                SlotSpec(i, DAYS[self.slot_day[i]], self.slot_start[i], self.slot_end[i])
+                for i in range(len(self.slot_day))
+            ],
+            rooms=[
+                RoomSpec(
+                    i,
+                    CLASSROOM_TYPES[self.room_type[i]],
+                    self.room_capacity[i],
+                    None if self.room_department[i] == NONE else self.room_department[i],
+                    self.room_features[i],
+                )
+                for i in range(self.hosting_room_count)
+            ],
+            offerings=[
+                OfferingSpec(
+                    i,
+                    self.offering_instructor[i],
+                    self.offering_room[i],
+                    self.offering_students[i],
+                    self.offering_hours[i],
+                    COURSE_TYPES[self.offering_type[i]],
+                    self.group_key(self.offering_class[i]),
+                )
+                for i in range(len(self.offering_instructor))
+            ],
+            unavailable=set(zip(self.unavailable_instructor, self.unavailable_slot)),
+        )
+        problem.pinned = list(zip(self.pinned_offering, self.pinned_instructor, self.pinned_slot, self.pinned_room))
+        problem.blocked = list(zip(self.blocked_instructor, self.blocked_slot, self.blocked_room))
+        return problem
+
+    def slot_times(self) -> Iterator[Tuple[UUID, DayOfWeek, int, int]]:
+        """(slot id, day, start minutes, end minutes) of the term's slots"""
+        for i in range(len(self.slot_day)):
+            yield self.slots.keys[i], DAYS[self.slot_day[i]], self.slot_start[i], self.slot_end[i]
+
+    def bookings(self) -> Iterator[Tuple[UUID, UUID, UUID]]:
+        """(instructor id, slot id, room id) of pinned and blocked assignments"""
+        instructors, slots, rooms = self.instructors.keys, self.slots.keys, self.rooms.keys
+        for instructor, slot, room in zip(self.pinned_instructor, self.pinned_slot, self.pinned_room):
+            yield instructors[instructor], slots[slot], rooms[room]
+        for instructor, slot, room in zip(self.blocked_instructor, self.blocked_slot, self.blocked_room):
+            yield instructors[instructor], slots[slot], rooms[room]
+
+
+async def build_snapshot(
+    db: AsyncSession,
+    schedule: Schedule,
+    replaced_schedule_ids: AbstractSet[UUID] = frozenset()
+) -> SchedulingSnapshot:
+    """Load a schedule's scheduling inputs into a snapshot with a handful of column queries"""
+    snapshot = SchedulingSnapshot(schedule_id=schedule.id, term_id=schedule.term_id, department=NONE)
+    snapshot.department = snapshot.departments.add(schedule.department_id)
+
+    for slot in await TimeSlotRepository(db).get_by_term(schedule.term_id):
+        snapshot.add_slot(slot.id, slot.day_of_week, time_to_minutes(slot.start_time), time_to_minutes(slot.end_time))
+    for room in await ClassroomRepository(db).get_active():
+        snapshot.add_room(room.id, room.classroom_type, room.capacity, room.department_id, room.features)
+    for row in await CourseOfferingRepository(db).get_scheduling_rows(schedule.term_id, schedule.department_id):
+        snapshot.add_offering(row)
+
+    if len(snapshot.instructors):
+        for row in await InstructorAvailabilityRepository(db).get_unavailable_slots(
+            schedule.term_id,
+            list(snapshot.instructors.keys)
+        ):
+            slot = snapshot.slots.get(row.time_slot_id)
+            if slot != NONE:
+                snapshot.unavailable_instructor.append(snapshot.instructors.get(row.instructor_id))
+                snapshot.unavailable_slot.append(slot)
+
+    for row in await ScheduleAssignmentRepository(db).get_term_occupancy(schedule.term_id):
+        if row.schedule_id in replaced_schedule_ids:
+            continue
+        instructor = snapshot.instructors.add(row.instructor_id)
+        slot = snapshot.slots.add(row.time_slot_id)
+        room = snapshot.rooms.add(row.classroom_id)
+        if row.schedule_id == schedule.id:
+            snapshot.pinned_offering.append(snapshot.offerings.get(row.course_offering_id))
+            snapshot.pinned_instructor.append(instructor)
+            snapshot.pinned_slot.append(slot)
+            snapshot.pinned_room.append(room)
+        else:
+            snapshot.blocked_instructor.append(instructor)
+            snapshot.blocked_slot.append(slot)
+            snapshot.blocked_room.append(room)
+
+    return snapshot
@@ -1,46 +1,95 @@
-from typing import Type, Dict, Any, Tuple
-from sqlalchemy import Column, and_, or_
+import operator
+from functools import lru_cache
+from typing import Type, Dict, Any, Tuple, List, Callable
+from sqlalchemy import Column, and_, or_, inspect
 from sqlalchemy.orm import Query
 
+# Operator keys accepted in {"field": {"op": value}} filter specs
+FILTER_OPERATORS: Dict[str, Callable[[Any, Any], Any]] = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+    "like": lambda column, value: column.like(value),
+    "ilike": lambda column, value: column.ilike(value),
+    "in": lambda column, value: column.in_(value),
+}
+
+
+class FilterCompiler:
+    """Turns filter dicts into SQL clauses for one model.
+    
+    The filterable columns are resolved once per model: every mapped column,
+    or the model's `__filterable__` names when it declares them. A spec maps
+    a field to a value (equality), a list (IN) or a dict of operators, all of
+    which apply, e.g. {"created_at": {"gte": a, "lt": b}}. Unknown fields and
+    operators raise ValueError. Clauses are emitted in a canonical order so
+    equal filter shapes produce identical statements and hit SQLAlchemy's
+    compiled cache; the per-shape plan is memoized as well.
+    """
+    
+    def __init__(self, model: Type):
+        self.model = model
+        names = getattr(model, "__filterable__", None)
+        columns = {attr.key: getattr(model, attr.key) for attr in inspect(model).column_attrs}
+        if names is not None:
+            unknown = set(names) - columns.keys()
+            if unknown:
+                raise ValueError(f"{model.__name__}.__filterable__ names unknown columns: {sorted(unknown)}")
+            columns = {name: columns[name] for name in names}
+        self.columns = columns
+        self._plans: Dict[Tuple[Tuple[str, str], ...], List[Tuple[Any, Callable]]] = {}
+    
+    def compile(self, filter_params: Dict[str, Any]) -> list:
+        """Validate a filter spec and build its clauses"""
+        shape = []
+        values = []
+        for field_name in sorted(filter_params):
+            value = filter_params[field_name]
+            if value is None:
+                continue
+            if isinstance(value, dict):
+                for op in sorted(value):
+                    shape.append((field_name, op))
+                    values.append(value[op])
+            elif isinstance(value, (list, tuple, set)):
+                shape.append((field_name, "in"))
+                values.append(list(value))
+            else:
+                shape.append((field_name, "eq"))
+                values.append(value)
+        
+        plan = self._plan(tuple(shape))
+        return [op(column, value) for (column, op), value in zip(plan, values)]
+    
+    def _plan(self, shape: Tuple[Tuple[str, str], ...]) -> List[Tuple[Any, Callable]]:
+        plan = self._plans.get(shape)
+        if plan is None:
+            plan = []
+            for field_name, op in shape:
+                column = self.columns.get(field_name)
+                if column is None:
+                    raise ValueError(f"Cannot filter {self.model.__name__} by '{field_name}'")
+                if op not in FILTER_OPERATORS:
+                    raise ValueError(f"Unknown filter operator '{op}' for '{field_name}'")
+                plan.append((column, FILTER_OPERATORS[op]))
+            self._plans[shape] = plan
+        return plan
+
+
+@lru_cache(maxsize=None)
+def get_filter_compiler(model: Type) -> FilterCompiler:
+    return FilterCompiler(model)
+
 
 def build_dynamic_filters(
     model: Type,
     filter_params: Dict[str, Any]
 ) -> list:
-    """Build SQLAlchemy filters from dict"""
-    filters = []
-    
-    for field_name, value in filter_params.items():
-        if value is None:
-            continue
-        
-        if not hasattr(model, field_name):
-            continue
-        
-        column = getattr(model, field_name)
-        
-        if isinstance(value, dict):
-            # Handle operators like {"gt": 10}, {"like": "%test%"}
-            if "gt" in value:
-                filters.append(column > value["gt"])
-            elif "gte" in value:
-                filters.append(column >= value["gte"])
-            elif "lt" in value:
-                filters.append(column < value["lt"])
-            elif "lte" in value:
-                filters.append(column <= value["lte"])
-            elif "like" in value:
-                filters.append(column.like(value["like"]))
-            elif "ilike" in value:
-                filters.append(column.ilike(value["ilike"]))
-            elif "in" in value:
-                filters.append(column.in_(value["in"]))
-        elif isinstance(value, list):
-            filters.append(column.in_(value))
-        else:
-            filters.append(column == value)
-    
-    return filters
+    """Build SQLAlchemy filters from dict; raises ValueError for unknown fields or operators"""
+    return get_filter_compiler(model).compile(filter_params)
 
 
 def apply_pagination(
@@ -0,0 +1,115 @@
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterable, List, Optional
+from app.core.constants import DayOfWeek
+
+PRODID = "-//Class Scheduling System//Timetable//EN"
+WEEKDAYS = list(DayOfWeek)
+
+
+@dataclass(frozen=True)
+class CalendarEvent:
+    """One weekly recurring lesson of a timetable feed"""
+    uid: str
+    summary: str
+    day_of_week: DayOfWeek
+    start_time: time
+    end_time: time
+    location: Optional[str] = None
+    description: Optional[str] = None
+
+
+def escape_text(value: str) -> str:
+    """Escape a TEXT property value (RFC 5545 3.3.11)"""
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold_line(line: str) -> str:
+    """Fold a content line into 75-octet chunks without splitting UTF-8 sequences"""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line
+    chunks = []
+    start = 0
+    limit = 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # Back off to a character boundary
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1
+        chunks.append(encoded[start:end].decode())
+        start = end
+        limit = 74  # continuation lines start with a space
+    return "\r\n ".join(chunks)
+
+
+def first_occurrence(term_start: date, day_of_week: DayOfWeek) -> date:
+    """First date on or after term_start falling on day_of_week"""
+    offset = (WEEKDAYS.index(day_of_week) - term_start.weekday()) % 7
+    return term_start + timedelta(days=offset)
+
+
+def _local(value: datetime) -> str:
+    return value.strftime("%Y%m%dT%H%M%S")
+
+
+def _utc(value: datetime) -> str:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
+
+def render_calendar(
+    name: str,
+    events: Iterable[CalendarEvent],
+    term_start: date,
+    term_end: date,
+    stamp: datetime,
+    timezone_hint: Optional[str] = None
+) -> bytes:
+    """Render events as a VCALENDAR repeating weekly from term_start to term_end.
+    
+    DTSTART, DTEND and the RRULE's UNTIL are all floating local times, as RFC
+    5545 requires UNTIL to match DTSTART and a TZID would need a VTIMEZONE.
+    `timezone_hint` is only announced as X-WR-TIMEZONE, which common clients
+    use to place floating times. `stamp` is used as every DTSTAMP so that the
+    same data always renders to the same bytes.
+    """
+    dtstamp = _utc(stamp)
+    until = _local(datetime.combine(term_end, time(23, 59, 59)))
+    lines: List[str] = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape_text(name)}",
+    ]
+    if timezone_hint:
+        lines.append(f"X-WR-TIMEZONE:{timezone_hint}")
+    for event in events:
+        first = first_occurrence(term_start, event.day_of_week)
+        if first > term_end:
+            continue
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:{event.uid}",
+            f"DTSTAMP:{dtstamp}",
+            f"DTSTART:{_local(datetime.combine(first, event.start_time))}",
+            f"DTEND:{_local(datetime.combine(first, event.end_time))}",
+            f"RRULE:FREQ=WEEKLY;UNTIL={until}",
+            f"SUMMARY:{escape_text(event.summary)}",
+        ]
+        if event.location:
+            lines.append(f"LOCATION:{escape_text(event.location)}")
+        if event.description:
+            lines.append(f"DESCRIPTION:{escape_text(event.description)}")
+        lines.append("END:VEVENT")
+    lines.append("END:VCALENDAR")
+    return ("\r\n".join(fold_line(line) for line in lines) + "\r\n").encode()
@@ -0,0 +1,75 @@
+"""Event-loop latency during a burst of concurrent logins.
+
+Runs the same burst of bcrypt verifications twice, first inline on the
+event loop (the old behaviour) and then through the bounded hashing pool,
+while a probe task measures how late the loop wakes it up.
+
+    python -m benchmarks.password_hashing --logins 50
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+from app.core.security import (
+    hash_password,
+    hash_worker_count,
+    shutdown_password_hasher,
+    verify_password,
+    verify_password_async,
+)
+
+PROBE_INTERVAL = 0.005
+
+
+async def probe(lags: List[float], stop: asyncio.Event) -> None:
+    """Record how much later than requested each short sleep returns"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - started - PROBE_INTERVAL)
+
+
+async def sync_login(password: str, hashed: str) -> None:
+    verify_password(password, hashed)
+
+
+async def async_login(password: str, hashed: str) -> None:
+    await verify_password_async(password, hashed)
+
+
+async def run(login, logins: int, password: str, hashed: str) -> None:
+    lags: List[float] = []
+    stop = asyncio.Event()
+    prober = asyncio.create_task(probe(lags, stop))
+    await asyncio.sleep(PROBE_INTERVAL * 2)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(login(password, hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await prober
+    lags.sort()
+    print(
+        f"{login.__name__:<12} {logins} logins in {elapsed:6.2f}s "
+        f"({logins / elapsed:6.1f}/s)  loop lag ms: "
+        f"p50={statistics.median(lags) * 1000:7.1f} "
+        f"p99={lags[int(len(lags) * 0.99) - 1] * 1000:7.1f} "
+        f"max={lags[-1] * 1000:7.1f}"
+    )
+
+
+async def main(logins: int) -> None:
+    password = "correct horse battery staple"
+    hashed = hash_password(password)
+    print(f"bcrypt workers: {hash_worker_count()}")
+    await run(sync_login, logins, password, hashed)
+    await run(async_login, logins, password, hashed)
+    shutdown_password_hasher()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=50)
+    asyncio.run(main(parser.parse_args().logins))
@@ -0,0 +1,59 @@
+import pytest
+from app.core import cache as cache_module
+from app.core.cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_entries_expire(clock):
+    cache = TTLCache(maxsize=10, ttl=5)
+    cache.set("a", 1)
+
+    clock[0] += 4.9
+    assert cache.get("a") == 1
+    clock[0] += 0.1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_per_entry_ttl_is_capped(clock):
+    cache = TTLCache(maxsize=10, ttl=5)
+    cache.set("short", 1, ttl=1)
+    cache.set("long", 2, ttl=60)
+    cache.set("expired", 3, ttl=-1)
+
+    clock[0] += 2
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+    clock[0] += 3
+    assert cache.get("long") is None
+    assert cache.get("expired") is None
+
+
+def test_least_recently_used_is_evicted(clock):
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_pop_discard_and_clear(clock):
+    cache = TTLCache(maxsize=10, ttl=60)
+    for i in range(4):
+        cache.set(("user", i % 2, i), i)
+
+    assert cache.discard_where(lambda key, _: key[1] == 0) == 2
+    assert cache.pop(("user", 1, 1)) == 1
+    assert cache.pop(("user", 1, 1)) is None
+    cache.clear()
+    assert len(cache) == 0
@@ -0,0 +1,23 @@
+from uuid import uuid4
+from app.core.constants import CalendarOwner
+from app.Services.calendar_service import calendar_headers, calendar_token, verify_calendar_token, CalendarFeed
+
+
+def test_token_is_bound_to_owner():
+    owner_id = uuid4()
+    token = calendar_token(CalendarOwner.INSTRUCTOR, owner_id)
+
+    assert verify_calendar_token(CalendarOwner.INSTRUCTOR, owner_id, token)
+    assert not verify_calendar_token(CalendarOwner.CLASSROOM, owner_id, token)
+    assert not verify_calendar_token(CalendarOwner.INSTRUCTOR, uuid4(), token)
+    assert not verify_calendar_token(CalendarOwner.INSTRUCTOR, owner_id, None)
+    assert not verify_calendar_token(CalendarOwner.INSTRUCTOR, owner_id, token[:-1])
+
+
+def test_feeds_are_not_stored_by_shared_caches():
+    feed = CalendarFeed(CalendarOwner.CLASSROOM, uuid4(), None, '"tag"')
+
+    headers = calendar_headers(feed)
+
+    assert headers["ETag"] == '"tag"'
+    assert headers["Cache-Control"].startswith("private,")
@@ -0,0 +1,149 @@
+import asyncio
+import random
+from collections import Counter
+from datetime import datetime, time, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+from app.core.constants import ClassLevel, CourseLevel, DayOfWeek
+from app.scheduling import conflicts as conflicts_module
+from app.scheduling.conflicts import ConflictRegistry, ConflictState, detect_conflicts
+from app.scheduling.intervals import DayIntervalIndex
+from app.scheduling.occupancy import (
+    CLASSROOM_DOUBLE_BOOKING,
+    INSTRUCTOR_DOUBLE_BOOKING,
+    STUDENT_GROUP_CONFLICT,
+    OccupancyRow,
+)
+
+
+def row(instructor_id, classroom_id, start, end, day=DayOfWeek.MONDAY, department_id=None, group_no=None):
+    return OccupancyRow(
+        id=uuid4(),
+        course_offering_id=uuid4(),
+        time_slot_id=uuid4(),
+        classroom_id=classroom_id,
+        instructor_id=instructor_id,
+        department_id=department_id,
+        class_level=CourseLevel.FIRST_YEAR,
+        group_no=group_no,
+        is_mandatory=department_id is not None,
+        day_of_week=day,
+        start_time=start,
+        end_time=end,
+    )
+
+
+def pairs(conflicts):
+    return Counter((c["type"], frozenset(c["assignment_ids"])) for c in conflicts)
+
+
+def flatten(by_bucket):
+    return [conflict for bucket in by_bucket.values() for conflict in bucket]
+
+
+def test_day_interval_index_is_per_key_and_day():
+    index = DayIntervalIndex([
+        ("a", DayOfWeek.MONDAY, 540, 590, 1),
+        ("a", DayOfWeek.MONDAY, 580, 665, 2),
+        ("a", DayOfWeek.TUESDAY, 540, 590, 3),
+        ("b", DayOfWeek.MONDAY, 540, 590, 4),
+    ])
+
+    assert sorted(index.overlapping("a", DayOfWeek.MONDAY, 585, 600)) == [1, 2]
+    assert index.overlapping("a", DayOfWeek.MONDAY, 590, 600) == [2]
+    assert index.overlapping("c", DayOfWeek.MONDAY, 0, 1440) == []
+
+
+def test_non_aligned_slots_conflict():
+    instructor_id, room_id, department_id = uuid4(), uuid4(), uuid4()
+    lecture = row(instructor_id, uuid4(), time(9), time(9, 50), department_id=department_id)
+    lab = row(uuid4(), room_id, time(9, 30), time(10, 45), department_id=department_id, group_no=1)
+    # Shares instructor and room but starts when the others end
+    later = row(instructor_id, room_id, time(10, 45), time(11, 35))
+
+    conflicts = flatten(detect_conflicts([later, lab, lecture]))
+
+    assert pairs(conflicts) == Counter([(STUDENT_GROUP_CONFLICT, frozenset([lecture.id, lab.id]))])
+    assert conflicts[0]["class_level"] == ClassLevel.FIRST
+
+
+def test_different_groups_and_days_do_not_conflict():
+    department_id = uuid4()
+    first = row(uuid4(), uuid4(), time(9), time(10), department_id=department_id, group_no=1)
+    second = row(uuid4(), uuid4(), time(9), time(10), department_id=department_id, group_no=2)
+    tuesday = row(first.instructor_id, first.classroom_id, time(9), time(10), day=DayOfWeek.TUESDAY)
+
+    assert detect_conflicts([first, second, tuesday]) == {}
+
+
+def test_incremental_state_matches_full_sweep():
+    rng = random.Random(7)
+    instructors = [uuid4() for _ in range(4)]
+    rooms = [uuid4() for _ in range(3)]
+    department_id = uuid4()
+
+    def random_row():
+        start = rng.randrange(8 * 60, 16 * 60, 5)
+        length = rng.choice([50, 75, 110])
+        return row(
+            rng.choice(instructors),
+            rng.choice(rooms),
+            time(*divmod(start, 60)),
+            time(*divmod(start + length, 60)),
+            day=rng.choice([DayOfWeek.MONDAY, DayOfWeek.TUESDAY]),
+            department_id=rng.choice([department_id, None]),
+            group_no=rng.choice([None, 1, 2]),
+        )
+
+    rows = {r.id: r for r in (random_row() for _ in range(30))}
+    state = ConflictState(rows.values())
+    for _ in range(50):
+        removed = rng.sample(list(rows), 2)
+        for assignment_id in removed:
+            del rows[assignment_id]
+        added = [random_row() for _ in range(2)]
+        rows.update((r.id, r) for r in added)
+        state.apply(removed, added)
+
+        assert pairs(state.conflicts()) == pairs(flatten(detect_conflicts(rows.values())))
+    assert any(c["type"] == INSTRUCTOR_DOUBLE_BOOKING for c in state.conflicts())
+    assert any(c["type"] == CLASSROOM_DOUBLE_BOOKING for c in state.conflicts())
+
+
+class FakeAssignmentRepository:
+    """Assignments of one schedule, plus the revision writers would bump"""
+
+    rows = {}
+    revision = 0
+
+    def __init__(self, db):
+        pass
+
+    async def get_version(self, schedule_id):
+        return self.revision
+
+    async def get_stamps(self, schedule_id):
+        stamp = datetime(2026, 9, 1, tzinfo=timezone.utc)
+        return [SimpleNamespace(id=r.id, updated_at=stamp, time_slot_id=r.time_slot_id, classroom_id=r.classroom_id)
+                for r in self.rows.values()]
+
+    async def get_occupancy_rows(self, schedule_id, ids=None):
+        return [r for r in self.rows.values() if ids is None or r.id in ids]
+
+
+def test_registry_picks_up_moves_that_keep_updated_at(monkeypatch):
+    monkeypatch.setattr(conflicts_module, "ScheduleAssignmentRepository", FakeAssignmentRepository)
+    instructor_id, schedule_id = uuid4(), uuid4()
+    first = row(instructor_id, uuid4(), time(9), time(10))
+    second = row(instructor_id, uuid4(), time(11), time(12))
+    FakeAssignmentRepository.rows = {first.id: first, second.id: second}
+    registry = ConflictRegistry()
+
+    assert asyncio.run(registry.get(None, schedule_id)).conflicts() == []
+
+    # Moved by a transaction that started earlier: same updated_at, new revision
+    FakeAssignmentRepository.rows[second.id] = second._replace(start_time=time(9, 30), time_slot_id=uuid4())
+    FakeAssignmentRepository.revision += 1
+    state = asyncio.run(registry.get(None, schedule_id))
+
+    assert pairs(state.conflicts()) == Counter([(INSTRUCTOR_DOUBLE_BOOKING, frozenset([first.id, second.id]))])
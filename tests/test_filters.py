@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy import select
+from app.models.faculty import Faculty
+from app.models.user import User
+from app.utils.filters import FilterCompiler, build_dynamic_filters
+
+
+def sql(model, filters) -> str:
+    statement = select(model.id).where(*build_dynamic_filters(model, filters))
+    return str(statement)
+
+
+def test_value_list_and_operator_specs():
+    clauses = build_dynamic_filters(Faculty, {"code": "CS", "name": ["A", "B"], "created_at": {"gte": 1, "lt": 2}})
+
+    assert [str(clause) for clause in clauses] == [
+        "faculties.code = :code_1",
+        "faculties.created_at >= :created_at_1",
+        "faculties.created_at < :created_at_1",
+        "faculties.name IN (__[POSTCOMPILE_name_1])",
+    ]
+
+
+def test_none_values_are_ignored():
+    assert build_dynamic_filters(Faculty, {"code": None}) == []
+
+
+def test_equal_shapes_render_identical_sql():
+    assert sql(Faculty, {"name": "x", "code": "A"}) == sql(Faculty, {"code": "B", "name": "y"})
+
+
+@pytest.mark.parametrize("filters, message", [
+    ({"nope": 1}, "Cannot filter Faculty by 'nope'"),
+    ({"code": {"regex": "x"}}, "Unknown filter operator 'regex' for 'code'"),
+])
+def test_rejects_unknown_fields_and_operators(filters, message):
+    with pytest.raises(ValueError, match=message):
+        build_dynamic_filters(Faculty, filters)
+
+
+def test_filterable_whitelist():
+    assert build_dynamic_filters(User, {"email": "a@b.c"})
+    with pytest.raises(ValueError, match="Cannot filter User by 'password_hash'"):
+        build_dynamic_filters(User, {"password_hash": "x"})
+
+
+def test_plans_are_memoized_per_shape():
+    compiler = FilterCompiler(Faculty)
+
+    compiler.compile({"code": "A"})
+    compiler.compile({"code": "B"})
+    compiler.compile({"code": ["A", "B"]})
+
+    assert set(compiler._plans) == {(("code", "eq"),), (("code", "in"),)}
@@ -0,0 +1,86 @@
+from datetime import date, datetime, time, timedelta, timezone
+import pytest
+from app.core.constants import DayOfWeek
+from app.utils.ical import CalendarEvent, escape_text, first_occurrence, fold_line, render_calendar
+
+STAMP = datetime(2026, 9, 1, 8, 30, tzinfo=timezone(timedelta(hours=3)))
+
+
+def unfold(body: bytes) -> list:
+    return body.decode().replace("\r\n ", "").split("\r\n")
+
+
+def render(events, **kwargs):
+    return render_calendar("CS (Fall 2026)", events, date(2026, 9, 2), date(2026, 12, 18), STAMP, **kwargs)
+
+
+def lesson(day=DayOfWeek.MONDAY, **kwargs):
+    return CalendarEvent(uid="a1@timetable", summary="CS101 Intro", day_of_week=day, start_time=time(9), end_time=time(9, 50), **kwargs)
+
+
+def test_escape_text():
+    assert escape_text("a,b;c\\d\ne") == "a\\,b\\;c\\\\d\\ne"
+
+
+def test_short_lines_are_not_folded():
+    line = "SUMMARY:" + "x" * 67
+    assert fold_line(line) == line
+
+
+@pytest.mark.parametrize("text", ["x" * 300, "ç" * 120, "a" + "€" * 100, "🙂" * 50])
+def test_folded_lines_stay_within_75_octets(text):
+    line = "DESCRIPTION:" + text
+
+    folded = fold_line(line)
+
+    parts = folded.split("\r\n")
+    assert all(len(part.encode()) <= 75 for part in parts)
+    assert all(part.startswith(" ") for part in parts[1:])
+    # Unfolding restores the line, so no UTF-8 sequence was split
+    assert folded.replace("\r\n ", "") == line
+
+
+@pytest.mark.parametrize("day, expected", [
+    (DayOfWeek.WEDNESDAY, date(2026, 9, 2)),
+    (DayOfWeek.FRIDAY, date(2026, 9, 4)),
+    (DayOfWeek.MONDAY, date(2026, 9, 7)),
+    (DayOfWeek.TUESDAY, date(2026, 9, 8)),
+])
+def test_first_occurrence(day, expected):
+    assert first_occurrence(date(2026, 9, 2), day) == expected
+
+
+def test_weekly_rule_with_floating_times():
+    lines = unfold(render([lesson(location="B-101", description="Ada, group 1")]))
+
+    assert lines[0] == "BEGIN:VCALENDAR" and lines[-2:] == ["END:VCALENDAR", ""]
+    assert "DTSTAMP:20260901T053000Z" in lines
+    assert "DTSTART:20260907T090000" in lines
+    assert "DTEND:20260907T095000" in lines
+    assert "RRULE:FREQ=WEEKLY;UNTIL=20261218T235959" in lines
+    assert "LOCATION:B-101" in lines
+    assert "DESCRIPTION:Ada\\, group 1" in lines
+    assert "X-WR-CALNAME:CS (Fall 2026)" in lines
+
+
+def test_timezone_is_only_a_hint():
+    lines = unfold(render([lesson()], timezone_hint="Europe/Istanbul"))
+
+    assert "X-WR-TIMEZONE:Europe/Istanbul" in lines
+    # DTSTART and UNTIL stay floating together; a TZID would need a VTIMEZONE
+    assert not any("TZID" in line for line in lines)
+    assert "DTSTART:20260907T090000" in lines
+    assert "RRULE:FREQ=WEEKLY;UNTIL=20261218T235959" in lines
+
+
+def test_lessons_after_term_end_are_skipped():
+    body = render_calendar("Short", [lesson(DayOfWeek.FRIDAY)], date(2026, 9, 1), date(2026, 9, 2), STAMP)
+
+    assert b"BEGIN:VEVENT" not in body
+
+
+def test_rendering_is_deterministic():
+    events = [lesson(), lesson(DayOfWeek.THURSDAY)]
+
+    assert render(events) == render(events)
+    assert render(events).count(b"BEGIN:VEVENT") == 2
@@ -0,0 +1,24 @@
+import asyncio
+from app.core.constants import JobStatus
+from app.db.query_stats import begin_query_stats, current_query_stats
+from app.scheduling.jobs import JobRegistry
+
+
+def test_jobs_do_not_inherit_request_query_stats():
+    registry = JobRegistry(max_jobs=4)
+
+    async def run(job):
+        return {"stats": current_query_stats()}
+
+    async def request():
+        stats = begin_query_stats("GET /schedules")
+        job = registry.submit("optimize", None, run)
+        while job.status in (JobStatus.PENDING, JobStatus.RUNNING):
+            await asyncio.sleep(0)
+        return stats, job
+
+    stats, job = asyncio.run(request())
+
+    assert job.status == JobStatus.SUCCEEDED
+    assert job.result == {"stats": None}
+    assert stats is not None
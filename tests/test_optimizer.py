@@ -0,0 +1,133 @@
+import random
+from collections import Counter
+from uuid import uuid4
+import pytest
+from app.core.constants import ClassroomType, CourseType, DayOfWeek
+from app.scheduling.engine import ScheduleSolver
+from app.scheduling.optimizer import ScheduleOptimizer
+from app.scheduling.problem import OfferingSpec, RoomSpec, SchedulingProblem, SlotSpec
+
+
+def make_problem(seed: int) -> SchedulingProblem:
+    rng = random.Random(seed)
+    slots = [
+        SlotSpec(uuid4(), day, 480 + 60 * hour, 530 + 60 * hour)
+        for day in list(DayOfWeek)[:5]
+        for hour in range(6)
+    ]
+    rooms = [
+        RoomSpec(uuid4(), rng.choice([ClassroomType.CLASSROOM, ClassroomType.AMPHI]), rng.choice([20, 40, 80]), None)
+        for _ in range(5)
+    ]
+    instructors = [uuid4() for _ in range(6)]
+    offerings = [
+        OfferingSpec(
+            uuid4(),
+            rng.choice(instructors),
+            rng.choice(rooms).id,
+            rng.choice([15, 30, 60]),
+            rng.randint(1, 3),
+            CourseType.THEORY,
+            None,
+        )
+        for _ in range(20)
+    ]
+    problem = SchedulingProblem(uuid4(), uuid4(), uuid4(), slots, rooms, offerings)
+    problem.unavailable = {(rng.choice(instructors), rng.choice(slots).id) for _ in range(10)}
+    return problem
+
+
+def make_optimizer(seed: int, max_daily_lessons: int = 2, **kwargs) -> ScheduleOptimizer:
+    problem = make_problem(seed)
+    placements = ScheduleSolver(problem, time_limit=5).solve().placements
+    instructors = {o.id: o.instructor_id for o in problem.offerings}
+    assignments = [
+        (uuid4(), p.course_offering_id, p.time_slot_id, p.classroom_id, instructors[p.course_offering_id])
+        for p in placements
+    ]
+    return ScheduleOptimizer(problem, assignments, max_daily_lessons=max_daily_lessons, seed=seed, **kwargs)
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_delta_matches_full_recompute(seed):
+    optimizer = make_optimizer(seed)
+    rng = random.Random(seed)
+    score = optimizer.score()
+    checked = 0
+    for _ in range(2000):
+        a = rng.randrange(len(optimizer.positions))
+        slot, room = optimizer._propose(a)
+        if (slot, room) == optimizer.positions[a]:
+            continue
+        delta = optimizer._delta(a, slot, room)
+        optimizer._place(a, slot, room)
+        new_score = optimizer.score()
+        assert new_score - score == delta
+        score = new_score
+        checked += 1
+    assert checked > 100
+
+
+def test_result_score_matches_rescoring_the_moved_schedule():
+    optimizer = make_optimizer(4, time_limit=0.3)
+    problem = optimizer.problem
+    assignments = {
+        assignment_id: (offering.id, optimizer.slots[slot].id, optimizer.rooms[room].id)
+        for assignment_id, offering, (slot, room) in zip(
+            optimizer.assignment_ids, optimizer.assignment_offerings, optimizer.initial_positions
+        )
+    }
+
+    offerings = {o.id: o for o in problem.offerings}
+
+    result = optimizer.optimize()
+
+    assert result.final_score <= result.initial_score
+    for move in result.moves:
+        offering_id, _, _ = assignments[move.assignment_id]
+        assignments[move.assignment_id] = (offering_id, move.time_slot_id, move.classroom_id)
+    rescored = ScheduleOptimizer(
+        problem,
+        [
+            (assignment_id, *placement, offerings[placement[0]].instructor_id)
+            for assignment_id, placement in assignments.items()
+        ],
+        max_daily_lessons=2
+    )
+    assert rescored.score() == result.final_score
+    assert rescored.penalty_counts() == result.penalties
+
+    # Moves never break hard constraints
+    instructor_slots = Counter((offerings[o].instructor_id, s) for o, s, _ in assignments.values())
+    room_slots = Counter((r, s) for _, s, r in assignments.values())
+    assert max(instructor_slots.values()) == 1
+    assert max(room_slots.values()) == 1
+    assert not any((offerings[o].instructor_id, s) in problem.unavailable for o, s, _ in assignments.values())
+
+
+def test_nothing_to_optimize():
+    problem = make_problem(5)
+
+    result = ScheduleOptimizer(problem, [], time_limit=0.1).optimize()
+
+    assert result.moves == []
+    assert result.initial_score == result.final_score == 0
+
+
+def test_unknown_offerings_still_book_their_instructor_and_room():
+    slots = [SlotSpec(uuid4(), DayOfWeek.MONDAY, 540 + 60 * hour, 590 + 60 * hour) for hour in range(2)]
+    preferred = RoomSpec(uuid4(), ClassroomType.CLASSROOM, 40, None)
+    other = RoomSpec(uuid4(), ClassroomType.CLASSROOM, 40, None)
+    instructor_id = uuid4()
+    offering = OfferingSpec(uuid4(), instructor_id, preferred.id, 20, 1, CourseType.THEORY, None)
+    problem = SchedulingProblem(uuid4(), uuid4(), uuid4(), slots, [preferred, other], [offering])
+    # Moving to the preferred room is the only improvement, but an assignment
+    # of an offering missing from the problem holds it in both slots
+    assignments = [(uuid4(), offering.id, slots[0].id, other.id, instructor_id)] + [
+        (uuid4(), uuid4(), slot.id, preferred.id, uuid4()) for slot in slots
+    ]
+
+    result = ScheduleOptimizer(problem, assignments, time_limit=0.1, seed=1).optimize()
+
+    assert result.moves == []
+    assert result.final_score == result.initial_score > 0
@@ -0,0 +1,88 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from app.models.faculty import Faculty
+from app.repositories.faculty import FacultyRepository
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+class SyncSessionAdapter:
+    """Just enough of AsyncSession for repository reads, over a sync SQLite session"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    async def execute(self, statement):
+        return self.session.execute(statement)
+
+
+@pytest.fixture
+def repo():
+    engine = create_engine("sqlite://")
+    Faculty.__table__.create(engine)
+    with Session(engine) as session:
+        base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        # Two rows share created_at, so the id decides their order
+        stamps = [base + timedelta(seconds=offset) for offset in (0, 1, 1, 2, 3)]
+        for i, stamp in enumerate(stamps):
+            session.add(Faculty(id=uuid4(), name=f"Faculty {i}", code=f"F{i}", created_at=stamp, updated_at=stamp))
+        session.commit()
+        yield FacultyRepository(SyncSessionAdapter(session))
+
+
+def pages(repo, limit):
+    """Every page as lists of ids, following next_cursor until it runs out"""
+    result = []
+    cursor = None
+    while True:
+        items, cursor = asyncio.run(repo.get_page(limit=limit, cursor=cursor))
+        result.append([item.id for item in items])
+        if cursor is None:
+            return result
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 3, 4, 5, 6, 7, 891011, tzinfo=timezone.utc)
+    id = uuid4()
+
+    cursor = encode_cursor(created_at, id)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, id)
+
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor", "bm90IGpzb24", "WzEsMl0", "WyJ4IiwieSJd"])
+def test_malformed_cursor(cursor):
+    with pytest.raises(ValueError, match="Invalid pagination cursor"):
+        decode_cursor(cursor)
+
+
+@pytest.mark.parametrize("limit, sizes", [(1, [1, 1, 1, 1, 1]), (2, [2, 2, 1]), (4, [4, 1]), (5, [5]), (10, [5])])
+def test_pages_cover_every_row_once(repo, limit, sizes):
+    result = pages(repo, limit)
+
+    assert [len(page) for page in result] == sizes
+    ids = [id for page in result for id in page]
+    assert len(set(ids)) == 5
+    assert all(isinstance(id, UUID) for id in ids)
+
+
+def test_pages_follow_created_at_then_id(repo):
+    items, _ = asyncio.run(repo.get_page(limit=5))
+    keys = [(item.created_at, item.id) for item in items]
+
+    assert keys == sorted(keys)
+    assert [id for page in pages(repo, 2) for id in page] == [item.id for item in items]
+
+
+def test_last_page_has_no_cursor(repo):
+    _, cursor = asyncio.run(repo.get_page(limit=5))
+    assert cursor is None
+
+    items, cursor = asyncio.run(repo.get_page(limit=4))
+    assert cursor == encode_cursor(items[-1].created_at, items[-1].id)
+    rest, cursor = asyncio.run(repo.get_page(limit=4, cursor=cursor))
+    assert len(rest) == 1 and cursor is None
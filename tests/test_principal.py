@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+import pytest
+
+pytest.importorskip("jose")
+pytest.importorskip("passlib")
+
+from app.core.constants import UserRole
+from app.core.principal import Principal, PrincipalCache
+from app.core.security import TokenData
+
+
+def make_principal(expires_in=timedelta(minutes=30)):
+    user = SimpleNamespace(id=uuid4(), role=UserRole.ADMIN, department_id=None, is_active=True)
+    token = TokenData(user_id=user.id, role=user.role.value, exp=datetime.now() + expires_in)
+    return Principal.from_user(user, token)
+
+
+def test_principal_is_cached_per_token():
+    cache = PrincipalCache(maxsize=10, ttl=60)
+    principal = make_principal()
+    cache.put("token-a", principal)
+
+    assert cache.get(principal.token, "token-a") == principal
+    assert cache.get(principal.token, "token-b") is None
+
+
+def test_invalidate_user_drops_every_token():
+    cache = PrincipalCache(maxsize=10, ttl=60)
+    principal = make_principal()
+    other = make_principal()
+    cache.put("token-a", principal)
+    cache.put("token-b", principal)
+    cache.put("token-c", other)
+
+    assert cache.invalidate_user(principal.id) == 2
+    assert cache.get(principal.token, "token-a") is None
+    assert cache.get(other.token, "token-c") == other
+
+
+def test_expired_token_is_not_cached():
+    cache = PrincipalCache(maxsize=10, ttl=60)
+    principal = make_principal(expires_in=timedelta(seconds=-1))
+    cache.put("token-a", principal)
+
+    assert cache.get(principal.token, "token-a") is None
@@ -0,0 +1,39 @@
+from uuid import uuid4
+import pytest
+
+pytest.importorskip("jose")
+pytest.importorskip("passlib")
+
+from app.core import security
+from app.core.metrics import metrics
+
+
+@pytest.fixture(autouse=True)
+def empty_token_cache():
+    security._token_cache.clear()
+    yield
+    security._token_cache.clear()
+
+
+def test_verified_token_is_reused():
+    user_id = uuid4()
+    token = security.create_access_token({"sub": str(user_id), "role": "admin"})
+    hits = metrics.get("auth.token_cache.hit")
+
+    first = security.verify_token(token)
+    second = security.verify_token(token)
+
+    assert first.user_id == user_id
+    assert second is first
+    assert metrics.get("auth.token_cache.hit") == hits + 1
+
+
+def test_invalid_token_is_not_cached():
+    assert security.verify_token("not-a-jwt") is None
+    assert len(security._token_cache) == 0
+
+
+def test_token_without_subject_is_rejected():
+    token = security.create_access_token({"role": "admin"})
+
+    assert security.verify_token(token) is None
@@ -0,0 +1,103 @@
+from types import SimpleNamespace
+from uuid import uuid4
+from app.core.constants import ClassLevel, ClassroomType, CourseLevel, CourseType, DayOfWeek
+from app.scheduling.engine import ScheduleSolver, resolve_result
+from app.scheduling.feasibility import RoomFeasibility
+from app.scheduling.snapshot import NONE, Interner, SchedulingSnapshot
+
+
+def offering_row(instructor_id, classroom_id=None, department_id=None, hours=1, students=20, group_no=None):
+    return SimpleNamespace(
+        id=uuid4(),
+        instructor_id=instructor_id,
+        classroom_id=classroom_id,
+        student_count=students,
+        weekly_hours=hours,
+        course_type=CourseType.THEORY,
+        is_mandatory=department_id is not None,
+        department_id=department_id,
+        class_level=CourseLevel.FIRST_YEAR,
+        group_no=group_no,
+    )
+
+
+def make_snapshot():
+    department_id = uuid4()
+    snapshot = SchedulingSnapshot(schedule_id=uuid4(), term_id=uuid4(), department=NONE)
+    snapshot.department = snapshot.departments.add(department_id)
+    return snapshot, department_id
+
+
+def test_interner_is_dense_and_stable():
+    interner = Interner()
+    a, b = uuid4(), uuid4()
+
+    assert interner.add(a) == 0
+    assert interner.add(b) == 1
+    assert interner.add(a) == 0
+    assert interner.get(b) == 1
+    assert interner.get(uuid4()) == NONE
+    assert interner.keys == [a, b]
+    assert len(interner) == 2
+
+
+def test_offering_columns_and_problem():
+    snapshot, department_id = make_snapshot()
+    room_id = uuid4()
+    snapshot.add_slot(uuid4(), DayOfWeek.MONDAY, 540, 590)
+    snapshot.add_room(room_id, ClassroomType.CLASSROOM, 40, department_id)
+    instructor_id = uuid4()
+    with_room = offering_row(instructor_id, room_id, department_id, group_no=2)
+    elective = offering_row(instructor_id, uuid4())
+
+    assert snapshot.add_offering(with_room) == 0
+    assert snapshot.add_offering(elective) == 1
+    assert snapshot.add_offering(with_room) == 0
+
+    problem = snapshot.to_problem()
+    first, second = problem.offerings
+    assert first.id == 0 and second.id == 1
+    # One instructor, one index; an unknown preferred room maps to NONE
+    assert first.instructor_id == second.instructor_id == snapshot.instructors.get(instructor_id)
+    assert first.classroom_id == snapshot.rooms.get(room_id)
+    assert second.classroom_id == NONE
+    assert first.group_key == (snapshot.department, ClassLevel.FIRST, 2)
+    assert second.group_key is None
+    assert problem.rooms[0].department_id == snapshot.department
+
+
+def test_solve_in_index_space_and_resolve_to_uuids():
+    snapshot, department_id = make_snapshot()
+    slot_ids = [uuid4() for _ in range(3)]
+    for hour, slot_id in enumerate(slot_ids):
+        snapshot.add_slot(slot_id, DayOfWeek.TUESDAY, 540 + 60 * hour, 590 + 60 * hour)
+    room_id = uuid4()
+    snapshot.add_room(room_id, ClassroomType.CLASSROOM, 40, department_id)
+    instructor_id = uuid4()
+    row = offering_row(instructor_id, room_id, department_id, hours=2)
+    snapshot.add_offering(row)
+    # Another schedule holds the room in the first slot
+    snapshot.blocked_instructor.append(snapshot.instructors.add(uuid4()))
+    snapshot.blocked_slot.append(snapshot.slots.get(slot_ids[0]))
+    snapshot.blocked_room.append(snapshot.rooms.get(room_id))
+
+    result = resolve_result(snapshot, ScheduleSolver(snapshot.to_problem(), time_limit=5).solve())
+
+    assert result.unplaced == []
+    assert {(p.course_offering_id, p.classroom_id) for p in result.placements} == {(row.id, room_id)}
+    assert sorted(p.time_slot_id for p in result.placements) == sorted(slot_ids[1:])
+    assert list(snapshot.bookings())[0][1:] == (slot_ids[0], room_id)
+    assert [s[0] for s in snapshot.slot_times()] == slot_ids
+
+
+def test_room_feasibility_rows():
+    snapshot, department_id = make_snapshot()
+    snapshot.add_room(uuid4(), ClassroomType.LAB, 100, None)
+    snapshot.add_room(uuid4(), ClassroomType.CLASSROOM, 10, None)
+    snapshot.add_room(uuid4(), ClassroomType.AMPHI, 100, None)
+    snapshot.add_offering(offering_row(uuid4(), students=30))
+    feasibility = RoomFeasibility.from_problem(snapshot.to_problem())
+
+    # Only the amphi is a theory room with 30 seats
+    assert feasibility.rows == [0b100]
+    assert feasibility.free_rooms(0, busy_rooms=0b100) == 0
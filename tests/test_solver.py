@@ -0,0 +1,161 @@
+from collections import Counter
+from uuid import uuid4
+import pytest
+from app.core.constants import ClassLevel, ClassroomType, CourseType, DayOfWeek, COURSE_TYPE_TO_CLASSROOM_TYPES
+from app.scheduling.engine import ScheduleSolver
+from app.scheduling.problem import OfferingSpec, RoomSpec, SchedulingProblem, SlotSpec
+
+
+def make_slots(days=(DayOfWeek.MONDAY, DayOfWeek.TUESDAY), hours=3):
+    return [
+        SlotSpec(uuid4(), day, 540 + 60 * hour, 590 + 60 * hour)
+        for day in days
+        for hour in range(hours)
+    ]
+
+
+def make_offering(instructor_id, room_id=None, hours=1, students=20, course_type=CourseType.THEORY, group_key=None):
+    return OfferingSpec(uuid4(), instructor_id, room_id, students, hours, course_type, group_key)
+
+
+def make_problem(slots, rooms, offerings, **kwargs):
+    return SchedulingProblem(uuid4(), uuid4(), uuid4(), slots, rooms, offerings, **kwargs)
+
+
+def solve(problem):
+    return ScheduleSolver(problem, time_limit=5, max_backtracks=10000).solve()
+
+
+def assert_hard_constraints(problem, result):
+    """No resource is used twice in a slot and every room can host its offering"""
+    offerings = {o.id: o for o in problem.offerings}
+    rooms = {r.id: r for r in problem.rooms}
+    instructor_slots = Counter()
+    room_slots = Counter()
+    group_slots = Counter()
+    for placement in result.placements:
+        offering = offerings[placement.course_offering_id]
+        room = rooms[placement.classroom_id]
+        assert room.classroom_type in COURSE_TYPE_TO_CLASSROOM_TYPES[offering.course_type]
+        assert room.capacity >= offering.student_count
+        assert (offering.instructor_id, placement.time_slot_id) not in problem.unavailable
+        instructor_slots[(offering.instructor_id, placement.time_slot_id)] += 1
+        room_slots[(placement.classroom_id, placement.time_slot_id)] += 1
+        if offering.group_key is not None:
+            group_slots[(offering.group_key, placement.time_slot_id)] += 1
+    for instructor_id, slot_id, room_id in problem.blocked:
+        instructor_slots[(instructor_id, slot_id)] += 1
+        room_slots[(room_id, slot_id)] += 1
+    assert max(instructor_slots.values(), default=0) <= 1
+    assert max(room_slots.values(), default=0) <= 1
+    assert max(group_slots.values(), default=0) <= 1
+
+
+def test_places_every_hour_without_double_booking():
+    slots = make_slots()
+    rooms = [RoomSpec(uuid4(), ClassroomType.CLASSROOM, 40, None) for _ in range(2)]
+    instructors = [uuid4(), uuid4()]
+    group = (uuid4(), ClassLevel.FIRST, None)
+    offerings = [
+        make_offering(instructors[i % 2], hours=2, group_key=group if i < 2 else None)
+        for i in range(4)
+    ]
+    problem = make_problem(slots, rooms, offerings)
+
+    result = solve(problem)
+
+    assert result.unplaced == []
+    assert len(result.placements) == 8
+    assert_hard_constraints(problem, result)
+    hours = Counter(p.course_offering_id for p in result.placements)
+    assert all(hours[o.id] == o.weekly_hours for o in offerings)
+    # Each lesson of an offering takes a different slot
+    assert len({(p.course_offering_id, p.time_slot_id) for p in result.placements}) == 8
+
+
+def test_room_type_capacity_and_features():
+    slots = make_slots(hours=1)
+    small_lab = RoomSpec(uuid4(), ClassroomType.LAB, 10, None)
+    lab = RoomSpec(uuid4(), ClassroomType.LAB, 30, None, {"projector": True})
+    classroom = RoomSpec(uuid4(), ClassroomType.CLASSROOM, 100, None)
+    offering = make_offering(uuid4(), students=25, course_type=CourseType.LAB)
+    offering.required_features = {"projector": True}
+    problem = make_problem(slots, [small_lab, classroom, lab], [offering])
+
+    result = solve(problem)
+
+    assert result.unplaced == []
+    assert {p.classroom_id for p in result.placements} == {lab.id}
+
+
+def test_preferred_room_must_still_fit():
+    slots = make_slots(hours=1)
+    preferred = RoomSpec(uuid4(), ClassroomType.AMPHI, 200, None)
+    lab = RoomSpec(uuid4(), ClassroomType.LAB, 30, None)
+    # The preferred room is big enough but of the wrong type for a lab
+    offering = make_offering(uuid4(), room_id=preferred.id, course_type=CourseType.LAB)
+    problem = make_problem(slots, [preferred, lab], [offering])
+
+    result = solve(problem)
+
+    assert [p.classroom_id for p in result.placements] == [lab.id]
+
+
+def test_respects_unavailable_and_blocked_slots():
+    slots = make_slots(days=(DayOfWeek.MONDAY,), hours=3)
+    room = RoomSpec(uuid4(), ClassroomType.CLASSROOM, 40, None)
+    instructor_id = uuid4()
+    offering = make_offering(instructor_id, hours=1)
+    problem = make_problem(
+        slots,
+        [room],
+        [offering],
+        unavailable={(instructor_id, slots[0].id)},
+        blocked=[(uuid4(), slots[1].id, room.id)],
+    )
+
+    result = solve(problem)
+
+    assert [p.time_slot_id for p in result.placements] == [slots[2].id]
+    assert_hard_constraints(problem, result)
+
+
+def test_overlapping_slots_conflict():
+    monday = DayOfWeek.MONDAY
+    first = SlotSpec(uuid4(), monday, 540, 630)
+    overlapping = SlotSpec(uuid4(), monday, 600, 690)
+    room = RoomSpec(uuid4(), ClassroomType.CLASSROOM, 40, None)
+    instructor_id = uuid4()
+    offerings = [make_offering(instructor_id), make_offering(instructor_id)]
+    problem = make_problem([first, overlapping], [room], offerings)
+
+    result = solve(problem)
+
+    assert len(result.placements) == 1
+    assert [u.missing_hours for u in result.unplaced] == [1]
+
+
+def test_reports_what_cannot_be_placed():
+    slots = make_slots(days=(DayOfWeek.MONDAY,), hours=2)
+    room = RoomSpec(uuid4(), ClassroomType.CLASSROOM, 40, None)
+    instructor_id = uuid4()
+    offerings = [make_offering(instructor_id, hours=2), make_offering(instructor_id, hours=1)]
+    problem = make_problem(slots, [room], offerings)
+
+    result = solve(problem)
+
+    assert len(result.placements) == 2
+    assert sum(u.missing_hours for u in result.unplaced) == 1
+    assert_hard_constraints(problem, result)
+
+
+@pytest.mark.parametrize("course_type", [CourseType.THEORY, CourseType.LAB])
+def test_no_compatible_room(course_type):
+    slots = make_slots(hours=1)
+    room = RoomSpec(uuid4(), ClassroomType.CLASSROOM, 10, None)
+    offering = make_offering(uuid4(), students=50, course_type=course_type)
+
+    result = solve(make_problem(slots, [room], [offering]))
+
+    assert result.placements == []
+    assert [(u.course_offering_id, u.missing_hours) for u in result.unplaced] == [(offering.id, 1)]